@@ -298,9 +298,8 @@ if os.path.exists(frontend_dist_path):
                            e.image_url as image_url
                     LIMIT 1
                     """
-                    result = await neo4j_client.execute_query(query, uuid=uuid)
-                    if result:
-                        entity = dict(result[0])
+                    entity = await neo4j_client.execute_read_single(query, uuid=uuid)
+                    if entity:
                         logger.info(f"serve_spa: Found entity in Neo4j: {entity.get('name')}")
                         # Cache for 1 hour
                         try:
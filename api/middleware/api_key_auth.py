@@ -69,7 +69,7 @@ class APIKeyManager:
             "CREATE INDEX apikey_active IF NOT EXISTS FOR (k:APIKey) ON (k.is_active)"
         ]
 
-        async with self.neo4j.driver.session() as session:
+        async with self.neo4j.driver.session(database=self.neo4j.database) as session:
             for constraint in constraints:
                 try:
                     await session.run(constraint)
@@ -119,7 +119,7 @@ class APIKeyManager:
         RETURN k
         """
 
-        async with self.neo4j.driver.session() as session:
+        async with self.neo4j.driver.session(database=self.neo4j.database) as session:
             result = await session.run(
                 query,
                 key_id=key_id,
@@ -161,12 +161,12 @@ class APIKeyManager:
         RETURN k
         """
 
-        async with self.neo4j.driver.session() as session:
+        async with self.neo4j.driver.session(database=self.neo4j.database) as session:
             result = await session.run(query, hashed_key=hashed)
             record = await result.single()
 
             if record:
-                key_data = dict(record["k"])
+                key_data = dict(record["k"].items())
                 return {
                     "key_id": key_data["key_id"],
                     "name": key_data["name"],
@@ -208,7 +208,7 @@ class APIKeyManager:
         RETURN k
         """
 
-        async with self.neo4j.driver.session() as session:
+        async with self.neo4j.driver.session(database=self.neo4j.database) as session:
             result = await session.run(query, key_id=key_id)
             record = await result.single()
             return record is not None
@@ -222,10 +222,10 @@ class APIKeyManager:
         """
 
         keys = []
-        async with self.neo4j.driver.session() as session:
+        async with self.neo4j.driver.session(database=self.neo4j.database) as session:
             result = await session.run(query)
             async for record in result:
-                key_data = dict(record["k"])
+                key_data = dict(record["k"].items())
                 keys.append({
                     "key_id": key_data["key_id"],
                     "name": key_data["name"],
@@ -21,6 +21,7 @@ JWT_SECRET = os.getenv("JWT_SECRET", "your-super-secret-key-change-in-production
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))  # Default 1 hour
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+REFRESH_CLAIMS_MAX_AGE_MINUTES = 60  # Re-read email/verified from Neo4j after this long
 COOKIE_SECURE = os.getenv("COOKIE_SECURE", "true").lower() == "true"  # Set to false for HTTP development
 
 # Security scheme
@@ -63,8 +64,19 @@ def create_access_token(user_id: str, email: str) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
-def create_refresh_token(user_id: str) -> str:
-    """Create a long-lived refresh token."""
+def create_refresh_token(
+    user_id: str,
+    email: Optional[str] = None,
+    verified: bool = False,
+    claims_at: Optional[int] = None
+) -> str:
+    """
+    Create a long-lived refresh token.
+
+    When email is given, email/verified are embedded together with claims_at
+    (when they were last read from the database) so a refresh can skip the
+    user lookup until the claims are REFRESH_CLAIMS_MAX_AGE_MINUTES old.
+    """
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     payload = {
         "sub": user_id,
@@ -73,9 +85,21 @@ def create_refresh_token(user_id: str) -> str:
         "iat": datetime.utcnow(),
         "jti": secrets.token_hex(16)  # Unique token ID for blacklisting
     }
+    if email:
+        payload["email"] = email
+        payload["verified"] = verified
+        payload["claims_at"] = claims_at if claims_at is not None else int(datetime.utcnow().timestamp())
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+def refresh_claims_are_fresh(payload: Dict[str, Any]) -> bool:
+    """Check whether a refresh token's embedded user claims can be trusted without a lookup."""
+    if not payload.get("email") or not payload.get("verified"):
+        return False
+    age = int(datetime.utcnow().timestamp()) - payload.get("claims_at", 0)
+    return age < REFRESH_CLAIMS_MAX_AGE_MINUTES * 60
+
+
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """Decode and validate a JWT token."""
     try:
@@ -150,12 +150,10 @@ class MetaTagInjectionMiddleware(BaseHTTPMiddleware):
         """
 
         try:
-            result = await neo4j_client.execute_query(query, {"uuid": uuid})
-            if not result:
+            entity = await neo4j_client.execute_read_single(query, uuid=uuid)
+            if not entity:
                 return None
 
-            entity = dict(result[0])
-
             # Cache for 1 hour
             try:
                 await redis_client.setex(
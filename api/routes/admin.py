@@ -10,7 +10,7 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 import json
 
-from db.neo4j_client import Neo4jClient
+from db.neo4j_client import Neo4jClient, POPCOUNT_LUT
 from api.dependencies import get_neo4j_client
 from api.middleware.jwt_auth import get_current_user
 from workers.llm_client import LLMFactory
@@ -81,12 +81,12 @@ async def list_trait_flags(
     if status != "all":
         params["status"] = status
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(query, **params)
         flags = []
 
         async for record in result:
-            flag_data = dict(record["f"])
+            flag_data = dict(record["f"].items())
 
             # Serialize datetime fields
             for key in ["created_at", "reviewed_at"]:
@@ -116,7 +116,7 @@ async def list_trait_flags(
     RETURN count(f) as total
     """
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(count_query, **params)
         record = await result.single()
         total = record["total"] if record else 0
@@ -164,16 +164,16 @@ async def review_trait_flag(
     RETURN f, e, t
     """
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(get_flag_query, flag_id=flag_id)
         record = await result.single()
 
         if not record:
             raise HTTPException(status_code=404, detail="Flag not found or already reviewed")
 
-        flag_data = dict(record["f"])
-        entity_data = dict(record["e"])
-        trait_data = dict(record["t"])
+        flag_data = dict(record["f"].items())
+        entity_data = dict(record["e"].items())
+        trait_data = dict(record["t"].items())
 
         # Update flag status
         new_status = "approved" if review.action == "approve" else "rejected"
@@ -228,6 +228,9 @@ async def review_trait_flag(
             # Update HAS_TRAIT relationship
             update_trait_query = """
             MATCH (e:Entity {uuid: $uuid})-[r:HAS_TRAIT]->(t:Trait {bit: $bit})
+            SET t.entity_count = t.entity_count
+                    + CASE WHEN $applicable THEN 1 ELSE 0 END
+                    - CASE WHEN r.applicable THEN 1 ELSE 0 END
             SET r.applicable = $applicable,
                 r.confidence = $confidence,
                 r.justification = $justification,
@@ -246,29 +249,38 @@ async def review_trait_flag(
                 model_used=evaluation.get("model_used", "unknown")
             )
 
-            # Recalculate UHT code
+            # Recalculate UHT code: uht_int is summed from the applicable bits
+            # (trait bit b is 2^(32-b), so order doesn't matter); the hex and
+            # binary strings the API returns are then rendered from it
             recalc_query = """
             MATCH (e:Entity {uuid: $uuid})-[r:HAS_TRAIT]->(t:Trait)
-            WITH e, collect({bit: t.bit, applicable: r.applicable}) as traits
-            WITH e, traits,
-                 reduce(binary = '', trait IN traits |
-                     binary + CASE WHEN trait.applicable THEN '1' ELSE '0' END
+            WITH e, reduce(v = 0, bit IN collect(CASE WHEN r.applicable THEN t.bit END) |
+                     v + toInteger(2 ^ (32 - bit))
+                 ) as uht_int
+            WITH e, uht_int,
+                 reduce(hex = '', i IN range(7, 0, -1) |
+                     hex + substring('0123456789ABCDEF', uht_int / toInteger(16 ^ i) % 16, 1)
+                 ) as hex_code,
+                 reduce(binary = '', i IN range(31, 0, -1) |
+                     binary + toString(uht_int / toInteger(2 ^ i) % 2)
                  ) as binary_str
-            WITH e, binary_str,
-                 reduce(hex = '', i IN range(0, 7) |
-                     hex + substring('0123456789ABCDEF',
-                         reduce(val = 0, j IN range(0, 3) |
-                             val + CASE WHEN substring(binary_str, i*4 + j, 1) = '1'
-                                 THEN toInteger(2^(3-j)) ELSE 0 END
-                         ), 1)
-                 ) as hex_code
             SET e.uht_code = hex_code,
+                e.uht_int = uht_int,
                 e.binary_representation = binary_str,
                 e.updated_at = datetime()
+            SET e.physical_bits = $popcount[(e.uht_int / 16777216) % 256],
+                e.functional_bits = $popcount[(e.uht_int / 65536) % 256],
+                e.abstract_bits = $popcount[(e.uht_int / 256) % 256],
+                e.social_bits = $popcount[e.uht_int % 256]
+            SET e.total_bits = e.physical_bits + e.functional_bits + e.abstract_bits + e.social_bits
             RETURN e.uht_code as new_uht_code
             """
 
-            recalc_result = await session.run(recalc_query, uuid=flag_data["entity_uuid"])
+            recalc_result = await session.run(
+                recalc_query,
+                uuid=flag_data["entity_uuid"],
+                popcount=POPCOUNT_LUT.tolist()
+            )
             recalc_record = await recalc_result.single()
             new_uht_code = recalc_record["new_uht_code"] if recalc_record else None
 
@@ -5,19 +5,22 @@ Provides endpoints for generating, storing, and searching entity embeddings
 using OpenAI text-embedding-3-small (1536 dimensions).
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, List, Optional
 import os
+import json
 import logging
 
 from pydantic import BaseModel, Field
-from db.neo4j_client import Neo4jClient
+from db.neo4j_client import Neo4jClient, normalize_embedding
 from workers.embedding_client import (
     EmbeddingOrchestrator,
     build_embedding_text,
     calculate_comparison_metrics
 )
 from api.middleware.api_key_auth import require_embeddings
+from api.dependencies import get_neo4j_client
 
 logger = logging.getLogger(__name__)
 
@@ -66,17 +69,6 @@ class ComparisonMetrics(BaseModel):
 
 # ===== Dependencies =====
 
-async def get_neo4j_client():
-    """Get Neo4j client instance"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-    await neo4j.connect()
-    return neo4j
-
-
 async def get_embedding_orchestrator():
     """Get embedding orchestrator instance"""
     return EmbeddingOrchestrator()
@@ -212,7 +204,7 @@ async def get_embedding_metrics(
 
         # Get embedding
         embedding_data = await neo4j_client.get_entity_embedding(entity_uuid)
-        if not embedding_data or not embedding_data.get("embedding"):
+        if not embedding_data:
             raise HTTPException(
                 status_code=404,
                 detail="Entity does not have an embedding. Generate one first."
@@ -239,18 +231,46 @@ async def get_embedding_metrics(
 async def get_all_embeddings(
     limit: int = 100,
     offset: int = 0,
+    after_created_at: Optional[str] = None,
+    after_uuid: Optional[str] = None,
+    precision: str = Query("float", pattern="^(float|q8)$", description="float vectors, or INT8 vectors with a per-row scale"),
     neo4j_client: Neo4jClient = Depends(get_neo4j_client)
 ):
     """
     Get all entities with embeddings.
 
     Returns paginated list of entities that have embeddings stored.
-    Note: Full embedding vectors are included, which can be large.
+    Pass the returned next_cursor values as after_created_at/after_uuid to
+    fetch the following page without an offset scan; a cursor cannot be
+    combined with an offset.
+    Note: Full embedding vectors are included, which can be large; use
+    precision=q8 for INT8 vectors (embedding * scale recovers the floats).
     """
+    if (after_created_at is None) != (after_uuid is None):
+        raise HTTPException(status_code=400, detail="after_created_at and after_uuid must be given together")
+    if after_created_at is not None and offset:
+        raise HTTPException(status_code=400, detail="offset cannot be combined with a cursor")
+
     try:
-        embeddings = await neo4j_client.get_all_embeddings(limit=limit, offset=offset)
+        # One extra row tells us whether another page exists, for both paging modes
+        embeddings = await neo4j_client.get_all_embeddings(
+            limit=limit + 1,
+            offset=offset,
+            after_created_at=after_created_at,
+            after_uuid=after_uuid,
+            precision=precision
+        )
         counts = await neo4j_client.count_entities_with_embeddings()
 
+        has_more = len(embeddings) > limit
+        embeddings = embeddings[:limit]
+        next_cursor = None
+        if has_more and embeddings:
+            next_cursor = {
+                "after_created_at": embeddings[-1]["created_at"],
+                "after_uuid": embeddings[-1]["entity_uuid"]
+            }
+
         return {
             "embeddings": embeddings,
             "returned_count": len(embeddings),
@@ -259,7 +279,8 @@ async def get_all_embeddings(
             "total_entities": counts["total"],
             "offset": offset,
             "limit": limit,
-            "has_more": offset + len(embeddings) < counts["with_embeddings"]
+            "has_more": has_more,
+            "next_cursor": next_cursor
         }
 
     except Exception as e:
@@ -267,6 +288,30 @@ async def get_all_embeddings(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/export")
+async def export_embeddings(
+    precision: str = Query("float", pattern="^(float|q8)$", description="float vectors, or INT8 vectors with a per-row scale"),
+    neo4j_client: Neo4jClient = Depends(get_neo4j_client)
+):
+    """
+    Export every stored embedding as newline-delimited JSON.
+
+    Rows are streamed from Neo4j as they arrive, in no particular order, so a
+    full export neither pages through GET / nor holds the corpus in memory.
+    Each line has the same shape as an entry of GET /'s embeddings list.
+    """
+    async def ndjson_lines():
+        try:
+            async for entity in neo4j_client.iter_all_embeddings(precision=precision):
+                yield json.dumps(entity) + "\n"
+        except Exception as e:
+            # Headers are already sent; the truncated body is all the client sees
+            logger.error(f"Export embeddings error: {e}")
+            raise
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.post("/search", response_model=Dict[str, Any])
 async def semantic_search(
     request: EmbeddingSearchRequest,
@@ -317,6 +362,40 @@ async def semantic_search(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/similar/{entity_uuid}", response_model=Dict[str, Any])
+async def find_similar_entities(
+    entity_uuid: str,
+    limit: int = Query(20, ge=1, le=100, description="Max results"),
+    min_score: float = Query(0.7, ge=0, le=1, description="Minimum similarity score"),
+    neo4j_client: Neo4jClient = Depends(get_neo4j_client)
+):
+    """
+    Find entities semantically similar to an existing entity.
+
+    **No authentication required** - search is a read operation.
+
+    Uses the entity's stored embedding as the vector index query, in a
+    single database call.
+    """
+    try:
+        similar_entities = await neo4j_client.find_similar_to_entity(
+            entity_uuid,
+            limit=limit,
+            min_score=min_score
+        )
+
+        return {
+            "entity_uuid": entity_uuid,
+            "results": similar_entities,
+            "result_count": len(similar_entities),
+            "min_score": min_score
+        }
+
+    except Exception as e:
+        logger.error(f"Similar entities search error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/batch", response_model=Dict[str, Any])
 async def generate_batch_embeddings(
     request: BatchEmbeddingRequest,
@@ -339,6 +418,7 @@ async def generate_batch_embeddings(
         # Start background task
         background_tasks.add_task(
             _process_batch_embeddings,
+            neo4j_client,
             request.entity_uuids,
             request.max_concurrent
         )
@@ -409,12 +489,10 @@ async def _get_entity_with_traits(
            traits
     """
 
-    result = await neo4j_client.execute_query(query, uuid=entity_uuid)
-    if not result:
+    record = await neo4j_client.execute_read_single(query, uuid=entity_uuid)
+    if not record:
         return None
 
-    record = result[0]
-
     # Build trait evaluations list
     trait_evaluations = []
     for trait in record.get("traits", []):
@@ -443,7 +521,7 @@ async def _get_or_generate_embedding(
     """Get existing embedding or generate new one"""
     # Try to get existing embedding
     embedding_data = await neo4j_client.get_entity_embedding(entity_uuid)
-    if embedding_data and embedding_data.get("embedding"):
+    if embedding_data:
         return embedding_data
 
     # Generate new embedding
@@ -462,9 +540,11 @@ async def _get_or_generate_embedding(
         model_used=result["model_used"]
     )
 
+    # Same normalized float32 vector store_entity_embedding wrote, as
+    # get_entity_embedding would return it
     return {
         "entity_uuid": entity_uuid,
-        "embedding": result["embedding"],
+        "embedding": normalize_embedding(result["embedding"]),
         "dimension": result["dimension"],
         "model_used": result["model_used"]
     }
@@ -485,19 +565,15 @@ def _get_similarity_level(cosine_similarity: float) -> str:
 
 
 async def _process_batch_embeddings(
+    neo4j: Neo4jClient,
     entity_uuids: List[str],
     max_concurrent: int
 ):
-    """Background task to process batch embeddings"""
-    import asyncio
-
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-    await neo4j.connect()
+    """Background task to process batch embeddings.
 
+    Writes through the shared app client so its embedding count and
+    similarity caches are invalidated by the new vectors.
+    """
     orchestrator = EmbeddingOrchestrator()
 
     try:
@@ -533,5 +609,3 @@ async def _process_batch_embeddings(
 
     except Exception as e:
         logger.error(f"Batch embedding failed: {e}")
-    finally:
-        await neo4j.close()
@@ -6,7 +6,7 @@ import time
 import uuid
 
 from models.entity import EntitySearch
-from db.neo4j_client import Neo4jClient
+from db.neo4j_client import Neo4jClient, INTERNAL_ENTITY_PROPERTIES
 from api.middleware.api_key_auth import require_classify
 from api.dependencies import get_neo4j_client
 
@@ -55,12 +55,18 @@ def serialize_entity(entity: Dict[str, Any]) -> Dict[str, Any]:
     """Convert Neo4j entity to JSON-serializable format"""
     result = {}
     for key, value in entity.items():
+        if key in INTERNAL_ENTITY_PROPERTIES:
+            continue
         if isinstance(value, Neo4jDateTime):
             result[key] = value.isoformat()
         else:
             result[key] = value
     return result
 
+# Listing queries drop the embedding vectors server-side; only the entity
+# detail view returns the float embedding
+LISTING_EXCLUDED_PROPERTIES = ["embedding", *INTERNAL_ENTITY_PROPERTIES]
+
 router = APIRouter()
 
 
@@ -83,11 +89,11 @@ async def get_entities_minimal(
     ORDER BY e.created_at DESC
     LIMIT $limit
     """
-    results = await neo4j.execute_query(query, limit=limit)
+    results = await neo4j.execute_read_query(query, limit=limit)
 
+    # execute_read_query already returns plain dicts; convert them in place
     entities = []
-    for r in results:
-        entity = dict(r)
+    for entity in results:
         # Convert Neo4j DateTime
         if entity.get('created_at'):
             entity['created_at'] = entity['created_at'].isoformat() if hasattr(entity['created_at'], 'isoformat') else str(entity['created_at'])
@@ -142,12 +148,11 @@ async def search_by_pattern(
                e.description as description,
                e.created_at as created_at
         """
-        results = await neo4j.execute_query(query)
+        results = await neo4j.execute_read_query(query)
 
         # Pre-compute binary representations
         entities_with_binary = []
-        for r in results:
-            entity = dict(r)
+        for entity in results:
             binary = _hex_to_binary(entity.get("uht_code", ""))
             entities_with_binary.append((entity, binary))
 
@@ -187,6 +192,7 @@ async def get_entity(uuid: str, neo4j: Neo4jClient = Depends(get_neo4j_client)):
 @router.get("/")
 async def search_entities(
     uht_pattern: Optional[str] = Query(None, description="UHT code pattern to match"),
+    uht_match: str = Query("contains", pattern="^(contains|prefix)$", description="Match uht_pattern anywhere or as a prefix"),
     name_contains: Optional[str] = Query(None, description="Entity name contains"),
     limit: int = Query(100, ge=1, le=50000),
     offset: int = Query(0, ge=0),
@@ -194,33 +200,32 @@ async def search_entities(
 ):
     """Search entities with filters"""
     if uht_pattern:
-        raw_entities = await neo4j.search_entities_by_uht(uht_pattern)
-        entities = [serialize_entity(e) for e in raw_entities]
+        entities = [serialize_entity(e) async for e in neo4j.search_entities_by_uht(uht_pattern, uht_match)]
     elif name_contains:
         # Search by name
         query = """
         MATCH (e:Entity)
         WHERE toLower(e.name) CONTAINS toLower($name)
-        RETURN e
+        RETURN apoc.map.removeKeys(properties(e), $internal) as e
         ORDER BY e.created_at DESC
         LIMIT $limit
         """
-        results = await neo4j.execute_query(query, name=name_contains, limit=limit)
-        entities = [serialize_entity(dict(r["e"])) for r in results]
+        results = await neo4j.execute_read_query(query, name=name_contains, limit=limit, internal=LISTING_EXCLUDED_PROPERTIES)
+        entities = [serialize_entity(r["e"]) for r in results]
     else:
         # Get all entities with proper SKIP/LIMIT
         query = """
         MATCH (e:Entity)
-        RETURN e
+        RETURN apoc.map.removeKeys(properties(e), $internal) as e
         ORDER BY e.created_at DESC
         SKIP $offset LIMIT $limit
         """
-        results = await neo4j.execute_query(query, offset=offset, limit=limit)
-        entities = [serialize_entity(dict(r["e"])) for r in results]
+        results = await neo4j.execute_read_query(query, offset=offset, limit=limit, internal=LISTING_EXCLUDED_PROPERTIES)
+        entities = [serialize_entity(r["e"]) for r in results]
 
         # Get total count
         count_query = "MATCH (e:Entity) RETURN count(e) as total"
-        count_result = await neo4j.execute_query(count_query)
+        count_result = await neo4j.execute_read_query(count_query)
         total = count_result[0]["total"] if count_result else len(entities)
 
         return {
@@ -267,11 +272,17 @@ async def delete_entity(uuid: str, neo4j: Neo4jClient = Depends(get_neo4j_client
     """Delete an entity (admin only)"""
     query = """
     MATCH (e:Entity {uuid: $uuid})
+    CALL {
+        WITH e
+        MATCH (e)-[:HAS_TRAIT {applicable: true}]->(t:Trait)
+        WHERE t.entity_count IS NOT NULL
+        SET t.entity_count = t.entity_count - 1
+    }
     DETACH DELETE e
     RETURN count(e) as deleted
     """
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(query, uuid=uuid)
         record = await result.single()
 
@@ -339,14 +350,14 @@ async def update_entity(
     RETURN e
     """
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(query, **params)
         record = await result.single()
 
         if not record:
             raise HTTPException(status_code=404, detail="Entity not found")
 
-        entity = dict(record["e"])
+        entity = dict(record["e"].items())
 
     # Create version snapshot
     change_summary = f"Updated {', '.join(changed_fields)}"
@@ -387,14 +398,14 @@ async def flag_entity_nsfw(
     RETURN e
     """
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(query, uuid=uuid)
         record = await result.single()
 
         if not record:
             raise HTTPException(status_code=404, detail="Entity not found")
 
-        entity = dict(record["e"])
+        entity = dict(record["e"].items())
 
     # Create version snapshot
     await neo4j.create_entity_version(
@@ -435,14 +446,14 @@ async def unflag_entity_nsfw(
     RETURN e
     """
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(query, uuid=uuid)
         record = await result.single()
 
         if not record:
             raise HTTPException(status_code=404, detail="Entity not found")
 
-        entity = dict(record["e"])
+        entity = dict(record["e"].items())
 
     # Create version snapshot
     await neo4j.create_entity_version(
@@ -490,7 +501,7 @@ async def flag_trait_incorrect(
     RETURN e, t, r.applicable as current_value, t.name as trait_name
     """
 
-    async with neo4j.driver.session() as session:
+    async with neo4j.driver.session(database=neo4j.database) as session:
         result = await session.run(check_query, uuid=uuid, bit=bit)
         record = await result.single()
 
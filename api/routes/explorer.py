@@ -13,9 +13,11 @@ import logging
 import json
 from datetime import datetime
 
+import numpy as np
+
 from pydantic import BaseModel, Field
-from collections import Counter
 from db.neo4j_client import Neo4jClient
+from api.dependencies import get_neo4j_client
 from db.redis_client import RedisClient
 from workers.projection_worker import (
     ProjectionWorker,
@@ -23,7 +25,6 @@ from workers.projection_worker import (
     find_outliers,
     get_dominant_layer,
     count_active_traits,
-    compute_uht_similarity,
     compute_cosine_similarity
 )
 
@@ -214,17 +215,6 @@ class SubsetProjectionResponse(BaseModel):
 
 # ===== Dependencies =====
 
-async def get_neo4j_client():
-    """Get Neo4j client instance"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-    await neo4j.connect()
-    return neo4j
-
-
 async def get_redis_client():
     """Get Redis client instance"""
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6383")
@@ -260,7 +250,7 @@ async def get_all_projections(
         LIMIT $limit
         """
 
-        result = await neo4j_client.execute_query(query, limit=limit)
+        result = await neo4j_client.execute_read_query(query, limit=limit)
 
         points = []
         for record in result:
@@ -299,8 +289,6 @@ async def get_all_projections(
     except Exception as e:
         logger.error(f"Error fetching projections: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await neo4j_client.close()
 
 
 @router.get("/projections/stats")
@@ -318,7 +306,7 @@ async def get_projection_stats(
                sum(CASE WHEN e.uht_umap_x IS NOT NULL THEN 1 ELSE 0 END) as with_uht_umap
         """
 
-        result = await neo4j_client.execute_query(query)
+        result = await neo4j_client.execute_read_query(query)
 
         if result:
             record = result[0]
@@ -335,8 +323,6 @@ async def get_projection_stats(
     except Exception as e:
         logger.error(f"Error fetching projection stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await neo4j_client.close()
 
 
 @router.get("/correlations")
@@ -366,7 +352,7 @@ async def get_correlations(
         LIMIT 15000
         """
 
-        result = await neo4j_client.execute_query(query)
+        result = await neo4j_client.execute_read_query(query)
 
         entities = [
             {
@@ -412,8 +398,6 @@ async def get_correlations(
     except Exception as e:
         logger.error(f"Error computing correlations: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await neo4j_client.close()
 
 
 @router.get("/neighbors/{entity_uuid}", response_model=NeighborComparison)
@@ -430,96 +414,49 @@ async def get_neighbor_comparison(
         target_query = """
         MATCH (e:Entity {uuid: $uuid})
         RETURN e.uuid as uuid, e.name as name, e.uht_code as uht_code,
-               e.embedding as embedding, e.image_url as image_url
+               e.embedding IS NOT NULL as has_embedding, e.image_url as image_url
         """
 
-        target_result = await neo4j_client.execute_query(target_query, uuid=entity_uuid)
+        target_result = await neo4j_client.execute_read_query(target_query, uuid=entity_uuid)
 
         if not target_result:
             raise HTTPException(status_code=404, detail="Entity not found")
 
         target = target_result[0]
-        target_embedding = target.get('embedding')
-        target_uht = target.get('uht_code')
+        has_embedding = target.get('has_embedding')
 
-        if not target_embedding:
+        if not has_embedding:
             raise HTTPException(status_code=400, detail="Entity has no embedding")
 
-        # Get embedding neighbors using vector index
-        emb_query = """
-        CALL db.index.vector.queryNodes('entity_embedding', $k_plus, $embedding)
-        YIELD node, score
-        WHERE node.uuid <> $uuid
-        RETURN node.uuid as uuid, node.name as name, node.uht_code as uht_code,
-               node.image_url as image_url, score as similarity
-        LIMIT $k
-        """
-
-        emb_result = await neo4j_client.execute_query(
-            emb_query,
-            k_plus=k + 1,  # +1 because target might be included
-            k=k,
-            embedding=target_embedding,
-            uuid=entity_uuid
-        )
+        # Get embedding neighbors using vector index, seeded server-side with
+        # the target's stored embedding
+        emb_result = await neo4j_client.find_similar_to_entity(entity_uuid, limit=k, min_score=0)
 
         embedding_neighbors = [
             NeighborInfo(
                 uuid=r.get('uuid'),
                 name=r.get('name'),
                 uht_code=r.get('uht_code', '00000000'),
-                similarity=round(r.get('similarity', 0), 4),
+                similarity=r.get('similarity_score', 0),
                 image_url=r.get('image_url')
             )
             for r in emb_result
         ]
 
-        # Get UHT neighbors by Hamming distance
-        # We need to compute this manually since Neo4j doesn't have native Hamming
-        uht_query = """
-        MATCH (e:Entity)
-        WHERE e.uuid <> $uuid AND e.uht_code IS NOT NULL
-        RETURN e.uuid as uuid, e.name as name, e.uht_code as uht_code,
-               e.image_url as image_url
-        LIMIT 5000
-        """
+        # Get UHT neighbors by Hamming distance, ranked against the client's
+        # uht_int snapshot instead of scanning a capped sample of entities here
+        hamming_result = await neo4j_client.find_neighbors_by_hamming(entity_uuid, limit=k)
 
-        uht_result = await neo4j_client.execute_query(uht_query, uuid=entity_uuid)
-
-        # Compute Jaccard similarity for sorting and Hamming distance for display
-        uht_with_metrics = []
-        target_int = int(target_uht, 16) if target_uht else 0
-        for r in uht_result:
-            other_code = r.get('uht_code', '00000000')
-            other_int = int(other_code, 16)
-
-            # Jaccard similarity for sorting (better for sparse codes)
-            jaccard_sim = compute_uht_similarity(target_uht, other_code)
-
-            # Actual Hamming distance for display
-            xor = target_int ^ other_int
-            hamming_dist = bin(xor).count('1')
-
-            uht_with_metrics.append({
-                'uuid': r.get('uuid'),
-                'name': r.get('name'),
-                'uht_code': other_code,
-                'jaccard_similarity': jaccard_sim,
-                'hamming_distance': hamming_dist,
-                'image_url': r.get('image_url')
-            })
-
-        # Sort by Jaccard similarity (descending - higher is more similar)
-        uht_with_metrics.sort(key=lambda x: x['jaccard_similarity'], reverse=True)
         uht_neighbors = [
             NeighborInfo(
-                uuid=item['uuid'],
-                name=item['name'],
-                uht_code=item['uht_code'],
-                hamming_distance=item['hamming_distance'],
-                image_url=item['image_url']
+                uuid=r['uuid'],
+                name=r['name'],
+                uht_code=r.get('uht_code') or '00000000',
+                similarity=r['similarity'],
+                hamming_distance=r['hamming_distance'],
+                image_url=r.get('image_url')
             )
-            for item in uht_with_metrics[:k]
+            for r in hamming_result
         ]
 
         # Compute overlap
@@ -545,8 +482,6 @@ async def get_neighbor_comparison(
     except Exception as e:
         logger.error(f"Error computing neighbor comparison: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await neo4j_client.close()
 
 
 @router.post("/subset-projection", response_model=SubsetProjectionResponse)
@@ -574,7 +509,7 @@ async def compute_subset_projection(
         RETURN e.uuid as uuid, e.name as name, e.uht_code as uht_code,
                e.embedding as embedding, e.image_url as image_url
         """
-        results = await neo4j_client.execute_query(query, uuids=request.uuids)
+        results = await neo4j_client.execute_read_query(query, uuids=request.uuids)
 
         if not results or len(results) < 3:
             raise HTTPException(
@@ -781,8 +716,6 @@ async def compute_subset_projection(
     except Exception as e:
         logger.error(f"Subset projection failed: {e}")
         raise HTTPException(status_code=500, detail=f"Projection computation failed: {str(e)}")
-    finally:
-        await neo4j_client.close()
 
 
 @router.get("/outliers")
@@ -816,7 +749,7 @@ async def get_outliers(
             LIMIT 15000
             """
 
-            result = await neo4j_client.execute_query(query)
+            result = await neo4j_client.execute_read_query(query)
 
             entities = [
                 {
@@ -844,7 +777,7 @@ async def get_outliers(
             WHERE e.uuid IN $uuids
             RETURN e.uuid as uuid, e.name as name, e.uht_code as uht_code
             """
-            name_result = await neo4j_client.execute_query(name_query, uuids=list(all_uuids))
+            name_result = await neo4j_client.execute_read_query(name_query, uuids=list(all_uuids))
             uuid_to_info = {r['uuid']: {'name': r['name'], 'uht_code': r.get('uht_code', '')} for r in name_result}
         else:
             uuid_to_info = {}
@@ -874,8 +807,6 @@ async def get_outliers(
     except Exception as e:
         logger.error(f"Error finding outliers: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await neo4j_client.close()
 
 
 @router.post("/compute")
@@ -898,7 +829,7 @@ async def compute_projections(
         RETURN count(e) as total
         """
 
-        result = await neo4j_client.execute_query(stats_query)
+        result = await neo4j_client.execute_read_query(stats_query)
         total = result[0]['total'] if result else 0
 
         if total == 0:
@@ -925,8 +856,6 @@ async def compute_projections(
     except Exception as e:
         logger.error(f"Error starting projection computation: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await neo4j_client.close()
 
 
 async def run_projection_computation(method: str, force: bool):
@@ -951,7 +880,7 @@ async def run_projection_computation(method: str, force: bool):
         ORDER BY e.uuid
         """
 
-        result = await neo4j.execute_query(query)
+        result = await neo4j.execute_read_query(query)
 
         if not result:
             logger.warning("No embeddings found")
@@ -1177,7 +1106,7 @@ async def get_cluster_labels(
                e.{y_field} as y
         """
 
-        result = await neo4j_client.execute_query(query)
+        result = await neo4j_client.execute_read_query(query)
 
         config = RESOLUTION_CONFIGS[resolution]
         if len(result) < config['min_samples']:
@@ -1274,8 +1203,6 @@ async def get_cluster_labels(
     except Exception as e:
         logger.error(f"Error computing clusters: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        await neo4j_client.close()
 
 
 @router.post("/clusters/compute")
@@ -1391,7 +1318,7 @@ async def generate_tour(
         # Helper to count set bits in UHT code
         def count_traits(uht_code: str) -> int:
             try:
-                return bin(int(uht_code, 16)).count('1')
+                return int(uht_code, 16).bit_count()
             except (ValueError, TypeError):
                 return 0
 
@@ -1411,7 +1338,7 @@ async def generate_tour(
         ORDER BY c.size DESC
         LIMIT 50
         """
-        clusters = await neo4j_client.execute_query(cluster_query, method=request.projection)
+        clusters = await neo4j_client.execute_read_query(cluster_query, method=request.projection)
 
         # Fetch entities with their nearest cluster info
         entity_query = f"""
@@ -1422,7 +1349,7 @@ async def generate_tour(
                e.description as description
         LIMIT 2000
         """
-        all_entities = await neo4j_client.execute_query(entity_query)
+        all_entities = await neo4j_client.execute_read_query(entity_query)
 
         if not all_entities or len(all_entities) < request.num_stops:
             raise HTTPException(status_code=404, detail="Not enough entities found for tour")
@@ -1711,7 +1638,7 @@ async def describe_selection(
         WHERE e.uuid IN $uuids
         RETURN e.uuid as uuid, e.name as name, e.uht_code as uht_code
         """
-        results = await neo4j_client.execute_query(query, uuids=request.uuids)
+        results = await neo4j_client.execute_read_query(query, uuids=request.uuids)
 
         if not results:
             raise HTTPException(status_code=404, detail="No entities found")
@@ -1719,19 +1646,20 @@ async def describe_selection(
         entity_names = [r['name'] for r in results]
         uht_codes = [r['uht_code'] for r in results]
 
-        # Analyze common traits
-        trait_counts = Counter()
+        # Analyze common traits: unpack every code to its 32 bits (trait 1
+        # first) and count each column in one pass
+        code_ints = []
         for code in uht_codes:
             try:
-                num = int(code, 16)
-                for i in range(32):
-                    if (num >> (31 - i)) & 1:
-                        trait_counts[i + 1] += 1
-            except:
+                code_ints.append(int(code, 16) & 0xFFFFFFFF)
+            except (TypeError, ValueError):
                 pass
+        trait_counts = np.unpackbits(
+            np.array(code_ints, dtype=">u4").view(np.uint8).reshape(-1, 4), axis=1
+        ).sum(axis=0)
 
         # Traits present in >50% of entities
-        common_trait_indices = [t for t, c in trait_counts.items() if c > len(results) * 0.5]
+        common_trait_indices = (np.flatnonzero(trait_counts > len(results) * 0.5) + 1).tolist()
 
         # Get trait names (we'll use generic names if traits aren't loaded)
         trait_names = {
@@ -1810,7 +1738,7 @@ async def explain_similarity(
         MATCH (e:Entity {uuid: $uuid})
         RETURN e.name as name, e.uht_code as uht_code
         """
-        ref_results = await neo4j_client.execute_query(ref_query, uuid=request.reference_uuid)
+        ref_results = await neo4j_client.execute_read_query(ref_query, uuid=request.reference_uuid)
 
         if not ref_results:
             raise HTTPException(status_code=404, detail="Reference entity not found")
@@ -1823,7 +1751,7 @@ async def explain_similarity(
         WHERE e.uuid IN $uuids
         RETURN e.uuid as uuid, e.name as name, e.uht_code as uht_code
         """
-        sample_results = await neo4j_client.execute_query(sample_query, uuids=request.sample_uuids)
+        sample_results = await neo4j_client.execute_read_query(sample_query, uuids=request.sample_uuids)
 
         # Calculate Hamming distances
         ref_code = int(reference['uht_code'], 16)
@@ -1832,7 +1760,7 @@ async def explain_similarity(
             try:
                 sample_code = int(sample['uht_code'], 16)
                 xor = ref_code ^ sample_code
-                distance = bin(xor).count('1')
+                distance = xor.bit_count()
                 distances.append({
                     'name': sample['name'],
                     'distance': distance,
@@ -1,26 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
 from typing import Dict, Any, List, Optional, Literal
 from pydantic import BaseModel, Field
-import os
 import json
 
 from db.neo4j_client import Neo4jClient
 from db.redis_client import RedisClient
-from api.dependencies import get_redis_client
+from api.dependencies import get_neo4j_client, get_redis_client
 from workers.projection_worker import compute_uht_similarity
 
 router = APIRouter()
 
-# Dependency to get Neo4j client
-async def get_neo4j_client():
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-    await neo4j.connect()
-    return neo4j
-
 @router.get("/nodes")
 async def get_graph_nodes(
     limit: int = 100,
@@ -49,7 +38,7 @@ async def get_graph_nodes(
         LIMIT $limit
         """
         
-        result = await neo4j_client.execute_query(query, limit=limit)
+        result = await neo4j_client.execute_read_query(query, limit=limit)
         
         nodes = []
         
@@ -135,7 +124,7 @@ async def get_graph_links(
         RETURN e.uuid as id, e.uht_code as uht_code
         """
         
-        result = await neo4j_client.execute_query(query)
+        result = await neo4j_client.execute_read_query(query)
         
         links = []
         
@@ -415,17 +404,17 @@ async def get_entity_neighborhood(
         center_query = """
         MATCH (e:Entity {uuid: $uuid})
         RETURN e.uuid as uuid, e.name as name, e.uht_code as uht_code,
-               e.description as description, e.embedding as embedding,
+               e.description as description, e.embedding IS NOT NULL as has_embedding,
                e.image_url as image_url
         """
-        center_result = await neo4j_client.execute_query(center_query, uuid=uuid)
+        center_result = await neo4j_client.execute_read_query(center_query, uuid=uuid)
 
         if not center_result:
             raise HTTPException(status_code=404, detail="Entity not found")
 
         center_data = center_result[0]
         center_uht = center_data.get('uht_code', '00000000')
-        center_embedding = center_data.get('embedding')
+        has_embedding = center_data.get('has_embedding')
 
         layer_colors = {
             "Physical": "#FF6B35",
@@ -454,10 +443,12 @@ async def get_entity_neighborhood(
         neighbors = []
 
         # Get neighbors based on metric
-        if metric in ['embedding', 'hybrid'] and center_embedding:
-            # Embedding-based neighbors using vector index
+        if metric in ['embedding', 'hybrid'] and has_embedding:
+            # Embedding-based neighbors using vector index, seeded server-side
+            # with the center's stored embedding
             emb_query = f"""
-            CALL db.index.vector.queryNodes('entity_embedding', $k_plus, $embedding)
+            MATCH (center:Entity {{uuid: $uuid}})
+            CALL db.index.vector.queryNodes('entity_embedding', $k_plus, center.embedding)
             YIELD node, score
             WHERE node.uuid <> $uuid AND score >= $min_score {nsfw_filter}
             RETURN node.uuid as uuid, node.name as name, node.uht_code as uht_code,
@@ -465,11 +456,10 @@ async def get_entity_neighborhood(
                    score as embedding_similarity
             LIMIT $k
             """
-            emb_result = await neo4j_client.execute_query(
+            emb_result = await neo4j_client.execute_read_query(
                 emb_query,
                 k_plus=k + 5,
                 k=k,
-                embedding=center_embedding,
                 uuid=uuid,
                 min_score=min_similarity
             )
@@ -505,7 +495,7 @@ async def get_entity_neighborhood(
                    e.description as description, e.image_url as image_url
             LIMIT 5000
             """
-            uht_result = await neo4j_client.execute_query(uht_query, uuid=uuid)
+            uht_result = await neo4j_client.execute_read_query(uht_query, uuid=uuid)
 
             for r in uht_result:
                 other_uht = r.get('uht_code', '00000000')
@@ -652,16 +642,14 @@ async def expand_from_node(
         # Get the entity to expand from
         entity_query = """
         MATCH (e:Entity {uuid: $uuid})
-        RETURN e.uuid as uuid, e.uht_code as uht_code, e.embedding as embedding
+        RETURN e.uuid as uuid, e.uht_code as uht_code, e.embedding IS NOT NULL as has_embedding
         """
-        result = await neo4j_client.execute_query(entity_query, uuid=body.entity_uuid)
+        entity_data = await neo4j_client.execute_read_single(entity_query, uuid=body.entity_uuid)
 
-        if not result:
+        if not entity_data:
             raise HTTPException(status_code=404, detail="Entity not found")
-
-        entity_data = result[0]
         entity_uht = entity_data.get('uht_code', '00000000')
-        entity_embedding = entity_data.get('embedding')
+        has_embedding = entity_data.get('has_embedding')
 
         exclude_set = set(body.exclude_uuids)
         exclude_set.add(body.entity_uuid)  # Don't include self
@@ -681,20 +669,20 @@ async def expand_from_node(
         candidates = []
 
         # Get candidates based on metric
-        if body.metric in ['embedding', 'hybrid'] and entity_embedding:
+        if body.metric in ['embedding', 'hybrid'] and has_embedding:
             # Get more than needed since we'll filter
             emb_query = f"""
-            CALL db.index.vector.queryNodes('entity_embedding', $k_plus, $embedding)
+            MATCH (center:Entity {{uuid: $uuid}})
+            CALL db.index.vector.queryNodes('entity_embedding', $k_plus, center.embedding)
             YIELD node, score
             WHERE node.uuid <> $uuid AND score >= 0.3 {nsfw_filter}
             RETURN node.uuid as uuid, node.name as name, node.uht_code as uht_code,
                    node.description as description, node.image_url as image_url,
                    score as embedding_similarity
             """
-            emb_result = await neo4j_client.execute_query(
+            emb_result = await neo4j_client.execute_read_query(
                 emb_query,
                 k_plus=body.k * 3,  # Get extra for filtering
-                embedding=entity_embedding,
                 uuid=body.entity_uuid
             )
 
@@ -728,7 +716,7 @@ async def expand_from_node(
                    e.description as description, e.image_url as image_url
             LIMIT 5000
             """
-            uht_result = await neo4j_client.execute_query(uht_query, uuid=body.entity_uuid)
+            uht_result = await neo4j_client.execute_read_query(uht_query, uuid=body.entity_uuid)
 
             for r in uht_result:
                 if r.get('uuid') in exclude_set:
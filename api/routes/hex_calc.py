@@ -12,6 +12,7 @@ logger = logging.getLogger(__name__)
 from pydantic import BaseModel
 from workers.llm_client import LLMFactory, BaseLLMClient
 from db.neo4j_client import Neo4jClient
+from api.dependencies import get_neo4j_client
 from api.middleware.api_key_auth import optional_api_key_or_public
 from api.middleware.jwt_auth import get_current_user
 
@@ -39,15 +40,6 @@ async def get_llm_client() -> BaseLLMClient:
     provider = os.getenv("LLM_PROVIDER", "openrouter")
     return LLMFactory.create_client(provider)
 
-async def get_neo4j_client():
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-    await neo4j.connect()
-    return neo4j
-
 def hex_to_binary(hex_code: str) -> str:
     """Convert 8-char hex to 32-char binary."""
     return bin(int(hex_code, 16))[2:].zfill(32)
@@ -140,7 +132,7 @@ async def name_hex_code(
         try:
             for uuid in request.source_entity_uuids[:10]:  # Limit to 10 for context
                 query = "MATCH (e:Entity {uuid: $uuid}) RETURN e.name as name"
-                result = await neo4j_client.execute_query(query, uuid=uuid)
+                result = await neo4j_client.execute_read_query(query, uuid=uuid)
                 if result and len(result) > 0:
                     source_names.append(result[0]['name'])
         except Exception as e:
@@ -291,7 +283,7 @@ async def analyze_calculation(
     source_entities = []
     for uuid_str in request.source_entity_uuids:
         query = "MATCH (e:Entity {uuid: $uuid}) RETURN e.name as name, e.uht_code as uht_code"
-        result = await neo4j_client.execute_query(query, uuid=uuid_str)
+        result = await neo4j_client.execute_read_query(query, uuid=uuid_str)
         if result and len(result) > 0:
             source_entities.append({
                 'name': result[0]['name'],
@@ -534,7 +526,7 @@ async def save_calculation(
     source_names = []
     for entity_uuid in request.source_entity_uuids:
         query = "MATCH (e:Entity {uuid: $uuid}) RETURN e.name as name"
-        result = await neo4j_client.execute_query(query, uuid=entity_uuid)
+        result = await neo4j_client.execute_read_query(query, uuid=entity_uuid)
         if result and len(result) > 0:
             source_names.append(result[0]['name'])
         else:
@@ -618,7 +610,7 @@ async def list_calculations(
     ORDER BY c.created_at DESC
     """
 
-    results = await neo4j_client.execute_query(query, user_id=user_id)
+    results = await neo4j_client.execute_read_query(query, user_id=user_id)
 
     calculations = [
         SavedCalculation(
@@ -783,7 +775,7 @@ async def add_calculation_to_collection(
     MATCH (c:HexCalculation {id: $calc_id, user_id: $user_id})
     RETURN c.hex_code as hex_code, c.name as name
     """
-    calc_result = await neo4j_client.execute_query(calc_query, calc_id=calc_id, user_id=user_id)
+    calc_result = await neo4j_client.execute_read_query(calc_query, calc_id=calc_id, user_id=user_id)
 
     if not calc_result:
         raise HTTPException(status_code=404, detail="Calculation not found")
@@ -793,7 +785,7 @@ async def add_calculation_to_collection(
     MATCH (col:Collection {id: $coll_id, user_id: $user_id})
     RETURN col
     """
-    coll_result = await neo4j_client.execute_query(coll_query, coll_id=collection_id, user_id=user_id)
+    coll_result = await neo4j_client.execute_read_query(coll_query, coll_id=collection_id, user_id=user_id)
 
     if not coll_result:
         raise HTTPException(status_code=404, detail="Collection not found")
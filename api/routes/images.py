@@ -11,6 +11,7 @@ from datetime import datetime
 
 from workers.image_client import ImageGenerationOrchestrator
 from db.neo4j_client import Neo4jClient
+from api.dependencies import get_neo4j_client
 from models.entity import Entity
 from pydantic import BaseModel
 from api.middleware.api_key_auth import require_images, require_admin
@@ -40,16 +41,6 @@ class ImageGenerationResponse(BaseModel):
 async def get_orchestrator():
     return ImageGenerationOrchestrator()
 
-# Dependency to get Neo4j client
-async def get_neo4j_client():
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-    await neo4j.connect()
-    return neo4j
-
 @router.post("/generate", response_model=ImageGenerationResponse)
 async def generate_entity_image(
     request: ImageGenerationRequest,
@@ -305,7 +296,7 @@ async def get_image_gallery(
             LIMIT $limit
             """
 
-        result = await neo4j_client.execute_query(query, **params)
+        result = await neo4j_client.execute_read_query(query, **params)
 
         gallery_items = []
         for record in result:
@@ -337,7 +328,7 @@ async def get_image_gallery(
         WHERE {' AND '.join(count_where)}
         RETURN count(e) as total
         """
-        count_result = await neo4j_client.execute_query(count_query, **params)
+        count_result = await neo4j_client.execute_read_query(count_query, **params)
         total_count = count_result[0]["total"] if count_result else 0
 
         return {
@@ -665,7 +656,7 @@ async def get_entity_by_uuid(neo4j_client: Neo4jClient, entity_uuid: str) -> Opt
            e.layers as layers
     """
     
-    result = await neo4j_client.execute_query(query, uuid=entity_uuid)
+    result = await neo4j_client.execute_read_query(query, uuid=entity_uuid)
     return result[0] if result else None
 
 async def update_entity_image(
@@ -685,7 +676,6 @@ async def update_entity_image(
         SET e.image_url = $image_url,
             e.updated_at = datetime(),
             e.version = COALESCE(e.version, 1) + 1
-        RETURN e
         """
         await neo4j_client.execute_query(query, uuid=entity_uuid, image_url=image_url)
         change_summary = "Generated AI image" if "/static/generated/" in image_url else "Updated image"
@@ -695,7 +685,6 @@ async def update_entity_image(
         REMOVE e.image_url
         SET e.updated_at = datetime(),
             e.version = COALESCE(e.version, 1) + 1
-        RETURN e
         """
         await neo4j_client.execute_query(query, uuid=entity_uuid)
         change_summary = "Removed image"
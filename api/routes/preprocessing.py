@@ -5,6 +5,7 @@ import os
 
 from workers.llm_client import LLMFactory, BaseLLMClient
 from db.neo4j_client import Neo4jClient
+from api.dependencies import get_neo4j_client
 from models.entity import (
     EntityInput,
     EntityPreProcessing,
@@ -29,15 +30,6 @@ async def get_llm_client() -> BaseLLMClient:
     provider = os.getenv("LLM_PROVIDER", "openrouter")
     return LLMFactory.create_client(provider)
 
-async def get_neo4j_client():
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-    await neo4j.connect()
-    return neo4j
-
 @router.post("/preprocess", response_model=EntityPreProcessing)
 async def preprocess_entity(
     entity_name: str,
@@ -151,7 +143,7 @@ async def check_duplicate(
         LIMIT 1
         """
 
-        result = await neo4j_client.execute_query(
+        result = await neo4j_client.execute_read_query(
             query,
             entity_name=entity_name.lower(),
             threshold=threshold
@@ -88,7 +88,7 @@ async def get_sitemap(
         LIMIT 50000
         """
 
-        result = await neo4j_client.execute_query(query)
+        result = await neo4j_client.execute_read_query(query)
 
         for record in result:
             uuid = record.get('uuid')
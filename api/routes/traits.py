@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Dict, Any
 import json
 import os
 
 from db.neo4j_client import Neo4jClient
+from api.dependencies import get_neo4j_client
 
 router = APIRouter()
 
@@ -125,131 +126,53 @@ async def get_trait_by_bit(bit: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/statistics")
-async def get_trait_statistics():
+async def get_trait_statistics(neo4j: Neo4jClient = Depends(get_neo4j_client)):
     """Get usage statistics for all traits"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        stats = await neo4j.get_trait_statistics()
-        return stats
-    finally:
-        await neo4j.close()
+    return await neo4j.get_trait_statistics()
 
 
 # ===== TRAIT ANALYTICS ENDPOINTS =====
 
 @router.get("/statistics/frequency")
-async def get_trait_frequency():
+async def get_trait_frequency(neo4j: Neo4jClient = Depends(get_neo4j_client)):
     """Get detailed trait frequency with confidence breakdown"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        return await neo4j.get_trait_frequency_detailed()
-    finally:
-        await neo4j.close()
+    return await neo4j.get_trait_frequency_detailed()
 
 
 @router.get("/statistics/cooccurrence")
-async def get_trait_cooccurrence():
+async def get_trait_cooccurrence(
+    full: bool = Query(True, description="Include every co-occurring pair, not just the 20 strongest"),
+    neo4j: Neo4jClient = Depends(get_neo4j_client)
+):
     """Get pairwise trait co-occurrence matrix"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        return await neo4j.get_trait_cooccurrence_matrix()
-    finally:
-        await neo4j.close()
+    return await neo4j.get_trait_cooccurrence_matrix(full=full)
 
 
 @router.get("/statistics/exclusivity")
-async def get_trait_exclusivity():
+async def get_trait_exclusivity(neo4j: Neo4jClient = Depends(get_neo4j_client)):
     """Get trait mutual exclusivity analysis"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        return await neo4j.get_trait_mutual_exclusivity()
-    finally:
-        await neo4j.close()
+    return await neo4j.get_trait_mutual_exclusivity()
 
 
 @router.get("/statistics/layers")
-async def get_layer_statistics():
+async def get_layer_statistics(neo4j: Neo4jClient = Depends(get_neo4j_client)):
     """Get aggregate statistics by layer"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        return await neo4j.get_layer_statistics()
-    finally:
-        await neo4j.close()
+    return await neo4j.get_layer_statistics()
 
 
 @router.get("/statistics/confidence")
-async def get_confidence_statistics():
+async def get_confidence_statistics(neo4j: Neo4jClient = Depends(get_neo4j_client)):
     """Get per-trait confidence metrics"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        return await neo4j.get_confidence_statistics()
-    finally:
-        await neo4j.close()
+    return await neo4j.get_confidence_statistics()
 
 
 @router.get("/statistics/full")
-async def get_full_analytics():
+async def get_full_analytics(neo4j: Neo4jClient = Depends(get_neo4j_client)):
     """Get all trait analytics combined"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        return await neo4j.get_full_analytics()
-    finally:
-        await neo4j.close()
+    return await neo4j.get_full_analytics()
 
 
 @router.get("/statistics/hex-pairs")
-async def get_hex_pair_frequency():
+async def get_hex_pair_frequency(neo4j: Neo4jClient = Depends(get_neo4j_client)):
     """Get hex pair frequency per layer"""
-    neo4j = Neo4jClient(
-        uri=os.getenv("NEO4J_URI"),
-        user=os.getenv("NEO4J_USER"),
-        password=os.getenv("NEO4J_PASSWORD")
-    )
-
-    try:
-        await neo4j.connect()
-        return await neo4j.get_hex_pair_frequency()
-    finally:
-        await neo4j.close()
\ No newline at end of file
+    return await neo4j.get_hex_pair_frequency()
\ No newline at end of file
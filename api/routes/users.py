@@ -5,12 +5,13 @@ Provides registration, login, email verification, and password management.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request, Response
-from pydantic import BaseModel, EmailStr, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from typing import Optional
 from datetime import datetime, timedelta
 import uuid
 import os
-import resend
+import re
 import logging
 
 from api.middleware.jwt_auth import (
@@ -21,6 +22,7 @@ from api.middleware.jwt_auth import (
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
+    refresh_claims_are_fresh,
     get_current_user,
     get_current_user_optional,
     blacklist_token,
@@ -42,38 +44,71 @@ router = APIRouter()
 # Base URL for email links
 APP_BASE_URL = os.getenv("APP_BASE_URL", "https://factory.universalhex.org")
 
+# Shape of generate_verification_token / generate_password_reset_token output
+# (secrets.token_urlsafe); anything else is rejected before touching Neo4j.
+_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{32,128}$")
+
 
 # ==================== Request/Response Models ====================
 
+# Request/response models are immutable and drop unknown fields, which keeps
+# validation on the hot auth endpoints to the declared fields only.
+_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
+
 class RegisterRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     email: EmailStr
     password: str = Field(..., min_length=8, description="Password must be at least 8 characters")
 
 
 class LoginRequest(BaseModel):
-    email: EmailStr
+    model_config = _MODEL_CONFIG
+
+    # Plain str: full RFC validation already happened at registration, and the
+    # lookup is case-insensitive, so login only needs a cheap sanity check.
+    email: str
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def check_email(cls, value: str) -> str:
+        value = value.strip()
+        if "@" not in value:
+            raise ValueError("value is not a valid email address")
+        return value
+
 
 class RefreshRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     refresh_token: str
 
 
 class ForgotPasswordRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     email: EmailStr
 
 
 class ResetPasswordRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     token: str
     password: str = Field(..., min_length=8)
 
 
 class ChangePasswordRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+
     current_password: str
     new_password: str = Field(..., min_length=8)
 
 
 class UserResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     id: str
     email: str
     verified: bool
@@ -82,6 +117,8 @@ class UserResponse(BaseModel):
 
 
 class TokenResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
@@ -90,98 +127,96 @@ class TokenResponse(BaseModel):
 
 # ==================== Email Functions ====================
 
-def send_verification_email(email: str, token: str):
-    """Send email verification link."""
-    verify_url = f"{APP_BASE_URL}/verify-email?token={token}"
+_EMAIL_FROM = "UHT Factory <info@paperworkchaser.com>"
 
-    resend.api_key = os.getenv("RESEND_API_KEY")
-
-    if not resend.api_key:
-        logger.warning(f"[VERIFY EMAIL] RESEND_API_KEY not configured")
-        logger.info(f"[VERIFY EMAIL] Email: {email}")
-        logger.info(f"[VERIFY EMAIL] Verify URL: {verify_url}")
-        return False
-
-    try:
-        params = {
-            "from": "UHT Factory <info@paperworkchaser.com>",
-            "to": [email],
-            "subject": "Verify your UHT Factory account",
-            "html": f"""
+_EMAIL_HTML = """
             <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #00E5FF;">Welcome to UHT Factory</h2>
-                <p>Thanks for registering! Please verify your email address by clicking the link below:</p>
+                <h2 style="color: #00E5FF;">{heading}</h2>
+                <p>{intro}</p>
                 <p style="margin: 20px 0;">
-                    <a href="{verify_url}"
+                    <a href="{url}"
                        style="background-color: #00E5FF; color: #000; padding: 12px 24px;
                               text-decoration: none; border-radius: 4px; display: inline-block;">
-                        Verify Email Address
+                        {button}
                     </a>
                 </p>
                 <p style="color: #666; font-size: 14px;">
-                    Or copy this link: <a href="{verify_url}">{verify_url}</a>
+                    Or copy this link: <a href="{url}">{url}</a>
                 </p>
                 <p style="color: #666; font-size: 12px;">
-                    This link expires in 24 hours. If you didn't create an account, you can ignore this email.
+                    {footer}
                 </p>
             </div>
             """
-        }
 
-        result = resend.Emails.send(params)
-        logger.info(f"[VERIFY EMAIL] Email sent via Resend: {result}")
-        return True
-    except Exception as e:
-        logger.error(f"[VERIFY EMAIL] Failed to send: {e}")
-        return False
-
-
-def send_password_reset_email(email: str, token: str):
-    """Send password reset link."""
-    reset_url = f"{APP_BASE_URL}/reset-password?token={token}"
+# template name -> (log tag, URL path, subject, HTML fields)
+_EMAIL_TEMPLATES = {
+    "verify": (
+        "VERIFY EMAIL",
+        "/verify-email",
+        "Verify your UHT Factory account",
+        {
+            "heading": "Welcome to UHT Factory",
+            "intro": "Thanks for registering! Please verify your email address by clicking the link below:",
+            "button": "Verify Email Address",
+            "footer": "This link expires in 24 hours. If you didn't create an account, you can ignore this email.",
+        },
+    ),
+    "reset": (
+        "RESET PASSWORD",
+        "/reset-password",
+        "Reset your UHT Factory password",
+        {
+            "heading": "Password Reset Request",
+            "intro": "We received a request to reset your password. Click the link below to set a new password:",
+            "button": "Reset Password",
+            "footer": "This link expires in 1 hour. If you didn't request a password reset, you can ignore this email.",
+        },
+    ),
+}
+
+
+def _send_templated_email(email: str, template_name: str, token: str) -> bool:
+    """Send one of the _EMAIL_TEMPLATES with a tokenised link via Resend."""
+    import resend  # Deferred: pulls in requests/urllib3, only needed when sending
+
+    tag, path, subject, fields = _EMAIL_TEMPLATES[template_name]
+    url = f"{APP_BASE_URL}{path}?token={token}"
 
     resend.api_key = os.getenv("RESEND_API_KEY")
 
     if not resend.api_key:
-        logger.warning(f"[RESET PASSWORD] RESEND_API_KEY not configured")
-        logger.info(f"[RESET PASSWORD] Email: {email}")
-        logger.info(f"[RESET PASSWORD] Reset URL: {reset_url}")
+        logger.warning(f"[{tag}] RESEND_API_KEY not configured")
+        logger.info(f"[{tag}] Email: {email}")
+        logger.info(f"[{tag}] URL: {url}")
         return False
 
     try:
         params = {
-            "from": "UHT Factory <info@paperworkchaser.com>",
+            "from": _EMAIL_FROM,
             "to": [email],
-            "subject": "Reset your UHT Factory password",
-            "html": f"""
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #00E5FF;">Password Reset Request</h2>
-                <p>We received a request to reset your password. Click the link below to set a new password:</p>
-                <p style="margin: 20px 0;">
-                    <a href="{reset_url}"
-                       style="background-color: #00E5FF; color: #000; padding: 12px 24px;
-                              text-decoration: none; border-radius: 4px; display: inline-block;">
-                        Reset Password
-                    </a>
-                </p>
-                <p style="color: #666; font-size: 14px;">
-                    Or copy this link: <a href="{reset_url}">{reset_url}</a>
-                </p>
-                <p style="color: #666; font-size: 12px;">
-                    This link expires in 1 hour. If you didn't request a password reset, you can ignore this email.
-                </p>
-            </div>
-            """
+            "subject": subject,
+            "html": _EMAIL_HTML.format(url=url, **fields)
         }
 
         result = resend.Emails.send(params)
-        logger.info(f"[RESET PASSWORD] Email sent via Resend: {result}")
+        logger.info(f"[{tag}] Email sent via Resend: {result}")
         return True
     except Exception as e:
-        logger.error(f"[RESET PASSWORD] Failed to send: {e}")
+        logger.error(f"[{tag}] Failed to send: {e}")
         return False
 
 
+def send_verification_email(email: str, token: str):
+    """Send email verification link."""
+    return _send_templated_email(email, "verify", token)
+
+
+def send_password_reset_email(email: str, token: str):
+    """Send password reset link."""
+    return _send_templated_email(email, "reset", token)
+
+
 # ==================== Routes ====================
 
 @router.post("/register", response_model=UserResponse)
@@ -247,6 +282,12 @@ async def verify_email(
     """
     Verify user's email address using the token from verification email.
     """
+    if not _TOKEN_RE.match(token):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid or expired verification link"
+        )
+
     user = await neo4j.find_user_by_verification_token(token)
 
     if not user:
@@ -283,28 +324,30 @@ async def login(
     client_ip = get_client_ip(request)
     await login_rate_limiter.check_or_raise(client_ip, request)
 
-    # Find user
-    user = await neo4j.find_user_by_email(data.email)
+    # Lookup and last-login update share one session
+    async with neo4j.session() as session:
+        # Find user
+        user = await neo4j.find_user_by_email(data.email, session)
 
-    if not user or not verify_password(data.password, user.get("password_hash", "")):
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid email or password"
-        )
+        if not user or not verify_password(data.password, user.get("password_hash", "")):
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid email or password"
+            )
 
-    # Check if email is verified
-    if not user.get("verified", False):
-        raise HTTPException(
-            status_code=403,
-            detail="Please verify your email address before logging in"
-        )
+        # Check if email is verified
+        if not user.get("verified", False):
+            raise HTTPException(
+                status_code=403,
+                detail="Please verify your email address before logging in"
+            )
 
-    # Update last login
-    await neo4j.update_user_last_login(user["id"])
+        # Update last login
+        await neo4j.update_user_last_login(user["id"], session)
 
     # Generate tokens
     access_token = create_access_token(user["id"], user["email"])
-    refresh_token = create_refresh_token(user["id"])
+    refresh_token = create_refresh_token(user["id"], user["email"], verified=True)
 
     # Set refresh token as httpOnly cookie
     response.set_cookie(
@@ -379,20 +422,29 @@ async def refresh_tokens(
     # Verify refresh token
     payload = await verify_refresh_token(refresh_token, request)
 
-    # Get user to ensure they still exist and are verified
-    user = await neo4j.find_user_by_id(payload["sub"])
-
-    if not user:
-        raise HTTPException(
-            status_code=401,
-            detail="User not found"
-        )
-
-    if not user.get("verified", False):
-        raise HTTPException(
-            status_code=403,
-            detail="Email not verified"
-        )
+    if refresh_claims_are_fresh(payload):
+        # Email/verified were read from the database recently; revoked tokens
+        # are already rejected by the blacklist check in verify_refresh_token
+        user_id, user_email = payload["sub"], payload["email"]
+        claims_at = payload["claims_at"]
+    else:
+        # Get user to ensure they still exist and are verified
+        user = await neo4j.find_user_by_id(payload["sub"])
+
+        if not user:
+            raise HTTPException(
+                status_code=401,
+                detail="User not found"
+            )
+
+        if not user.get("verified", False):
+            raise HTTPException(
+                status_code=403,
+                detail="Email not verified"
+            )
+
+        user_id, user_email = user["id"], user["email"]
+        claims_at = None
 
     # Blacklist old refresh token
     if payload.get("jti"):
@@ -401,8 +453,8 @@ async def refresh_tokens(
         await blacklist_token(payload["jti"], remaining, request)
 
     # Generate new tokens
-    new_access_token = create_access_token(user["id"], user["email"])
-    new_refresh_token = create_refresh_token(user["id"])
+    new_access_token = create_access_token(user_id, user_email)
+    new_refresh_token = create_refresh_token(user_id, user_email, verified=True, claims_at=claims_at)
 
     # Set new refresh token cookie
     response.set_cookie(
@@ -480,16 +532,23 @@ async def reset_password(
     """
     Reset password using token from email.
     """
-    user = await neo4j.find_user_by_reset_token(data.token)
-
-    if not user:
+    if not _TOKEN_RE.match(data.token):
         raise HTTPException(
             status_code=400,
             detail="Invalid or expired reset link"
         )
 
-    new_hash = hash_password(data.password)
-    success = await neo4j.update_user_password(user["id"], new_hash)
+    async with neo4j.session() as session:
+        user = await neo4j.find_user_by_reset_token(data.token, session)
+
+        if not user:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid or expired reset link"
+            )
+
+        new_hash = hash_password(data.password)
+        success = await neo4j.update_user_password(user["id"], new_hash, session)
 
     if not success:
         raise HTTPException(status_code=500, detail="Failed to reset password")
@@ -508,21 +567,22 @@ async def change_password(
 
     - Requires current password for verification
     """
-    user = await neo4j.find_user_by_id(current_user["user_id"])
+    async with neo4j.session() as session:
+        user = await neo4j.find_user_by_id(current_user["user_id"], session)
 
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    # Verify current password
-    if not verify_password(data.current_password, user.get("password_hash", "")):
-        raise HTTPException(
-            status_code=400,
-            detail="Current password is incorrect"
-        )
+        # Verify current password
+        if not verify_password(data.current_password, user.get("password_hash", "")):
+            raise HTTPException(
+                status_code=400,
+                detail="Current password is incorrect"
+            )
 
-    # Update password
-    new_hash = hash_password(data.new_password)
-    success = await neo4j.update_user_password(user["id"], new_hash)
+        # Update password
+        new_hash = hash_password(data.new_password)
+        success = await neo4j.update_user_password(user["id"], new_hash, session)
 
     if not success:
         raise HTTPException(status_code=500, detail="Failed to update password")
@@ -530,7 +590,7 @@ async def change_password(
     return {"message": "Password changed successfully"}
 
 
-@router.get("/me/apikeys")
+@router.get("/me/apikeys", response_class=ORJSONResponse)
 async def get_my_api_keys(
     current_user: dict = Depends(get_current_user),
     neo4j: Neo4jClient = Depends(get_neo4j_client)
@@ -542,12 +602,7 @@ async def get_my_api_keys(
     - Use this to retrieve your API key(s) after login
     """
     user_id = current_user["user_id"]
-    keys = await neo4j.get_user_api_keys(user_id)
-
-    return {
-        "api_keys": keys,
-        "count": len(keys)
-    }
+    return await neo4j.get_user_api_keys(user_id)
 
 
 @router.post("/me/apikeys/generate")
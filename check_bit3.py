@@ -1,30 +1,23 @@
 #!/usr/bin/env python3
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
-import os
+
+from db.neo4j_client import get_sync_driver
 
 load_dotenv()
 
-driver = GraphDatabase.driver(
-    os.getenv("NEO4J_URI"),
-    auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
-)
+driver = get_sync_driver()
+
+# Single case-insensitive regex: one pass over e.name instead of eight CONTAINS tests
+BIOLOGICAL_KEYWORDS = ["dog", "cat", "bird", "plant", "tree", "animal", "fish", "bacteria"]
+BIOLOGICAL_NAME_PATTERN = "(?i).*(" + "|".join(BIOLOGICAL_KEYWORDS) + ").*"
 
 with driver.session() as session:
     # Check entities with bit 3 OFF that might be biological
     result = session.run("""
-        MATCH (e:Entity)-[r:HAS_TRAIT]->(t:Trait {bit: 3})
-        WHERE r.applicable = false
-        AND (toLower(e.name) CONTAINS 'dog'
-             OR toLower(e.name) CONTAINS 'cat'
-             OR toLower(e.name) CONTAINS 'bird'
-             OR toLower(e.name) CONTAINS 'plant'
-             OR toLower(e.name) CONTAINS 'tree'
-             OR toLower(e.name) CONTAINS 'animal'
-             OR toLower(e.name) CONTAINS 'fish'
-             OR toLower(e.name) CONTAINS 'bacteria')
+        MATCH (e:Entity)-[r:HAS_TRAIT {applicable: false}]->(t:Trait {bit: 3})
+        WHERE e.name =~ $name_pattern
         RETURN count(e) as count, collect(e.name)[0..10] as examples
-    """)
+    """, name_pattern=BIOLOGICAL_NAME_PATTERN)
     record = result.single()
     print(f"Potentially incorrect entities: {record['count']}")
     print(f"\nExamples:")
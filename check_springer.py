@@ -1,14 +1,11 @@
 #!/usr/bin/env python3
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
-import os
+
+from db.neo4j_client import get_sync_driver
 
 load_dotenv()
 
-driver = GraphDatabase.driver(
-    os.getenv("NEO4J_URI"),
-    auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
-)
+driver = get_sync_driver()
 
 with driver.session() as session:
     # Search for English Springer Spaniel
@@ -1,112 +1,895 @@
-from neo4j import AsyncGraphDatabase, AsyncDriver
-from typing import List, Dict, Any, Optional
+from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncSession, GraphDatabase, Driver, Query, READ_ACCESS, RoutingControl
+from typing import List, Dict, Any, Optional, AsyncIterator
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+import asyncio
+import hashlib
+import heapq
 import logging
+import os
+import struct
+import time
 from datetime import datetime
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Set-bit count for every byte value; Hamming distance on uht_int is summed
+# from the four byte lookups of the XOR
+POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Dimensions of the entity_embedding vector index (text-embedding-3-small)
+EMBEDDING_DIMENSIONS = 1536
+
+# Snapshots at least this large are scanned by the parallel Numba kernel;
+# below it the NumPy pass finishes before the threads would spin up
+NUMBA_HAMMING_MIN_ENTITIES = 200_000
+
+# High-threshold searches (at most this many differing bits) over snapshots
+# at least HAMMING_TREE_MIN_ENTITIES large walk the sorted snapshot as a bit
+# trie instead of scanning it; slices of HAMMING_TREE_LEAF_SIZE codes or
+# fewer are scored directly rather than split further. (A layer-byte equality
+# prefilter can't replace this: at the default 4-bit radius each of the four
+# bytes may hold one of the differing bits, so no byte is guaranteed to match)
+HAMMING_TREE_MAX_DISTANCE = 4
+HAMMING_TREE_MIN_ENTITIES = 1_000_000
+HAMMING_TREE_LEAF_SIZE = 512
+
+# How long the in-process (uuid, uht_int) snapshot used for similarity search is reused
+UHT_CACHE_TTL_SECONDS = 300
+
+# Distinct codes per matmul when building the trait co-occurrence matrix;
+# bounds the temporary float64 bit matrix to a few MB
+COOCCURRENCE_CHUNK_ROWS = 1 << 16
+
+# How long get_trait_statistics results are reused before re-scanning traits
+TRAIT_STATS_TTL_SECONDS = 60
+
+# How long the HAS_TRAIT confidence aggregations (trait frequency detail and
+# confidence statistics) are reused; entity and trait writes drop them early
+ANALYTICS_CACHE_TTL_SECONDS = 60
+
+# find_similar_by_embedding results are memoized per (embedding, limit,
+# min_score) for repeat searches; oldest entries are evicted past the size cap
+SIMILAR_EMBEDDING_CACHE_SIZE = 2000
+SIMILAR_EMBEDDING_CACHE_TTL_SECONDS = 300
+
+# Vector-index searches that miss the cache while another is in flight are
+# held for up to this long (or until this many are queued) and sent to
+# Neo4j as one UNWIND query
+SIMILAR_EMBEDDING_BATCH_WINDOW_SECONDS = 0.005
+SIMILAR_EMBEDDING_BATCH_SIZE = 16
+
+# Rows pulled per Bolt round trip by the projection embedding load; each
+# block is decoded into the matrix before the next one is requested
+PROJECTION_FETCH_ROWS = 1000
+
+# Rows pulled per Bolt round trip by iter_all_embeddings
+EMBEDDING_STREAM_FETCH_ROWS = 500
+
+# How long count_entities_with_embeddings results are reused
+EMBEDDING_COUNTS_TTL_SECONDS = 30
+
+# Server-side transaction timeout for the per-request lookups and searches
+# below; a runaway one is killed rather than holding its pooled connection
+# while other requests queue for acquisition
+INTERACTIVE_QUERY_TIMEOUT_SECONDS = 5.0
+
+# Schema DDL is idempotent; only send it once per process even though some
+# routes open a fresh client per request
+_constraints_applied = False
+
+# (uri, user) -> [driver, connected client count]. Clients opened per request
+# borrow the process's driver (and its connection pool) instead of building
+# their own; the last one to close shuts it down
+_shared_drivers: Dict[tuple, list] = {}
+
+# Schema applied by create_constraints, keyed by index/constraint name so
+# existing entries can be skipped without parsing the statements
+_SCHEMA_STATEMENTS = (
+    ("entity_uuid", "CREATE CONSTRAINT entity_uuid IF NOT EXISTS FOR (e:Entity) REQUIRE e.uuid IS UNIQUE"),
+    ("trait_bit", "CREATE CONSTRAINT trait_bit IF NOT EXISTS FOR (t:Trait) REQUIRE t.bit IS UNIQUE"),
+    ("entity_name", "CREATE INDEX entity_name IF NOT EXISTS FOR (e:Entity) ON (e.name)"),
+    ("entity_uht", "CREATE INDEX entity_uht IF NOT EXISTS FOR (e:Entity) ON (e.uht_code)"),
+    ("entity_uht_int", "CREATE INDEX entity_uht_int IF NOT EXISTS FOR (e:Entity) ON (e.uht_int)"),
+    ("entity_total_bits", "CREATE INDEX entity_total_bits IF NOT EXISTS FOR (e:Entity) ON (e.total_bits)"),
+    ("entity_uht_text", "CREATE TEXT INDEX entity_uht_text IF NOT EXISTS FOR (e:Entity) ON (e.uht_code)"),
+    ("entity_wikidata_qid", "CREATE INDEX entity_wikidata_qid IF NOT EXISTS FOR (e:Entity) ON (e.wikidata_qid)"),
+    ("entity_wikidata_type", "CREATE INDEX entity_wikidata_type IF NOT EXISTS FOR (e:Entity) ON (e.wikidata_type)"),
+    ("entity_embedding_created", "CREATE INDEX entity_embedding_created IF NOT EXISTS FOR (e:Entity) ON (e.embedding_created_at, e.uuid)"),
+    ("classification_date", "CREATE INDEX classification_date IF NOT EXISTS FOR (c:Classification) ON (c.created_at)"),
+    # User authentication
+    ("user_id", "CREATE CONSTRAINT user_id IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE"),
+    ("user_email", "CREATE CONSTRAINT user_email IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE"),
+    ("user_verification_token", "CREATE INDEX user_verification_token IF NOT EXISTS FOR (u:User) ON (u.verification_token)"),
+    ("user_reset_token", "CREATE INDEX user_reset_token IF NOT EXISTS FOR (u:User) ON (u.password_reset_token)"),
+    # Collections
+    ("collection_id", "CREATE CONSTRAINT collection_id IF NOT EXISTS FOR (c:Collection) REQUIRE c.id IS UNIQUE"),
+    ("collection_name", "CREATE INDEX collection_name IF NOT EXISTS FOR (c:Collection) ON (c.name)"),
+    # Trait Flags (for user-reported incorrect traits)
+    ("trait_flag_id", "CREATE CONSTRAINT trait_flag_id IF NOT EXISTS FOR (f:TraitFlag) REQUIRE f.flag_id IS UNIQUE"),
+    ("trait_flag_entity", "CREATE INDEX trait_flag_entity IF NOT EXISTS FOR (f:TraitFlag) ON (f.entity_uuid)"),
+    ("trait_flag_bit", "CREATE INDEX trait_flag_bit IF NOT EXISTS FOR (f:TraitFlag) ON (f.trait_bit)"),
+    ("trait_flag_status", "CREATE INDEX trait_flag_status IF NOT EXISTS FOR (f:TraitFlag) ON (f.status)"),
+    # Correction History (for audit trail)
+    ("correction_history_date", "CREATE INDEX correction_history_date IF NOT EXISTS FOR ()-[h:CORRECTION_HISTORY]->() ON (h.changed_at)"),
+    # Entity Version History
+    ("entity_version_id", "CREATE CONSTRAINT entity_version_id IF NOT EXISTS FOR (v:EntityVersion) REQUIRE v.version_id IS UNIQUE"),
+    ("entity_version_entity", "CREATE INDEX entity_version_entity IF NOT EXISTS FOR (v:EntityVersion) ON (v.entity_uuid)"),
+    ("entity_version_number", "CREATE INDEX entity_version_number IF NOT EXISTS FOR (v:EntityVersion) ON (v.entity_uuid, v.version_number)"),
+    ("entity_version_date", "CREATE INDEX entity_version_date IF NOT EXISTS FOR (v:EntityVersion) ON (v.changed_at)"),
+)
+
+# Hot read queries, kept as module constants so every call sends identical
+# text and hits the same server-side plan cache entry. Entity lookups carry
+# USING INDEX hints so they stay index seeks even when planner statistics
+# are stale. Request-path queries are built once as Query objects carrying
+# INTERACTIVE_QUERY_TIMEOUT_SECONDS
+
+_Q_FIND_ENTITY_BY_UUID = Query("""
+MATCH (e:Entity {uuid: $uuid})
+USING INDEX e:Entity(uuid)
+OPTIONAL MATCH (e)-[r:HAS_TRAIT]->(t:Trait)
+WITH e, collect(t {.*, evaluation: r {.*}}) as traits
+RETURN apoc.map.removeKeys(e {.*, traits: traits}, ['embedding_q', 'embedding_scale']) as entity
+""", timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS)
+
+_UHT_SEARCH_RETURN = """
+RETURN e {
+    .uuid, .name, .description, .uht_code, .binary_representation,
+    .image_url, .nsfw, .created_at
+} as e
+ORDER BY e.created_at DESC
+LIMIT 100
+"""
+
+# "contains" is served by the entity_uht_text TEXT index, "prefix" by the
+# entity_uht range index
+_Q_SEARCH_ENTITIES_BY_UHT = {
+    "contains": Query(
+        "MATCH (e:Entity)\nUSING TEXT INDEX e:Entity(uht_code)\n"
+        "WHERE e.uht_code CONTAINS $pattern" + _UHT_SEARCH_RETURN,
+        timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS
+    ),
+    "prefix": Query(
+        "MATCH (e:Entity)\nUSING RANGE INDEX e:Entity(uht_code)\n"
+        "WHERE e.uht_code STARTS WITH $pattern" + _UHT_SEARCH_RETURN,
+        timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS
+    ),
+}
+
+_Q_UHT_INTS = """
+MATCH (e:Entity)
+WHERE e.uht_int IS NOT NULL
+RETURN e.uuid as uuid, e.uht_int as uht_int
+"""
+
+# Per-entity codes rebuilt from applicable HAS_TRAIT edges (bit 1 is the most
+# significant bit), for trait analytics while uht_int is not yet backfilled;
+# trait-less entities come back as 0 so every Entity is counted
+_Q_TRAIT_CODES = """
+MATCH (e:Entity)
+OPTIONAL MATCH (e)-[:HAS_TRAIT {applicable: true}]->(t:Trait)
+WITH e, collect(DISTINCT t.bit) as bits
+RETURN reduce(code = 0, b IN bits | code + toInteger(2 ^ (32 - b))) as uht_int
+"""
+
+# Detail fetch for similarity hits; the embedding vectors are dropped
+# server-side so they never cross the wire
+_Q_ENTITIES_BY_UUIDS = Query("""
+MATCH (e:Entity)
+USING INDEX e:Entity(uuid)
+WHERE e.uuid IN $uuids
+RETURN apoc.map.removeKeys(properties(e), ['embedding', 'embedding_q', 'embedding_scale']) as e
+""", timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS)
+
+_Q_ENTITY_UHT_INT = Query("""
+MATCH (e:Entity {uuid: $uuid})
+USING INDEX e:Entity(uuid)
+RETURN e.uht_int as uht_int
+""", timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS)
+
+# Listing fields for Hamming neighbours ranked against the uht_int snapshot
+_Q_NEIGHBORS_BY_UUIDS = Query("""
+MATCH (e:Entity)
+USING INDEX e:Entity(uuid)
+WHERE e.uuid IN $uuids
+RETURN e.uuid as uuid,
+       e.name as name,
+       e.uht_code as uht_code,
+       e.image_url as image_url
+""", timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS)
+
+# t.entity_count is a denormalized count of applicable HAS_TRAIT edges kept
+# up to date by every write that creates, flips or deletes one; it stays
+# null until recount_trait_entity_counts() has initialised it
+_Q_TRAIT_STATISTICS = """
+MATCH (t:Trait)
+RETURN t.bit as bit,
+       t.name as name,
+       t.layer as layer,
+       t.entity_count as entity_count
+ORDER BY t.bit
+"""
+
+_Q_RECOUNT_TRAIT_ENTITIES = """
+MATCH (t:Trait)
+SET t.entity_count = COUNT { (:Entity)-[:HAS_TRAIT {applicable: true}]->(t) }
+"""
+
+# UHT code format: PPFFAASS (8 hex chars = 4 bytes)
+# Physical: chars 0-1, Functional: 2-3, Abstract: 4-5, Social: 6-7
+_HEX_PAIR_LAYER_OFFSETS = (("Physical", 0), ("Functional", 2), ("Abstract", 4), ("Social", 6))
+
+# All four layers from one scan of the codes: each code is unwound over the
+# $layers offsets and grouped per (layer, pair); the entity total (from the
+# label count store) rides along on every row
+_Q_HEX_PAIR_FREQUENCY = """
+CALL {
+    MATCH (e:Entity)
+    RETURN count(e) as total_entities
+}
+MATCH (e:Entity)
+WHERE e.uht_code IS NOT NULL AND size(e.uht_code) = 8
+WITH total_entities, toUpper(e.uht_code) as code
+UNWIND $layers as l
+RETURN total_entities, l.layer as layer, substring(code, l.start, 2) as hex_pair, count(*) as count
+ORDER BY count DESC
+"""
+
+# Coordinates for get_all_projections; property names can't be parameters,
+# so the text for each projection type is built once at import
+_Q_PROJECTIONS = {
+    method: f"""
+MATCH (e:Entity)
+WHERE e.{method}_x IS NOT NULL AND e.{method}_y IS NOT NULL
+RETURN e.uuid as uuid,
+       e.name as name,
+       e.uht_code as uht_code,
+       e.{method}_x as x,
+       e.{method}_y as y,
+       e.image_url as image_url
+"""
+    for method in ("umap", "tsne")
+}
+
+# Entity embeddings (store, vector-index search, migration and projection loads)
+# Search, listing and bulk reads run without bookmarks: they tolerate a
+# replica a few commits behind, so they needn't wait for it to catch up
+
+# The float vector feeds the vector index and is written through
+# setNodeVectorProperty, which validates it and stores it as a FLOAT32 array
+# (half the size of a plain float list); the INT8 copy (~8x smaller) is what
+# bulk readers such as the projection job pull over Bolt
+_Q_STORE_ENTITY_EMBEDDING = """
+MATCH (e:Entity {uuid: $uuid})
+USING INDEX e:Entity(uuid)
+CALL db.create.setNodeVectorProperty(e, 'embedding', $embedding)
+SET e.embedding_normalized = true,
+    e.embedding_q = $embedding_q,
+    e.embedding_scale = $embedding_scale,
+    e.embedding_model = $model_used,
+    e.embedding_created_at = datetime()
+RETURN e.uuid as uuid,
+       e.name as name,
+       e.embedding_model as embedding_model,
+       e.embedding_created_at as embedding_created_at
+"""
+
+# The hint pins the entity_uuid constraint's index seek (see create_constraints)
+_Q_ENTITY_EMBEDDING = Query("""
+MATCH (e:Entity {uuid: $uuid})
+USING INDEX e:Entity(uuid)
+WHERE e.embedding IS NOT NULL
+RETURN e.uuid as uuid,
+       e.name as name,
+       e.embedding as embedding,
+       e.embedding_model as model_used,
+       e.embedding_created_at as created_at
+""", timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS)
+
+# One vector-index search per queued caller; q.idx routes rows back to them
+_Q_SIMILAR_BY_EMBEDDING = Query("""
+UNWIND $queries as q
+CALL db.index.vector.queryNodes('entity_embedding', q.limit, q.embedding)
+YIELD node, score
+WHERE score >= q.min_score
+RETURN q.idx as idx,
+       node.uuid as uuid,
+       node.name as name,
+       node.description as description,
+       node.uht_code as uht_code,
+       node.image_url as image_url,
+       score as similarity_score
+ORDER BY idx, score DESC
+""", timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS)
+
+# Seeds the vector search with the source entity's stored embedding server-side,
+# so "similar to X" needn't fetch the vector first; one extra hit covers X itself
+_Q_SIMILAR_TO_ENTITY = Query("""
+MATCH (src:Entity {uuid: $uuid})
+WHERE src.embedding IS NOT NULL
+CALL db.index.vector.queryNodes('entity_embedding', $limit + 1, src.embedding)
+YIELD node, score
+WHERE score >= $min_score AND node <> src
+RETURN node.uuid as uuid,
+       node.name as name,
+       node.description as description,
+       node.uht_code as uht_code,
+       node.image_url as image_url,
+       score as similarity_score
+ORDER BY score DESC
+LIMIT $limit
+""", timeout=INTERACTIVE_QUERY_TIMEOUT_SECONDS)
+
+# Offset paging, for the first page and for clients without a cursor
+_Q_ALL_EMBEDDINGS = """
+MATCH (e:Entity)
+WHERE e.embedding IS NOT NULL
+RETURN e.uuid as uuid,
+       e.name as name,
+       CASE WHEN $q8 AND e.embedding_q IS NOT NULL THEN e.embedding_q ELSE e.embedding END as embedding,
+       CASE WHEN $q8 THEN e.embedding_scale END as embedding_scale,
+       e.embedding_model as model_used,
+       e.embedding_created_at as created_at
+ORDER BY e.embedding_created_at DESC, e.uuid DESC
+SKIP $offset
+LIMIT $limit
+"""
+
+# Keyset pagination: ($after_created_at, $after_uuid) is the last row of the
+# previous page, so deep pages don't re-walk every earlier row through SKIP
+_Q_EMBEDDINGS_AFTER = """
+MATCH (e:Entity)
+WHERE e.embedding IS NOT NULL
+  AND (e.embedding_created_at < datetime($after_created_at)
+       OR (e.embedding_created_at = datetime($after_created_at) AND e.uuid < $after_uuid))
+RETURN e.uuid as uuid,
+       e.name as name,
+       CASE WHEN $q8 AND e.embedding_q IS NOT NULL THEN e.embedding_q ELSE e.embedding END as embedding,
+       CASE WHEN $q8 THEN e.embedding_scale END as embedding_scale,
+       e.embedding_model as model_used,
+       e.embedding_created_at as created_at
+ORDER BY e.embedding_created_at DESC, e.uuid DESC
+LIMIT $limit
+"""
+
+# Unpaged export for iter_all_embeddings; the driver pulls it in fetch_size
+# blocks, so there is no SKIP to re-walk and no ORDER BY to sort everything first
+_Q_STREAM_EMBEDDINGS = """
+MATCH (e:Entity)
+WHERE e.embedding IS NOT NULL
+RETURN e.uuid as uuid,
+       e.name as name,
+       CASE WHEN $q8 AND e.embedding_q IS NOT NULL THEN e.embedding_q ELSE e.embedding END as embedding,
+       CASE WHEN $q8 THEN e.embedding_scale END as embedding_scale,
+       e.embedding_model as model_used,
+       e.embedding_created_at as created_at
+"""
+
+# LIMIT before reading traits so only the returned batch is expanded; the
+# pattern comprehension yields [] rather than a null row for trait-less entities
+_Q_ENTITIES_WITHOUT_EMBEDDINGS = """
+MATCH (e:Entity)
+WHERE e.embedding IS NULL
+WITH e
+LIMIT $limit
+RETURN e.uuid as uuid,
+       e.name as name,
+       e.description as description,
+       e.uht_code as uht_code,
+       e.binary_representation as binary_representation,
+       [(e)-[r:HAS_TRAIT]->(t:Trait) | {
+           trait_name: t.name,
+           applicable: r.applicable
+       }] as trait_evaluations
+"""
+
+# The total comes from the label count store and the embedded count from the
+# entity_embedding_created index (embedding_created_at is set with every
+# vector), so neither side reads node properties
+_Q_COUNT_ENTITIES = "MATCH (e:Entity) RETURN count(e) as total"
+
+_Q_COUNT_EMBEDDINGS = """
+MATCH (e:Entity)
+WHERE e.embedding_created_at IS NOT NULL AND e.uuid IS NOT NULL
+RETURN count(e) as with_embeddings
+"""
+
+_Q_PROJECTION_EMBEDDINGS = """
+MATCH (e:Entity)
+WHERE e.embedding IS NOT NULL
+RETURN e.uuid as uuid,
+       e.uht_code as uht_code,
+       e.embedding_q as embedding_q,
+       e.embedding_scale as embedding_scale,
+       CASE WHEN e.embedding_q IS NULL THEN e.embedding END as embedding
+"""
+
+# Entity upsert shared by create_entity and create_entities_batch; expects the
+# EntityParams fields bound as the map "row" (one $props map or UNWIND $rows).
+# A reclassified entity's old HAS_TRAIT edges (and the Trait counters they
+# fed) are cleared in the same statement before the new ones are created
+_ENTITY_UPSERT = """
+MERGE (e:Entity {uuid: row.uuid})
+ON CREATE SET
+    e.name = row.name,
+    e.description = row.description,
+    e.uht_code = row.uht_code,
+    e.uht_int = row.uht_int,
+    e.binary_representation = row.binary_representation,
+    e.wikidata_qid = row.wikidata_qid,
+    e.wikidata_type = row.wikidata_type,
+    e.wikidata_type_label = row.wikidata_type_label,
+    e.sitelinks_count = row.sitelinks_count,
+    e.created_at = datetime(),
+    e.version = 1
+ON MATCH SET
+    e.name = row.name,
+    e.description = row.description,
+    e.uht_code = row.uht_code,
+    e.uht_int = row.uht_int,
+    e.binary_representation = row.binary_representation,
+    e.wikidata_qid = COALESCE(row.wikidata_qid, e.wikidata_qid),
+    e.wikidata_type = COALESCE(row.wikidata_type, e.wikidata_type),
+    e.wikidata_type_label = COALESCE(row.wikidata_type_label, e.wikidata_type_label),
+    e.sitelinks_count = COALESCE(row.sitelinks_count, e.sitelinks_count),
+    e.image_url = COALESCE(e.image_url, row.image_url),
+    e.updated_at = datetime(),
+    e.version = COALESCE(e.version, 0) + 1
+SET e.physical_bits = row.physical_bits,
+    e.functional_bits = row.functional_bits,
+    e.abstract_bits = row.abstract_bits,
+    e.social_bits = row.social_bits,
+    e.total_bits = row.total_bits
+
+WITH e, row
+CALL {
+    WITH e
+    MATCH (e)-[old:HAS_TRAIT]->(ot:Trait)
+    FOREACH (_ IN CASE WHEN old.applicable AND ot.entity_count IS NOT NULL THEN [1] ELSE [] END |
+        SET ot.entity_count = ot.entity_count - 1)
+    DELETE old
+}
+WITH e, row
+UNWIND row.trait_evaluations as eval
+MATCH (t:Trait {bit: eval.trait_bit})
+CREATE (e)-[r:HAS_TRAIT {
+    applicable: eval.applicable,
+    confidence: eval.confidence,
+    justification: eval.justification,
+    model_used: eval.model_used,
+    evaluated_at: datetime()
+}]->(t)
+FOREACH (_ IN CASE WHEN eval.applicable AND t.entity_count IS NOT NULL THEN [1] ELSE [] END |
+    SET t.entity_count = t.entity_count + 1)
+
+"""
+
+
+@lru_cache(maxsize=1)
+def get_sync_driver() -> Driver:
+    """Get the process-wide synchronous driver used by CLI scripts.
+
+    Reads NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD on first call, so callers
+    should run load_dotenv() beforehand.
+    """
+    return GraphDatabase.driver(
+        os.getenv("NEO4J_URI"),
+        auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")),
+        max_connection_pool_size=10,
+        connection_acquisition_timeout=5
+    )
+
+
+# Node properties that only exist for storage/bulk reads and are stripped
+# from entity responses
+INTERNAL_ENTITY_PROPERTIES = ("embedding_q", "embedding_scale")
+
+
+def layer_bit_counts(uht_int: int) -> Dict[str, int]:
+    """Set-bit counts per layer byte of a UHT code, as stored on Entity nodes"""
+    return {
+        "physical_bits": (uht_int >> 24 & 0xFF).bit_count(),
+        "functional_bits": (uht_int >> 16 & 0xFF).bit_count(),
+        "abstract_bits": (uht_int >> 8 & 0xFF).bit_count(),
+        "social_bits": (uht_int & 0xFF).bit_count(),
+        "total_bits": uht_int.bit_count()
+    }
+
+
+def normalize_embedding(embedding: List[float]) -> np.ndarray:
+    """L2-normalize a vector as float32, so cosine similarity against other stored vectors is a plain dot product"""
+    vec = np.asarray(embedding, dtype=np.float32)
+    return vec / np.float32(np.linalg.norm(vec) + 1e-12)
+
+
+def quantize_embedding(embedding: List[float]) -> tuple:
+    """Symmetric INT8 quantization: returns (int list in [-127, 127], scale) with v ~= q * scale.
+
+    Kept as an integer list rather than bytes so nodes stay JSON-serializable;
+    Neo4j bit-packs small-integer arrays and Bolt sends each as one or two bytes.
+    """
+    vec = np.asarray(embedding, dtype=np.float32)
+    scale = float(np.abs(vec).max()) / 127 or 1.0
+    q = np.clip(np.round(vec / scale), -127, 127).astype(np.int8)
+    return q.tolist(), scale
+
+
+def dequantize_embedding(embedding_q: List[int], scale: float) -> np.ndarray:
+    """Inverse of quantize_embedding, as a float32 vector"""
+    return np.asarray(embedding_q, dtype=np.float32) * np.float32(scale)
+
+
+def _embedding_row(row, q8: bool) -> Dict[str, Any]:
+    """Shape a _Q_ALL_EMBEDDINGS / _Q_EMBEDDINGS_AFTER / _Q_STREAM_EMBEDDINGS record for the embeddings API"""
+    entity = {
+        "entity_uuid": row["uuid"],
+        "name": row["name"],
+        # Already a list from the driver; no per-row copy
+        "embedding": row["embedding"] or None,
+        "dimension": len(row["embedding"] or ()),
+        "model_used": row["model_used"],
+        "created_at": row["created_at"].iso_format() if row["created_at"] else None
+    }
+    if q8:
+        entity["scale"] = row["embedding_scale"]
+        # Not yet backfilled by scripts/backfill_embedding_q.py
+        if entity["scale"] is None and entity["embedding"]:
+            entity["embedding"], entity["scale"] = quantize_embedding(entity["embedding"])
+    return entity
+
+
+@lru_cache(maxsize=1)
+def _get_hamming_kernel():
+    """Compile the multi-core XOR + popcount kernel on first use.
+
+    numba is imported lazily (it arrives with umap-learn) so processes that
+    never search a large snapshot don't pay its import and JIT cost.
+    """
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True)
+    def hamming_distances(codes, query):
+        out = np.empty(codes.shape[0], dtype=np.uint8)
+        for i in prange(codes.shape[0]):
+            # SWAR popcount of the 32-bit XOR
+            x = np.int64(codes[i] ^ query)
+            x = x - ((x >> 1) & 0x55555555)
+            x = (x & 0x33333333) + ((x >> 2) & 0x33333333)
+            x = (x + (x >> 4)) & 0x0F0F0F0F
+            out[i] = ((x * 0x01010101) & 0xFFFFFFFF) >> 24
+        return out
+
+    return hamming_distances
+
+
+def _hamming_distances(codes: np.ndarray, query: int) -> np.ndarray:
+    """Hamming distance from query to every code, as uint8"""
+    if codes.size >= NUMBA_HAMMING_MIN_ENTITIES:
+        return _get_hamming_kernel()(codes, np.uint32(query))
+    # XOR against every code, then popcount each 32-bit word byte-wise
+    xor = np.bitwise_xor(codes, np.uint32(query))
+    return POPCOUNT_LUT[xor.view(np.uint8).reshape(-1, 4)].sum(axis=1)
+
+
+def _hamming_tree_search(codes: np.ndarray, query: int, max_distance: int, k: int):
+    """Find the k nearest non-identical codes within max_distance of query.
+
+    codes must be sorted; it is walked as an implicit binary trie where a
+    node is a bit prefix plus its slice of codes, split on the next bit with
+    searchsorted. Nodes are expanded best-first on the bits mismatched so
+    far, a lower bound for every code below them, so hits come out nearest
+    first and whole subtrees beyond max_distance are never visited.
+
+    Returns (indices into codes, distances).
+    """
+    # (distance bound, -depth, prefix, lo, hi); scored codes use -depth = 1
+    heap = [(0, 0, 0, 0, codes.size)]
+    hits, distances = [], []
+    while heap and len(hits) < k:
+        bound, neg_depth, prefix, lo, hi = heapq.heappop(heap)
+        if neg_depth > 0:
+            hits.append(lo)
+            distances.append(bound)
+            continue
+
+        if hi - lo <= HAMMING_TREE_LEAF_SIZE or neg_depth == -32:
+            xor = np.bitwise_xor(codes[lo:hi], np.uint32(query))
+            leaf = POPCOUNT_LUT[xor.view(np.uint8).reshape(-1, 4)].sum(axis=1)
+            for j in np.flatnonzero((leaf <= max_distance) & (leaf != 0)).tolist():
+                heapq.heappush(heap, (int(leaf[j]), 1, 0, lo + j, 0))
+            continue
+
+        shift = 31 + neg_depth
+        mid = lo + int(np.searchsorted(codes[lo:hi], np.uint32((prefix * 2 + 1) << shift)))
+        query_bit = (query >> shift) & 1
+        for bit, start, end in ((0, lo, mid), (1, mid, hi)):
+            child_bound = bound + (bit != query_bit)
+            if start < end and child_bound <= max_distance:
+                heapq.heappush(heap, (child_bound, neg_depth - 1, prefix * 2 + bit, start, end))
+
+    return np.array(hits, dtype=np.int64), np.array(distances, dtype=np.int64)
+
+
+@dataclass(slots=True)
+class TraitParams:
+    """Bolt parameters for MERGE-ing one Trait node"""
+    bit: int
+    name: str
+    layer: str
+    short_description: Optional[str] = None
+    expanded_definition: Optional[str] = None
+    url: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TraitParams":
+        """Pick the stored fields out of a trait definition (extra spec keys are ignored)"""
+        return cls(
+            bit=data["bit"],
+            name=data["name"],
+            layer=data["layer"],
+            short_description=data.get("short_description"),
+            expanded_definition=data.get("expanded_definition"),
+            url=data.get("url")
+        )
+
+    def to_bolt_params(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class EntityParams:
+    """Bolt parameters for create_entity; only what the MERGE query reads is sent"""
+    uuid: Optional[str]
+    name: str
+    description: Optional[str]
+    uht_code: str
+    binary_representation: str
+    trait_evaluations: List[Dict[str, Any]]
+    wikidata_qid: Optional[str] = None
+    wikidata_type: Optional[str] = None
+    wikidata_type_label: Optional[str] = None
+    sitelinks_count: Optional[int] = None
+    image_url: Optional[str] = None
+    # Integer form of the UHT code for bitwise Hamming comparisons, plus
+    # its denormalized per-layer popcounts
+    uht_int: int = field(init=False)
+    physical_bits: int = field(init=False)
+    functional_bits: int = field(init=False)
+    abstract_bits: int = field(init=False)
+    social_bits: int = field(init=False)
+    total_bits: int = field(init=False)
+
+    def __post_init__(self):
+        self.uht_int = int(self.uht_code, 16)
+        for name, count in layer_bit_counts(self.uht_int).items():
+            setattr(self, name, count)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EntityParams":
+        """Build from a classification result, trimming each trait evaluation to its stored fields"""
+        return cls(
+            uuid=data.get("uuid"),
+            name=data["name"],
+            description=data.get("description"),
+            uht_code=data["uht_code"],
+            binary_representation=data["binary_representation"],
+            trait_evaluations=[
+                {
+                    "trait_bit": ev["trait_bit"],
+                    "applicable": ev["applicable"],
+                    "confidence": ev.get("confidence"),
+                    "justification": ev.get("justification"),
+                    "model_used": ev.get("model_used")
+                }
+                for ev in data["trait_evaluations"]
+            ],
+            wikidata_qid=data.get("wikidata_qid"),
+            wikidata_type=data.get("wikidata_type"),
+            wikidata_type_label=data.get("wikidata_type_label"),
+            sitelinks_count=data.get("sitelinks_count"),
+            image_url=data.get("image_url")
+        )
+
+    def to_bolt_params(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
 class Neo4jClient:
     """Neo4j database client for UHT Classification Factory"""
     
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        max_pool_size: Optional[int] = None,
+        acquisition_timeout: Optional[float] = None,
+        max_connection_lifetime: Optional[float] = None,
+        database: Optional[str] = None,
+        max_transaction_retry_time: Optional[float] = None,
+        keep_alive: bool = True
+    ):
         self.uri = uri
         self.user = user
         self.password = password
+        # Named explicitly on every session/query so the driver never has to
+        # resolve the user's home database first
+        self.database = database or os.getenv("NEO4J_DATABASE", "neo4j")
+        # Pool settings fall back to NEO4J_* env vars, then the driver defaults
+        self.max_pool_size = max_pool_size or int(os.getenv("NEO4J_POOL_SIZE", "100"))
+        self.acquisition_timeout = acquisition_timeout or float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))
+        self.max_connection_lifetime = max_connection_lifetime or float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+        self.max_transaction_retry_time = (
+            max_transaction_retry_time or float(os.getenv("NEO4J_MAX_TRANSACTION_RETRY_TIME", "30"))
+        )
+        self.keep_alive = keep_alive
         self.driver: Optional[AsyncDriver] = None
+        # Snapshot of every entity's UHT code for client-side Hamming search
+        self._uht_cache: Optional[np.ndarray] = None
+        self._uuid_cache: Optional[np.ndarray] = None
+        self._uht_cache_at = 0.0
+        self._uht_cache_lock = asyncio.Lock()
+        # (monotonic timestamp, result) of the last get_trait_statistics call
+        self._stats_cache: Optional[tuple] = None
+        # Concurrent callers (e.g. get_full_analytics) share one cold load
+        self._stats_lock = asyncio.Lock()
+        # (monotonic timestamp, codes) behind the trait analytics: the uht_int
+        # snapshot when it covers every Entity, else codes from HAS_TRAIT
+        self._trait_codes_cache: Optional[tuple] = None
+        self._trait_codes_lock = asyncio.Lock()
+        # (trait codes, per-trait counts, 32x32 co-occurrence) built from them
+        self._cooccurrence_cache: Optional[tuple] = None
+        # (co-occurrence matrix, traits by bit, result) of the last mutual-exclusivity call
+        self._exclusivity_cache: Optional[tuple] = None
+        # analytics name -> (monotonic timestamp, result), plus one lock per
+        # name so a dashboard refresh burst shares a single cold query
+        self._analytics_cache: Dict[str, tuple] = {}
+        self._analytics_locks: Dict[str, asyncio.Lock] = {}
+        # blake2b key -> (monotonic timestamp, results), in LRU order
+        self._similar_embedding_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        # Queued (query params, future) pairs waiting for the next batched
+        # vector-index search, the timer that flushes them, and running flushes
+        self._similar_embedding_batch: List[tuple] = []
+        self._similar_embedding_flush: Optional[asyncio.TimerHandle] = None
+        self._similar_embedding_tasks: set = set()
+        # (monotonic timestamp, result) of the last count_entities_with_embeddings call
+        self._embedding_counts_cache: Optional[tuple] = None
     
     async def connect(self):
-        """Initialize database connection"""
+        """Initialize database connection (shared with other clients for the same uri and user)"""
         try:
-            self.driver = AsyncGraphDatabase.driver(
-                self.uri, 
-                auth=(self.user, self.password)
-            )
-            await self.verify_connection()
+            shared = _shared_drivers.get((self.uri, self.user))
+            fresh = shared is None
+            if fresh:
+                driver = AsyncGraphDatabase.driver(
+                    self.uri,
+                    auth=(self.user, self.password),
+                    max_connection_pool_size=self.max_pool_size,
+                    connection_acquisition_timeout=self.acquisition_timeout,
+                    max_connection_lifetime=self.max_connection_lifetime,
+                    max_transaction_retry_time=self.max_transaction_retry_time,
+                    # TCP keepalive so idle pooled connections survive NAT/LB timeouts
+                    keep_alive=self.keep_alive
+                )
+                shared = _shared_drivers[(self.uri, self.user)] = [driver, 0]
+            shared[1] += 1
+            self.driver = shared[0]
+            # A borrowed driver was verified by the client that opened it
+            if fresh:
+                await self.verify_connection()
             await self.create_constraints()
             logger.info("Neo4j connection established")
         except Exception as e:
-            logger.error(f"Failed to connect to Neo4j: {e}")
+            logger.error("Failed to connect to Neo4j: %s", e)
+            await self._release_driver()
             raise
+
+    async def _release_driver(self):
+        """Drop this client's reference to the shared driver, closing it if it was the last one"""
+        driver, self.driver = self.driver, None
+        if driver is None:
+            return
+        shared = _shared_drivers.get((self.uri, self.user))
+        if shared is not None and shared[0] is driver:
+            shared[1] -= 1
+            if shared[1] > 0:
+                return
+            del _shared_drivers[(self.uri, self.user)]
+        await driver.close()
     
     async def close(self):
         """Close database connection"""
-        if self.driver:
-            await self.driver.close()
+        self._flush_similar_embedding_batch()
+        if self._similar_embedding_tasks:
+            await asyncio.gather(*self._similar_embedding_tasks, return_exceptions=True)
+        await self._release_driver()
     
+    def session(self, **kwargs) -> AsyncSession:
+        """Open a session on the client's database, to pass to several session-aware methods in turn"""
+        return self.driver.session(database=self.database, **kwargs)
+
     async def verify_connection(self) -> bool:
         """Verify database connection"""
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run("RETURN 1 as test")
             record = await result.single()
             return record["test"] == 1
     
     async def create_constraints(self):
         """Create database constraints and indexes"""
-        constraints = [
-            "CREATE CONSTRAINT entity_uuid IF NOT EXISTS FOR (e:Entity) REQUIRE e.uuid IS UNIQUE",
-            "CREATE CONSTRAINT trait_bit IF NOT EXISTS FOR (t:Trait) REQUIRE t.bit IS UNIQUE",
-            "CREATE INDEX entity_name IF NOT EXISTS FOR (e:Entity) ON (e.name)",
-            "CREATE INDEX entity_uht IF NOT EXISTS FOR (e:Entity) ON (e.uht_code)",
-            "CREATE INDEX entity_wikidata_qid IF NOT EXISTS FOR (e:Entity) ON (e.wikidata_qid)",
-            "CREATE INDEX entity_wikidata_type IF NOT EXISTS FOR (e:Entity) ON (e.wikidata_type)",
-            "CREATE INDEX classification_date IF NOT EXISTS FOR (c:Classification) ON (c.created_at)",
-            # User authentication
-            "CREATE CONSTRAINT user_id IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE",
-            "CREATE CONSTRAINT user_email IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
-            "CREATE INDEX user_verification_token IF NOT EXISTS FOR (u:User) ON (u.verification_token)",
-            "CREATE INDEX user_reset_token IF NOT EXISTS FOR (u:User) ON (u.password_reset_token)",
-            # Collections
-            "CREATE CONSTRAINT collection_id IF NOT EXISTS FOR (c:Collection) REQUIRE c.id IS UNIQUE",
-            "CREATE INDEX collection_name IF NOT EXISTS FOR (c:Collection) ON (c.name)",
-            # Trait Flags (for user-reported incorrect traits)
-            "CREATE CONSTRAINT trait_flag_id IF NOT EXISTS FOR (f:TraitFlag) REQUIRE f.flag_id IS UNIQUE",
-            "CREATE INDEX trait_flag_entity IF NOT EXISTS FOR (f:TraitFlag) ON (f.entity_uuid)",
-            "CREATE INDEX trait_flag_bit IF NOT EXISTS FOR (f:TraitFlag) ON (f.trait_bit)",
-            "CREATE INDEX trait_flag_status IF NOT EXISTS FOR (f:TraitFlag) ON (f.status)",
-            # Correction History (for audit trail)
-            "CREATE INDEX correction_history_date IF NOT EXISTS FOR ()-[h:CORRECTION_HISTORY]->() ON (h.changed_at)",
-            # Entity Version History
-            "CREATE CONSTRAINT entity_version_id IF NOT EXISTS FOR (v:EntityVersion) REQUIRE v.version_id IS UNIQUE",
-            "CREATE INDEX entity_version_entity IF NOT EXISTS FOR (v:EntityVersion) ON (v.entity_uuid)",
-            "CREATE INDEX entity_version_number IF NOT EXISTS FOR (v:EntityVersion) ON (v.entity_uuid, v.version_number)",
-            "CREATE INDEX entity_version_date IF NOT EXISTS FOR (v:EntityVersion) ON (v.changed_at)"
-        ]
-
-        async with self.driver.session() as session:
-            for constraint in constraints:
-                try:
-                    await session.run(constraint)
-                except Exception as e:
-                    logger.debug(f"Constraint already exists or error: {e}")
+        global _constraints_applied
+        if _constraints_applied:
+            return
+
+
+        # One SHOW round trip finds what already exists (uniqueness constraints
+        # list their backing index under the same name); on an initialized
+        # database nothing else is sent
+        existing = await self._get_index_names()
+        missing = [statement for name, statement in _SCHEMA_STATEMENTS if name not in existing]
+        if missing:
+            try:
+                async with self.driver.session(database=self.database) as session:
+                    async with await session.begin_transaction() as tx:
+                        for statement in missing:
+                            await tx.run(statement)
+                        await tx.commit()
+            except Exception as e:
+                # One clashing statement rolls back the lot; retry them
+                # individually so the rest still get created
+                logger.debug("Batched schema creation failed, retrying per statement: %s", e)
+                await asyncio.gather(*(self._run_schema_statement(c) for c in missing))
 
         # Create vector index for embeddings (Neo4j 5.18+)
-        await self._create_vector_index()
+        if "entity_embedding" not in existing:
+            await self._create_vector_index()
+        _constraints_applied = True
+
+    async def _get_index_names(self) -> set:
+        """Names of every index in the database (empty if they can't be listed)"""
+        try:
+            records, _, _ = await self.driver.execute_query("SHOW INDEXES YIELD name", database_=self.database)
+        except Exception as e:
+            logger.debug("Could not list indexes: %s", e)
+            return set()
+        return {record["name"] for record in records}
+
+    async def _run_schema_statement(self, statement: str):
+        """Run a single schema statement, logging rather than raising on failure"""
+        try:
+            async with self.driver.session(database=self.database) as session:
+                await session.run(statement)
+        except Exception as e:
+            logger.debug("Constraint already exists or error: %s", e)
 
     async def _create_vector_index(self):
         """Create vector index for entity embeddings if not exists"""
         try:
-            async with self.driver.session() as session:
+            async with self.driver.session(database=self.database) as session:
                 # Check if index already exists
                 result = await session.run("SHOW INDEXES WHERE name = 'entity_embedding'")
-                records = [record async for record in result]
 
-                if not records:
+                if await result.peek() is None:
                     # Create vector index (Neo4j 5.18+)
-                    await session.run("""
+                    await session.run(f"""
                         CREATE VECTOR INDEX entity_embedding IF NOT EXISTS
                         FOR (e:Entity) ON (e.embedding)
-                        OPTIONS {
-                            indexConfig: {
-                                `vector.dimensions`: 1536,
+                        OPTIONS {{
+                            indexConfig: {{
+                                `vector.dimensions`: {EMBEDDING_DIMENSIONS},
                                 `vector.similarity_function`: 'cosine'
-                            }
-                        }
+                            }}
+                        }}
                     """)
                     logger.info("Created vector index 'entity_embedding' for semantic search")
                 else:
                     logger.debug("Vector index 'entity_embedding' already exists")
         except Exception as e:
-            logger.warning(f"Could not create vector index (requires Neo4j 5.18+): {e}")
+            logger.warning("Could not create vector index (requires Neo4j 5.18+): %s", e)
     
     async def create_trait(self, trait_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create or update a trait node"""
@@ -121,205 +904,319 @@ class Neo4jClient:
         RETURN t
         """
         
-        async with self.driver.session() as session:
-            result = await session.run(query, **trait_data)
+        params = TraitParams.from_dict(trait_data).to_bolt_params()
+        self._stats_cache = None
+        self._analytics_cache.clear()
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(query, **params)
             record = await result.single()
-            return dict(record["t"]) if record else None
+            return dict(record["t"].items()) if record else None
     
+    async def create_traits_bulk(self, traits: List[Dict[str, Any]]) -> int:
+        """Create or update many trait nodes in a single round-trip"""
+        query = """
+        UNWIND $rows as row
+        MERGE (t:Trait {bit: row.bit})
+        SET t.name = row.name,
+            t.layer = row.layer,
+            t.short_description = row.short_description,
+            t.expanded_definition = row.expanded_definition,
+            t.url = row.url,
+            t.updated_at = datetime()
+        RETURN count(t) as created
+        """
+
+        rows = [TraitParams.from_dict(trait).to_bolt_params() for trait in traits]
+        self._stats_cache = None
+        self._analytics_cache.clear()
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(query, rows=rows)
+            record = await result.single()
+            return record["created"] if record else 0
+
     async def create_entity(self, entity_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create or update an entity with its classification (MERGE for reclassification support)"""
 
-        # First, delete existing trait relationships if entity exists (for clean reclassification)
-        delete_query = """
-        MATCH (e:Entity {uuid: $uuid})-[r:HAS_TRAIT]->()
-        DELETE r
+        # Use MERGE to create or update the entity; all fields travel as one $props map.
+        # A property map (minus the vectors) comes back rather than a Node
+        query = (
+            "WITH $props as row" + _ENTITY_UPSERT
+            + "RETURN DISTINCT apoc.map.removeKeys(properties(e), ['embedding', 'embedding_q', 'embedding_scale']) as e"
+        )
+
+        params = EntityParams.from_dict(entity_data)
+
+        # New or changed UHT code: rebuild the similarity snapshot and trait
+        # counts on next read
+        self._uht_cache_at = 0.0
+        self._stats_cache = None
+        self._analytics_cache.clear()
+
+        async with self.driver.session(database=self.database) as session:
+            # Replaces any old trait relationships with the new ones
+            result = await session.run(query, props=params.to_bolt_params())
+            # DISTINCT leaves at most one row
+            record = await result.single()
+            return record["e"] if record else None
+    
+    async def create_entities_batch(
+        self,
+        entities: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> int:
         """
+        Create or update many classified entities with UNWIND.
 
-        # Use MERGE to create or update the entity
-        query = """
-        MERGE (e:Entity {uuid: $uuid})
-        ON CREATE SET
-            e.name = $name,
-            e.description = $description,
-            e.uht_code = $uht_code,
-            e.binary_representation = $binary_representation,
-            e.wikidata_qid = $wikidata_qid,
-            e.wikidata_type = $wikidata_type,
-            e.wikidata_type_label = $wikidata_type_label,
-            e.sitelinks_count = $sitelinks_count,
-            e.created_at = datetime(),
-            e.version = 1
-        ON MATCH SET
-            e.name = $name,
-            e.description = $description,
-            e.uht_code = $uht_code,
-            e.binary_representation = $binary_representation,
-            e.wikidata_qid = COALESCE($wikidata_qid, e.wikidata_qid),
-            e.wikidata_type = COALESCE($wikidata_type, e.wikidata_type),
-            e.wikidata_type_label = COALESCE($wikidata_type_label, e.wikidata_type_label),
-            e.sitelinks_count = COALESCE($sitelinks_count, e.sitelinks_count),
-            e.image_url = COALESCE(e.image_url, $image_url),
-            e.updated_at = datetime(),
-            e.version = COALESCE(e.version, 0) + 1
-
-        WITH e
-        UNWIND $trait_evaluations as eval
-        MATCH (t:Trait {bit: eval.trait_bit})
-        CREATE (e)-[r:HAS_TRAIT {
-            applicable: eval.applicable,
-            confidence: eval.confidence,
-            justification: eval.justification,
-            model_used: eval.model_used,
-            evaluated_at: datetime()
-        }]->(t)
-
-        RETURN DISTINCT e
-        """
-
-        # Ensure wikidata fields have defaults
-        entity_data.setdefault("wikidata_qid", None)
-        entity_data.setdefault("wikidata_type", None)
-        entity_data.setdefault("wikidata_type_label", None)
-        entity_data.setdefault("sitelinks_count", None)
-        entity_data.setdefault("image_url", None)
-
-        async with self.driver.session() as session:
-            # Delete old trait relationships first (if entity exists)
-            await session.run(delete_query, uuid=entity_data["uuid"])
-            # Then create/update entity with new traits
-            result = await session.run(query, **entity_data)
-            # Consume all records and get the first one (DISTINCT should return only one)
-            records = [record async for record in result]
-            if records:
-                return dict(records[0]["e"])
-            return None
-    
-    async def find_entity_by_uuid(self, uuid: str) -> Optional[Dict[str, Any]]:
-        """Find entity by UUID"""
-        query = """
-        MATCH (e:Entity {uuid: $uuid})
-        OPTIONAL MATCH (e)-[r:HAS_TRAIT]->(t:Trait)
-        RETURN e, collect({
-            trait: t,
-            relationship: r
-        }) as traits
+        Same writes as create_entity, but each batch of up to batch_size
+        entities is one query in one transaction instead of a round trip
+        per entity. Returns the number of entities stored.
         """
-        
-        async with self.driver.session() as session:
-            result = await session.run(query, uuid=uuid)
+        query = "UNWIND $rows as row" + _ENTITY_UPSERT + "RETURN count(DISTINCT e) as stored"
+
+        async def write_batch(tx, rows):
+            result = await tx.run(query, rows=rows)
             record = await result.single()
-            if record:
-                entity = dict(record["e"])
-                entity["traits"] = [
-                    {
-                        **dict(t["trait"]),
-                        "evaluation": dict(t["relationship"])
-                    }
-                    for t in record["traits"] if t["trait"]
-                ]
-                return entity
-            return None
+            return record["stored"] if record else 0
+
+        # Last classification wins if the same uuid appears twice
+        params = {p.uuid: p for p in map(EntityParams.from_dict, entities)}
+        rows = [p.to_bolt_params() for p in params.values()]
+
+        self._uht_cache_at = 0.0
+        self._stats_cache = None
+        self._analytics_cache.clear()
+
+        stored = 0
+        async with self.driver.session(database=self.database) as session:
+            for i in range(0, len(rows), batch_size):
+                # execute_write retries the batch on transient errors, e.g.
+                # lock contention on the shared Trait counters
+                stored += await session.execute_write(write_batch, rows[i:i + batch_size])
+        return stored
+
+    async def find_entity_by_uuid(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """Find entity by UUID"""
+        records, _, _ = await self.driver.execute_query(
+            _Q_FIND_ENTITY_BY_UUID, uuid=uuid, database_=self.database, routing_=RoutingControl.READ
+        )
+        # Shaped entirely in Cypher as a plain map (internal properties dropped,
+        # traits nested); collect() drops the null row of a trait-less entity
+        return records[0]["entity"] if records else None
     
-    async def search_entities_by_uht(self, pattern: str) -> List[Dict[str, Any]]:
-        """Search entities by UHT code pattern"""
-        query = """
-        MATCH (e:Entity)
-        WHERE e.uht_code CONTAINS $pattern
-        RETURN e
-        ORDER BY e.created_at DESC
-        LIMIT 100
+    async def search_entities_by_uht(
+        self,
+        pattern: str,
+        match_mode: str = "contains"
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        
-        async with self.driver.session() as session:
+        Search entities by UHT code pattern.
+
+        Args:
+            pattern: UHT code fragment to match
+            match_mode: "contains" (substring anywhere) or "prefix" (code starts with pattern)
+
+        Yields listing fields only (no embedding or projection coordinates),
+        one entity at a time as records arrive.
+        """
+        query = _Q_SEARCH_ENTITIES_BY_UHT[match_mode]
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query, pattern=pattern)
-            entities = []
             async for record in result:
-                entities.append(dict(record["e"]))
-            return entities
+                yield record["e"]
     
+    async def _get_uht_cache(self):
+        """Get the (uuids, uht_ints) snapshot sorted by uht_int, reloading it once it is older than the TTL"""
+        async with self._uht_cache_lock:
+            if self._uht_cache is None or time.monotonic() - self._uht_cache_at > UHT_CACHE_TTL_SECONDS:
+                records, _, _ = await self.driver.execute_query(
+                    _Q_UHT_INTS, database_=self.database, routing_=RoutingControl.READ
+                )
+                uuids = np.array([r["uuid"] for r in records], dtype=object)
+                uht_ints = np.array([r["uht_int"] for r in records], dtype=np.uint32)
+                # Sorted so _hamming_tree_search can treat it as a bit trie
+                order = np.argsort(uht_ints, kind="stable")
+                self._uuid_cache = uuids[order]
+                self._uht_cache = uht_ints[order]
+                self._uht_cache_at = time.monotonic()
+            return self._uuid_cache, self._uht_cache
+
+    async def _get_trait_codes(self) -> np.ndarray:
+        """
+        Get one uht_int per Entity for the trait analytics.
+
+        This is the cached uht_int snapshot when it covers every Entity. On a
+        database where scripts/backfill_uht_int.py has not been run, the codes
+        are rebuilt from HAS_TRAIT edges instead, so counts don't silently drop.
+        """
+        async with self._trait_codes_lock:
+            cached = self._trait_codes_cache
+            if cached is None or time.monotonic() - cached[0] > UHT_CACHE_TTL_SECONDS:
+                _, uht_ints = await self._get_uht_cache()
+                record = await self.execute_read_single(_Q_COUNT_ENTITIES)
+                total = record["total"] if record else 0
+                if uht_ints.size >= total:
+                    codes = uht_ints
+                else:
+                    logger.warning(
+                        "%d of %d entities have no uht_int; trait analytics are read from "
+                        "HAS_TRAIT until scripts/backfill_uht_int.py is run",
+                        total - uht_ints.size, total
+                    )
+                    records, _, _ = await self.driver.execute_query(
+                        _Q_TRAIT_CODES, database_=self.database, routing_=RoutingControl.READ
+                    )
+                    codes = np.array([r["uht_int"] for r in records], dtype=np.uint32)
+                self._trait_codes_cache = (time.monotonic(), codes)
+            return self._trait_codes_cache[1]
+
+    async def _get_trait_cooccurrence(self):
+        """
+        Get per-trait applicable counts and the 32x32 co-occurrence matrix.
+
+        Built from _get_trait_codes rather than per-pair HAS_TRAIT expansion,
+        and only rebuilt when those codes reload. Index i is trait bit i + 1;
+        the diagonal of the matrix holds the counts.
+        """
+        uht_ints = await self._get_trait_codes()
+        if self._cooccurrence_cache is None or self._cooccurrence_cache[0] is not uht_ints:
+            # Entities sharing a UHT code contribute identical rows, so work on
+            # the distinct codes weighted by how many entities carry each one
+            codes, weights = np.unique(uht_ints, return_counts=True)
+            # One row per code, one column per trait; bit 1 is the most
+            # significant bit of uht_int
+            bits = np.unpackbits(codes.astype(">u4").view(np.uint8).reshape(-1, 4), axis=1)
+            cooc = np.zeros((32, 32), dtype=np.int64)
+            for i in range(0, len(bits), COOCCURRENCE_CHUNK_ROWS):
+                chunk = bits[i:i + COOCCURRENCE_CHUNK_ROWS].astype(np.float64)
+                weighted = chunk * weights[i:i + COOCCURRENCE_CHUNK_ROWS, None]
+                cooc += np.rint(chunk.T @ weighted).astype(np.int64)
+            self._cooccurrence_cache = (uht_ints, np.diagonal(cooc).copy(), cooc)
+        return self._cooccurrence_cache[1], self._cooccurrence_cache[2]
+
     async def find_similar_entities(self, uht_code: str, threshold: int = 28) -> List[Dict[str, Any]]:
-        """Find entities with similar UHT codes (Hamming distance)"""
-        query = """
-        MATCH (e:Entity)
-        WITH e, 
-             reduce(s = 0, i IN range(0, 31) | 
-                 s + CASE 
-                     WHEN substring(e.binary_representation, i, 1) = substring($binary, i, 1) 
-                     THEN 1 
-                     ELSE 0 
-                 END
-             ) as similarity
-        WHERE similarity >= $threshold AND e.uht_code <> $uht_code
-        RETURN e, similarity
-        ORDER BY similarity DESC
-        LIMIT 20
-        """
-        
-        # Convert UHT to binary
-        binary = bin(int(uht_code, 16))[2:].zfill(32)
-        
-        async with self.driver.session() as session:
-            result = await session.run(
-                query, 
-                binary=binary, 
-                uht_code=uht_code, 
-                threshold=threshold
-            )
-            entities = []
-            async for record in result:
-                entity = dict(record["e"])
-                entity["similarity_score"] = record["similarity"]
-                entities.append(entity)
-            return entities
-    
+        """Find entities with similar UHT codes (Hamming distance on uht_int)"""
+        uuids, uht_ints = await self._get_uht_cache()
+
+        query = int(uht_code, 16)
+        max_distance = 32 - threshold
+        if max_distance <= HAMMING_TREE_MAX_DISTANCE and uht_ints.size >= HAMMING_TREE_MIN_ENTITIES:
+            top, top_distance = _hamming_tree_search(uht_ints, query, max_distance, 20)
+            top_similarity = 32 - top_distance
+        else:
+            distance = _hamming_distances(uht_ints, query)
+            similarity = 32 - distance.astype(np.int64)
+
+            # Exclude identical codes, keep the 20 most similar above the threshold
+            candidates = np.flatnonzero((similarity >= threshold) & (distance != 0))
+            if candidates.size > 20:
+                # O(n) selection first so only 20 candidates get sorted
+                candidates = candidates[np.argpartition(-similarity[candidates], 19)[:20]]
+            top = candidates[np.argsort(-similarity[candidates], kind="stable")]
+            top_similarity = similarity[top]
+        if top.size == 0:
+            return []
+
+        scores = dict(zip(uuids[top].tolist(), top_similarity.tolist()))
+        records, _, _ = await self.driver.execute_query(
+            _Q_ENTITIES_BY_UUIDS, uuids=list(scores), database_=self.database, routing_=RoutingControl.READ
+        )
+        entities = []
+        for record in records:
+            entity = record["e"]
+            entity["similarity_score"] = scores[entity["uuid"]]
+            entities.append(entity)
+        entities.sort(key=lambda e: e["similarity_score"], reverse=True)
+        return entities
+
     async def get_trait_statistics(self) -> Dict[str, Any]:
-        """Get statistics about trait usage"""
-        query = """
-        MATCH (t:Trait)
-        OPTIONAL MATCH (e:Entity)-[r:HAS_TRAIT {applicable: true}]->(t)
-        WITH t, count(e) as entity_count
-        RETURN t.bit as bit, 
-               t.name as name, 
-               t.layer as layer,
-               entity_count
-        ORDER BY t.bit
-        """
-        
-        async with self.driver.session() as session:
-            result = await session.run(query)
-            stats = []
-            async for record in result:
-                stats.append({
-                    "bit": record["bit"],
-                    "name": record["name"],
-                    "layer": record["layer"],
-                    "entity_count": record["entity_count"]
-                })
-            return {"trait_statistics": stats}
+        """Get statistics about trait usage (cached for TRAIT_STATS_TTL_SECONDS)"""
+        if self._stats_cache and time.monotonic() - self._stats_cache[0] < TRAIT_STATS_TTL_SECONDS:
+            return self._stats_cache[1]
+
+        async with self._stats_lock:
+            # Another caller may have loaded it while we waited
+            if self._stats_cache and time.monotonic() - self._stats_cache[0] < TRAIT_STATS_TTL_SECONDS:
+                return self._stats_cache[1]
+            return await self._load_trait_statistics()
+
+    async def _load_trait_statistics(self) -> Dict[str, Any]:
+        """Query trait statistics and refresh the cache"""
+        records, _, _ = await self.driver.execute_query(
+            _Q_TRAIT_STATISTICS, database_=self.database, routing_=RoutingControl.READ
+        )
+        if any(record["entity_count"] is None for record in records):
+            await self.recount_trait_entity_counts()
+            records, _, _ = await self.driver.execute_query(
+                _Q_TRAIT_STATISTICS, database_=self.database, routing_=RoutingControl.READ
+            )
+        stats = [
+            {
+                "bit": record["bit"],
+                "name": record["name"],
+                "layer": record["layer"],
+                "entity_count": record["entity_count"]
+            }
+            for record in records
+        ]
+        result = {"trait_statistics": stats}
+        self._stats_cache = (time.monotonic(), result)
+        return result
     
+    async def recount_trait_entity_counts(self):
+        """Recompute every Trait's denormalized entity_count from its HAS_TRAIT edges"""
+        await self.driver.execute_query(_Q_RECOUNT_TRAIT_ENTITIES, database_=self.database)
+        self._stats_cache = None
+        self._analytics_cache.clear()
+
     async def execute_query(self, query: str, **params) -> List[Dict[str, Any]]:
         """Execute a custom query and return results"""
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, **params)
-            records = []
-            async for record in result:
-                # Convert record to dictionary
-                record_dict = dict(record)
-                records.append(record_dict)
-            return records
+            return await result.data()
+
+    async def execute_read_query(self, query: str, **params) -> List[Dict[str, Any]]:
+        """Execute a read-only custom query (routed to a reader in a cluster) and return results"""
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+            result = await session.run(query, **params)
+            return await result.data()
+
+    async def execute_read_single(self, query: str, **params) -> Optional[Dict[str, Any]]:
+        """Execute a read-only custom query expected to yield at most one row and return it (or None)"""
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+            result = await session.run(query, **params)
+            # single() reads the first row and discards any others
+            record = await result.single()
+            return record.data() if record else None
 
     # ===== TRAIT ANALYTICS METHODS =====
 
-    async def get_trait_frequency_detailed(self) -> Dict[str, Any]:
-        """Get detailed trait frequency with confidence breakdown"""
+    async def _get_cached_analytics(self, name: str, load) -> Dict[str, Any]:
+        """Return load(session)'s result, reusing it for ANALYTICS_CACHE_TTL_SECONDS"""
+        cached = self._analytics_cache.get(name)
+        if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        async with self._analytics_locks.setdefault(name, asyncio.Lock()):
+            # Another caller may have loaded it while we waited
+            cached = self._analytics_cache.get(name)
+            if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL_SECONDS:
+                return cached[1]
+            async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+                result = await load(session)
+            self._analytics_cache[name] = (time.monotonic(), result)
+            return result
+
+    async def get_trait_frequency_detailed(self, session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """Get detailed trait frequency with confidence breakdown (cached for ANALYTICS_CACHE_TTL_SECONDS)"""
+        if session is None:
+            return await self._get_cached_analytics("trait_frequency", self.get_trait_frequency_detailed)
+
+        # Applicable counts per bit come from the trait codes; only the
+        # confidence breakdown still needs the HAS_TRAIT edges
         query = """
-        MATCH (total:Entity)
-        WITH count(total) as total_entities
         MATCH (t:Trait)
-        OPTIONAL MATCH (e:Entity)-[r:HAS_TRAIT]->(t)
-        WHERE r.applicable = true
-        WITH t, total_entities,
-             count(e) as entity_count,
+        OPTIONAL MATCH (:Entity)-[r:HAS_TRAIT {applicable: true}]->(t)
+        WITH t,
              avg(r.confidence) as avg_confidence,
              sum(CASE WHEN r.confidence >= 0.8 THEN 1 ELSE 0 END) as high_confidence,
              sum(CASE WHEN r.confidence >= 0.5 AND r.confidence < 0.8 THEN 1 ELSE 0 END) as medium_confidence,
@@ -327,9 +1224,6 @@ class Neo4jClient:
         RETURN t.bit as bit,
                t.name as name,
                t.layer as layer,
-               entity_count,
-               total_entities,
-               round(100.0 * entity_count / total_entities, 2) as percentage,
                round(avg_confidence, 3) as avg_confidence,
                high_confidence,
                medium_confidence,
@@ -337,265 +1231,238 @@ class Neo4jClient:
         ORDER BY t.bit
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query)
-            traits = []
-            total_entities = 0
-            async for record in result:
-                total_entities = record["total_entities"]
-                traits.append({
-                    "bit": record["bit"],
-                    "name": record["name"],
-                    "layer": record["layer"],
-                    "count": record["entity_count"],
-                    "percentage": record["percentage"],
-                    "avg_confidence": record["avg_confidence"],
-                    "high_confidence_count": record["high_confidence"],
-                    "medium_confidence_count": record["medium_confidence"],
-                    "low_confidence_count": record["low_confidence"]
-                })
-            return {"total_entities": total_entities, "traits": traits}
+        uht_ints = await self._get_trait_codes()
+        counts, _ = await self._get_trait_cooccurrence()
+        total_entities = int(uht_ints.size)
+
+        result = await session.run(query)
+        traits = []
+        for row in await result.data():
+            count = int(counts[row["bit"] - 1])
+            traits.append({
+                "bit": row["bit"],
+                "name": row["name"],
+                "layer": row["layer"],
+                "count": count,
+                "percentage": round(100.0 * count / total_entities, 2) if total_entities else 0.0,
+                "avg_confidence": row["avg_confidence"],
+                "high_confidence_count": row["high_confidence"],
+                "medium_confidence_count": row["medium_confidence"],
+                "low_confidence_count": row["low_confidence"]
+            })
+        return {"total_entities": total_entities, "traits": traits}
+
+    async def _get_trait_pair_inputs(self):
+        """
+        Get (traits by bit, counts, cooc) for the pairwise trait analytics.
+
+        Both sources are cached, so a warm call costs no round trip; on a cold
+        cache the trait statistics and trait codes load concurrently.
+        """
+        stats, (counts, cooc) = await asyncio.gather(
+            self.get_trait_statistics(), self._get_trait_cooccurrence()
+        )
+        return {t["bit"]: t for t in stats["trait_statistics"]}, counts, cooc
+
+    async def _get_cooccurring_pairs(self):
+        """
+        Get (traits by bit, i, j, both) for trait pairs that co-occur at least
+        once, most frequent first. i and j are 0-based bit indices.
+        """
+        traits, _, cooc = await self._get_trait_pair_inputs()
+        present = np.zeros(32, dtype=bool)
+        present[[bit - 1 for bit in traits]] = True
+
+        i, j = np.triu_indices(32, k=1)
+        both = cooc[i, j]
+        keep = np.flatnonzero((both > 0) & present[i] & present[j])
+        # At most 496 pairs, so a full stable sort is cheap; ties keep bit order
+        keep = keep[np.argsort(-both[keep], kind="stable")]
+        return traits, i[keep], j[keep], both[keep]
+
+    @staticmethod
+    def _cooccurrence_rows(traits, i, j, both):
+        for t1, t2, count in zip((i + 1).tolist(), (j + 1).tolist(), both.tolist()):
+            yield {
+                "trait1": t1,
+                "name1": traits[t1]["name"],
+                "layer1": traits[t1]["layer"],
+                "trait2": t2,
+                "name2": traits[t2]["name"],
+                "layer2": traits[t2]["layer"],
+                "cooccurrence": count
+            }
 
-    async def get_trait_cooccurrence_matrix(self) -> Dict[str, Any]:
-        """Get pairwise co-occurrence counts for all trait pairs"""
-        query = """
-        MATCH (e:Entity)-[:HAS_TRAIT {applicable: true}]->(t1:Trait)
-        MATCH (e)-[:HAS_TRAIT {applicable: true}]->(t2:Trait)
-        WHERE t1.bit < t2.bit
-        WITH t1.bit as trait1, t1.name as name1, t1.layer as layer1,
-             t2.bit as trait2, t2.name as name2, t2.layer as layer2,
-             count(e) as cooccurrence
-        RETURN trait1, name1, layer1, trait2, name2, layer2, cooccurrence
-        ORDER BY cooccurrence DESC
+    async def get_trait_cooccurrence_matrix(self, full: bool = True) -> Dict[str, Any]:
         """
+        Get pairwise co-occurrence counts for all trait pairs.
 
-        async with self.driver.session() as session:
-            result = await session.run(query)
+        With full=False only the 20 strongest pairs and the pair total are
+        returned; the matrix list is left empty.
+        """
+        traits, i, j, both = await self._get_cooccurring_pairs()
+        if full:
+            matrix = list(self._cooccurrence_rows(traits, i, j, both))
+            strongest = matrix[:20]
+        else:
             matrix = []
-            async for record in result:
-                matrix.append({
-                    "trait1": record["trait1"],
-                    "name1": record["name1"],
-                    "layer1": record["layer1"],
-                    "trait2": record["trait2"],
-                    "name2": record["name2"],
-                    "layer2": record["layer2"],
-                    "cooccurrence": record["cooccurrence"]
-                })
-
-            # Identify strongest pairs (top 20)
-            strongest = matrix[:20] if len(matrix) > 20 else matrix
+            strongest = list(self._cooccurrence_rows(traits, i[:20], j[:20], both[:20]))
 
-            return {
-                "matrix": matrix,
-                "strongest_pairs": strongest,
-                "total_pairs": len(matrix)
-            }
+        return {
+            "matrix": matrix,
+            "strongest_pairs": strongest,
+            "total_pairs": int(both.size)
+        }
 
     async def get_trait_mutual_exclusivity(self) -> Dict[str, Any]:
         """Find trait pairs that rarely co-occur (potential mutual exclusivity)"""
-        # First get individual trait counts
-        query = """
-        MATCH (t:Trait)
-        OPTIONAL MATCH (e:Entity)-[:HAS_TRAIT {applicable: true}]->(t)
-        WITH t.bit as bit, t.name as name, t.layer as layer, count(e) as count
-        RETURN bit, name, layer, count
-        ORDER BY bit
-        """
-
-        trait_counts = {}
-        async with self.driver.session() as session:
-            result = await session.run(query)
-            async for record in result:
-                trait_counts[record["bit"]] = {
-                    "name": record["name"],
-                    "layer": record["layer"],
-                    "count": record["count"]
-                }
-
-        # Get co-occurrence for all pairs
-        cooccurrence_query = """
-        MATCH (e:Entity)-[:HAS_TRAIT {applicable: true}]->(t1:Trait)
-        MATCH (e)-[:HAS_TRAIT {applicable: true}]->(t2:Trait)
-        WHERE t1.bit < t2.bit
-        RETURN t1.bit as trait1, t2.bit as trait2, count(e) as both_count
-        """
-
-        cooccurrences = {}
-        async with self.driver.session() as session:
-            result = await session.run(cooccurrence_query)
-            async for record in result:
-                key = (record["trait1"], record["trait2"])
-                cooccurrences[key] = record["both_count"]
-
-        # Calculate Jaccard index for each pair and find low ones
-        exclusivity_pairs = []
-        for t1 in range(1, 33):
-            for t2 in range(t1 + 1, 33):
-                if t1 not in trait_counts or t2 not in trait_counts:
-                    continue
-
-                count1 = trait_counts[t1]["count"]
-                count2 = trait_counts[t2]["count"]
-                both = cooccurrences.get((t1, t2), 0)
-
-                # Skip if either trait has 0 occurrences
-                if count1 == 0 or count2 == 0:
-                    continue
-
-                # Jaccard index: intersection / union
-                union = count1 + count2 - both
-                jaccard = both / union if union > 0 else 0
-
-                # Expected co-occurrence if independent
-                # P(A and B) = P(A) * P(B) if independent
-                # But we only have counts, not total - use min as proxy
-                min_possible = min(count1, count2)
-                exclusivity_ratio = 1 - (both / min_possible) if min_possible > 0 else 0
-
-                exclusivity_pairs.append({
-                    "trait1": t1,
-                    "name1": trait_counts[t1]["name"],
-                    "layer1": trait_counts[t1]["layer"],
-                    "trait2": t2,
-                    "name2": trait_counts[t2]["name"],
-                    "layer2": trait_counts[t2]["layer"],
-                    "count1": count1,
-                    "count2": count2,
-                    "both_count": both,
-                    "jaccard": round(jaccard, 4),
-                    "exclusivity_ratio": round(exclusivity_ratio, 4)
-                })
+        # Trait names from the cached statistics, counts from the co-occurrence diagonal.
+        # Kept client-side: the inputs are already in memory, whereas the same
+        # Jaccard in Cypher would expand HAS_TRAIT edges for all 496 pairs
+        traits, counts, cooc = await self._get_trait_pair_inputs()
+        # The pair list only changes when the snapshot or the trait rows do
+        cached = self._exclusivity_cache
+        if cached and cached[0] is cooc and cached[1] == traits:
+            return cached[2]
+
+        present = np.zeros(32, dtype=bool)
+        present[[bit - 1 for bit in traits]] = True
+
+        # Every pair t1 < t2 at once, in the same order as a nested loop over bits;
+        # skip pairs with a missing trait or one that has 0 occurrences
+        i, j = np.triu_indices(32, k=1)
+        keep = present[i] & present[j] & (counts[i] > 0) & (counts[j] > 0)
+        i, j = i[keep], j[keep]
+        count1, count2, both = counts[i], counts[j], cooc[i, j]
+
+        # Jaccard index: intersection / union (union > 0 since both counts are)
+        jaccard = np.round(both / (count1 + count2 - both), 4)
+        # Expected co-occurrence if independent
+        # P(A and B) = P(A) * P(B) if independent
+        # But we only have counts, not total - use min as proxy
+        exclusivity_ratio = np.round(1 - both / np.minimum(count1, count2), 4)
 
         # Sort by jaccard (lowest = most exclusive)
-        exclusivity_pairs.sort(key=lambda x: x["jaccard"])
+        order = np.argsort(jaccard, kind="stable")
+        exclusivity_pairs = [
+            {
+                "trait1": t1 + 1,
+                "name1": traits[t1 + 1]["name"],
+                "layer1": traits[t1 + 1]["layer"],
+                "trait2": t2 + 1,
+                "name2": traits[t2 + 1]["name"],
+                "layer2": traits[t2 + 1]["layer"],
+                "count1": c1,
+                "count2": c2,
+                "both_count": b,
+                "jaccard": jac,
+                "exclusivity_ratio": ratio
+            }
+            for t1, t2, c1, c2, b, jac, ratio in zip(
+                i[order].tolist(), j[order].tolist(),
+                count1[order].tolist(), count2[order].tolist(), both[order].tolist(),
+                jaccard[order].tolist(), exclusivity_ratio[order].tolist()
+            )
+        ]
 
-        return {
+        result = {
             "pairs": exclusivity_pairs,
             "most_exclusive": exclusivity_pairs[:30],
             "least_exclusive": exclusivity_pairs[-30:] if len(exclusivity_pairs) >= 30 else []
         }
+        self._exclusivity_cache = (cooc, traits, result)
+        return result
 
     async def get_layer_statistics(self) -> Dict[str, Any]:
         """Get aggregate statistics by layer"""
-        query = """
-        MATCH (t:Trait)
-        OPTIONAL MATCH (e:Entity)-[r:HAS_TRAIT {applicable: true}]->(t)
-        WITH t.layer as layer, t.bit as bit, count(e) as trait_usage
-        WITH layer, collect({bit: bit, usage: trait_usage}) as traits, sum(trait_usage) as total_usage
-        RETURN layer,
-               size(traits) as trait_count,
-               total_usage,
-               traits
-        ORDER BY layer
-        """
-
-        async with self.driver.session() as session:
-            result = await session.run(query)
-            layers = {}
-            async for record in result:
-                layer_name = record["layer"]
-                traits = record["traits"]
-                usages = [t["usage"] for t in traits]
-
-                layers[layer_name] = {
-                    "trait_count": record["trait_count"],
-                    "total_usage": record["total_usage"],
-                    "avg_usage_per_trait": round(record["total_usage"] / record["trait_count"], 2) if record["trait_count"] > 0 else 0,
-                    "max_trait_usage": max(usages) if usages else 0,
-                    "min_trait_usage": min(usages) if usages else 0,
-                    "traits": traits
-                }
-
-        # Get average traits per entity by layer
-        entity_layer_query = """
-        MATCH (e:Entity)
-        WHERE e.uht_code IS NOT NULL AND size(e.uht_code) = 8
-        WITH e,
-             toInteger('0x' + substring(e.uht_code, 0, 2)) as physical_hex,
-             toInteger('0x' + substring(e.uht_code, 2, 2)) as functional_hex,
-             toInteger('0x' + substring(e.uht_code, 4, 2)) as abstract_hex,
-             toInteger('0x' + substring(e.uht_code, 6, 2)) as social_hex
-        RETURN count(e) as entity_count,
-               avg(size([x IN range(0,7) WHERE (physical_hex / toInteger(2^x)) % 2 = 1])) as avg_physical,
-               avg(size([x IN range(0,7) WHERE (functional_hex / toInteger(2^x)) % 2 = 1])) as avg_functional,
-               avg(size([x IN range(0,7) WHERE (abstract_hex / toInteger(2^x)) % 2 = 1])) as avg_abstract,
-               avg(size([x IN range(0,7) WHERE (social_hex / toInteger(2^x)) % 2 = 1])) as avg_social
-        """
-
-        # This query is complex; let's simplify by counting from binary
-        simple_query = """
-        MATCH (e:Entity)
-        WHERE e.binary_representation IS NOT NULL
-        WITH e,
-             size([i IN range(0, 7) WHERE substring(e.binary_representation, i, 1) = '1']) as physical_count,
-             size([i IN range(8, 15) WHERE substring(e.binary_representation, i, 1) = '1']) as functional_count,
-             size([i IN range(16, 23) WHERE substring(e.binary_representation, i, 1) = '1']) as abstract_count,
-             size([i IN range(24, 31) WHERE substring(e.binary_representation, i, 1) = '1']) as social_count
-        RETURN count(e) as entity_count,
-               round(avg(physical_count), 2) as avg_physical,
-               round(avg(functional_count), 2) as avg_functional,
-               round(avg(abstract_count), 2) as avg_abstract,
-               round(avg(social_count), 2) as avg_social
-        """
-
-        async with self.driver.session() as session:
-            result = await session.run(simple_query)
-            record = await result.single()
-            if record:
-                layers["Physical"]["avg_traits_per_entity"] = record["avg_physical"]
-                layers["Functional"]["avg_traits_per_entity"] = record["avg_functional"]
-                layers["Abstract"]["avg_traits_per_entity"] = record["avg_abstract"]
-                layers["Social"]["avg_traits_per_entity"] = record["avg_social"]
+        # Trait usage is the applicable count per bit from the trait codes
+        # (the uht_int snapshot once backfilled), so no edges are re-scanned
+        traits_by_bit, counts, _ = await self._get_trait_pair_inputs()
+        traits_by_layer: Dict[str, List[Dict[str, int]]] = {}
+        for bit in sorted(traits_by_bit):
+            traits_by_layer.setdefault(traits_by_bit[bit]["layer"], []).append(
+                {"bit": bit, "usage": int(counts[bit - 1])}
+            )
 
-        return {"layers": layers, "entity_count": record["entity_count"] if record else 0}
+        layers = {}
+        for layer in sorted(traits_by_layer):
+            traits = traits_by_layer[layer]
+            usages = [t["usage"] for t in traits]
+            total_usage = sum(usages)
+
+            layers[layer] = {
+                "trait_count": len(traits),
+                "total_usage": total_usage,
+                "avg_usage_per_trait": round(total_usage / len(traits), 2),
+                "max_trait_usage": max(usages),
+                "min_trait_usage": min(usages),
+                "traits": traits
+            }
 
-    async def get_confidence_statistics(self) -> Dict[str, Any]:
-        """Get per-trait confidence metrics"""
+        # Average traits per entity by layer: popcount of each byte of the
+        # trait codes (Physical is the most significant byte)
+        uht_ints = await self._get_trait_codes()
+        for layer_name, shift in (("Physical", 24), ("Functional", 16), ("Abstract", 8), ("Social", 0)):
+            # Only layers with Trait rows are reported (the table may be
+            # empty or partially imported)
+            if layer_name not in layers:
+                continue
+            counts = POPCOUNT_LUT[(uht_ints >> shift) & 0xFF]
+            layers[layer_name]["avg_traits_per_entity"] = round(float(counts.mean()), 2) if counts.size else None
+
+        return {"layers": layers, "entity_count": int(uht_ints.size)}
+
+    async def get_confidence_statistics(self, session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """Get per-trait confidence metrics (cached for ANALYTICS_CACHE_TTL_SECONDS)"""
+        if session is None:
+            return await self._get_cached_analytics("confidence", self.get_confidence_statistics)
+
+        # Native aggregates stream over the edges instead of collecting every
+        # confidence per trait; like collect(), they skip null confidences
         query = """
         MATCH (e:Entity)-[r:HAS_TRAIT]->(t:Trait)
         WHERE r.applicable = true
-        WITH t.bit as bit, t.name as name, t.layer as layer,
-             collect(r.confidence) as confidences
-        RETURN bit, name, layer,
-               size(confidences) as entity_count,
-               round(reduce(s = 0.0, c IN confidences | s + c) / size(confidences), 4) as avg_confidence,
-               reduce(mn = 1.0, c IN confidences | CASE WHEN c < mn THEN c ELSE mn END) as min_confidence,
-               reduce(mx = 0.0, c IN confidences | CASE WHEN c > mx THEN c ELSE mx END) as max_confidence
+        WITH t,
+             count(r.confidence) as entity_count,
+             avg(r.confidence) as avg_confidence,
+             min(r.confidence) as min_confidence,
+             max(r.confidence) as max_confidence
+        WHERE entity_count > 0
+        RETURN t.bit as bit, t.name as name, t.layer as layer,
+               entity_count,
+               round(avg_confidence, 4) as avg_confidence,
+               min_confidence,
+               max_confidence
         ORDER BY bit
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query)
-            traits = []
-            async for record in result:
-                traits.append({
-                    "bit": record["bit"],
-                    "name": record["name"],
-                    "layer": record["layer"],
-                    "entity_count": record["entity_count"],
-                    "avg_confidence": record["avg_confidence"],
-                    "min_confidence": record["min_confidence"],
-                    "max_confidence": record["max_confidence"],
-                    "confidence_range": round(record["max_confidence"] - record["min_confidence"], 4)
-                })
+        result = await session.run(query)
+        # Columns are already named as returned; only the range is derived
+        traits = await result.data()
+        for trait in traits:
+            trait["confidence_range"] = round(trait["max_confidence"] - trait["min_confidence"], 4)
 
-            # Sort by avg confidence to find problematic traits
-            sorted_by_confidence = sorted(traits, key=lambda x: x["avg_confidence"])
+        # Sort by avg confidence to find problematic traits
+        sorted_by_confidence = sorted(traits, key=lambda x: x["avg_confidence"])
 
-            return {
-                "traits": traits,
-                "lowest_confidence": sorted_by_confidence[:10],
-                "highest_confidence": sorted_by_confidence[-10:]
-            }
+        return {
+            "traits": traits,
+            "lowest_confidence": sorted_by_confidence[:10],
+            "highest_confidence": sorted_by_confidence[-10:]
+        }
 
     async def get_full_analytics(self) -> Dict[str, Any]:
         """Get all analytics combined"""
-        frequency = await self.get_trait_frequency_detailed()
-        cooccurrence = await self.get_trait_cooccurrence_matrix()
-        exclusivity = await self.get_trait_mutual_exclusivity()
-        layers = await self.get_layer_statistics()
-        confidence = await self.get_confidence_statistics()
+        # Independent reads: each Cypher aggregation runs in its own pooled
+        # session so the server executes them in parallel; co-occurrence,
+        # exclusivity and layer statistics share the in-process trait codes
+        frequency, cooccurrence, exclusivity, layers, confidence = await asyncio.gather(
+            self.get_trait_frequency_detailed(),
+            self.get_trait_cooccurrence_matrix(),
+            self.get_trait_mutual_exclusivity(),
+            self.get_layer_statistics(),
+            self.get_confidence_statistics()
+        )
 
         return {
             "frequency": frequency,
@@ -607,68 +1474,45 @@ class Neo4jClient:
 
     async def get_hex_pair_frequency(self) -> Dict[str, Any]:
         """Get frequency of hex pairs per layer (byte position in UHT code)"""
-        async with self.driver.session() as session:
-            # UHT code format: PPFFAASS (8 hex chars = 4 bytes)
-            # Physical: chars 0-1, Functional: 2-3, Abstract: 4-5, Social: 6-7
-            query = """
-            MATCH (e:Entity)
-            WHERE e.uht_code IS NOT NULL AND size(e.uht_code) = 8
-            WITH e,
-                 toUpper(substring(e.uht_code, 0, 2)) as physical_hex,
-                 toUpper(substring(e.uht_code, 2, 2)) as functional_hex,
-                 toUpper(substring(e.uht_code, 4, 2)) as abstract_hex,
-                 toUpper(substring(e.uht_code, 6, 2)) as social_hex
-            RETURN
-                physical_hex, count(*) as physical_count,
-                functional_hex, count(*) as functional_count,
-                abstract_hex, count(*) as abstract_count,
-                social_hex, count(*) as social_count
-            """
-
-            # Run separate queries for each layer for cleaner results
-            layers_data = {}
-
-            for layer, start_pos in [("Physical", 0), ("Functional", 2), ("Abstract", 4), ("Social", 6)]:
-                layer_query = f"""
-                MATCH (e:Entity)
-                WHERE e.uht_code IS NOT NULL AND size(e.uht_code) = 8
-                WITH toUpper(substring(e.uht_code, {start_pos}, 2)) as hex_pair
-                RETURN hex_pair, count(*) as count
-                ORDER BY count DESC
-                """
-                result = await session.run(layer_query)
-                records = await result.data()
-
-                # Calculate totals and percentages
-                total = sum(r["count"] for r in records)
-                hex_pairs = []
-                for r in records:
-                    hex_pairs.append({
-                        "hex": r["hex_pair"],
-                        "count": r["count"],
-                        "percentage": round(r["count"] / total * 100, 2) if total > 0 else 0
-                    })
-
-                layers_data[layer] = {
-                    "total_entities": total,
-                    "unique_pairs": len(hex_pairs),
-                    "pairs": hex_pairs[:20],  # Top 20 most common
-                    "all_pairs": hex_pairs  # Full list for detailed analysis
-                }
-
-            # Get total entity count
-            count_result = await session.run("MATCH (e:Entity) RETURN count(e) as total")
-            count_record = await count_result.single()
-            total_entities = count_record["total"] if count_record else 0
+        records, _, _ = await self.driver.execute_query(
+            _Q_HEX_PAIR_FREQUENCY,
+            layers=[{"layer": layer, "start": start} for layer, start in _HEX_PAIR_LAYER_OFFSETS],
+            database_=self.database,
+            routing_=RoutingControl.READ
+        )
+
+        # Rows arrive most frequent first across all layers; split them per layer
+        rows_by_layer = {layer: [] for layer, _ in _HEX_PAIR_LAYER_OFFSETS}
+        for r in records:
+            rows_by_layer[r["layer"]].append(r)
+
+        layers_data = {}
+        for layer, rows in rows_by_layer.items():
+            # Calculate totals and percentages
+            total = sum(r["count"] for r in rows)
+            hex_pairs = []
+            for r in rows:
+                hex_pairs.append({
+                    "hex": r["hex_pair"],
+                    "count": r["count"],
+                    "percentage": round(r["count"] / total * 100, 2) if total > 0 else 0
+                })
 
-            return {
-                "total_entities": total_entities,
-                "layers": layers_data
+            layers_data[layer] = {
+                "total_entities": total,
+                "unique_pairs": len(hex_pairs),
+                "pairs": hex_pairs[:20],  # Top 20 most common
+                "all_pairs": hex_pairs  # Full list for detailed analysis
             }
 
+        return {
+            "total_entities": records[0]["total_entities"] if records else 0,
+            "layers": layers_data
+        }
+
     async def get_cross_domain_frequency(self, min_percent: float = 1.0) -> Dict[str, Any]:
         """Get frequency of complete UHT codes (all 8 hex chars) - cross-domain patterns"""
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             query = """
             MATCH (e:Entity)
             WHERE e.uht_code IS NOT NULL AND size(e.uht_code) = 8
@@ -724,27 +1568,27 @@ class Neo4jClient:
         Returns:
             Updated entity data
         """
-        query = """
-        MATCH (e:Entity {uuid: $uuid})
-        SET e.embedding = $embedding,
-            e.embedding_model = $model_used,
-            e.embedding_created_at = datetime()
-        RETURN e.uuid as uuid,
-               e.name as name,
-               e.embedding_model as embedding_model,
-               e.embedding_created_at as embedding_created_at
-        """
+        # Stored unit-length (e.embedding_normalized), so readers can rank by np.dot
+        vec = normalize_embedding(embedding)
+        embedding = vec.tolist()
+        embedding_q, embedding_scale = quantize_embedding(vec)
+
+        # A new or changed vector can alter any cached search result
+        self._similar_embedding_cache.clear()
+        self._embedding_counts_cache = None
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(
-                query,
+                _Q_STORE_ENTITY_EMBEDDING,
                 uuid=uuid,
                 embedding=embedding,
+                embedding_q=embedding_q,
+                embedding_scale=embedding_scale,
                 model_used=model_used
             )
             record = await result.single()
             if record:
-                return dict(record)
+                return record.data()
             return None
 
     async def get_entity_embedding(self, uuid: str) -> Optional[Dict[str, Any]]:
@@ -755,31 +1599,26 @@ class Neo4jClient:
             uuid: Entity UUID
 
         Returns:
-            Dict with embedding vector and metadata, or None if not found
-        """
-        query = """
-        MATCH (e:Entity {uuid: $uuid})
-        WHERE e.embedding IS NOT NULL
-        RETURN e.uuid as uuid,
-               e.name as name,
-               e.embedding as embedding,
-               e.embedding_model as model_used,
-               e.embedding_created_at as created_at
-        """
-
-        async with self.driver.session() as session:
-            result = await session.run(query, uuid=uuid)
-            record = await result.single()
-            if record:
-                return {
-                    "entity_uuid": record["uuid"],
-                    "name": record["name"],
-                    "embedding": list(record["embedding"]) if record["embedding"] else None,
-                    "dimension": len(record["embedding"]) if record["embedding"] else 0,
-                    "model_used": record["model_used"],
-                    "created_at": str(record["created_at"]) if record["created_at"] else None
-                }
-            return None
+            Dict with the embedding as a float32 array plus metadata, or None
+            if not found. Vectors stored with embedding_normalized are unit
+            length, so np.dot of two of them is their cosine similarity
+        """
+        records, _, _ = await self.driver.execute_query(
+            _Q_ENTITY_EMBEDDING, uuid=uuid, database_=self.database, routing_=RoutingControl.READ
+        )
+        if records:
+            record = records[0]
+            # One packed 6 KB array instead of 1536 boxed Python floats
+            embedding = np.asarray(record["embedding"], dtype=np.float32)
+            return {
+                "entity_uuid": record["uuid"],
+                "name": record["name"],
+                "embedding": embedding,
+                "dimension": embedding.size,
+                "model_used": record["model_used"],
+                "created_at": record["created_at"].iso_format() if record["created_at"] else None
+            }
+        return None
 
     async def find_similar_by_embedding(
         self,
@@ -798,83 +1637,201 @@ class Neo4jClient:
         Returns:
             List of similar entities with similarity scores
         """
-        query = """
-        CALL db.index.vector.queryNodes('entity_embedding', $limit, $embedding)
-        YIELD node, score
-        WHERE score >= $min_score
-        RETURN node.uuid as uuid,
-               node.name as name,
-               node.description as description,
-               node.uht_code as uht_code,
-               node.image_url as image_url,
-               score as similarity_score
-        ORDER BY score DESC
-        """
+        # Malformed vectors are rejected here rather than by the index after a round trip
+        try:
+            vector = np.asarray(embedding, dtype=np.float32)
+        except (TypeError, ValueError):
+            logger.error("Query embedding is not a numeric vector")
+            return []
+        if vector.shape != (EMBEDDING_DIMENSIONS,):
+            logger.error(
+                "Query embedding has shape %s, index expects (%d,)",
+                vector.shape, EMBEDDING_DIMENSIONS
+            )
+            return []
+        if not np.isfinite(vector).all():
+            logger.error("Query embedding contains NaN or infinite values")
+            return []
+
+        key = hashlib.blake2b(vector.tobytes() + struct.pack("<if", limit, min_score)).digest()
+        cached = self._similar_embedding_cache.get(key)
+        if cached and time.monotonic() - cached[0] < SIMILAR_EMBEDDING_CACHE_TTL_SECONDS:
+            self._similar_embedding_cache.move_to_end(key)
+            return [dict(entity) for entity in cached[1]]
 
         try:
-            async with self.driver.session() as session:
-                result = await session.run(
-                    query,
-                    embedding=embedding,
-                    limit=limit,
-                    min_score=min_score
-                )
-                entities = []
-                async for record in result:
-                    entities.append({
-                        "uuid": record["uuid"],
-                        "name": record["name"],
-                        "description": record["description"],
-                        "uht_code": record["uht_code"],
-                        "image_url": record["image_url"],
-                        "similarity_score": round(record["similarity_score"], 4)
-                    })
-                return entities
+            entities = await self._queue_similar_by_embedding(vector.tolist(), limit, min_score)
         except Exception as e:
-            logger.error(f"Vector similarity search failed: {e}")
+            logger.error("Vector similarity search failed: %s", e)
             return []
 
+        self._similar_embedding_cache[key] = (time.monotonic(), entities)
+        self._similar_embedding_cache.move_to_end(key)
+        if len(self._similar_embedding_cache) > SIMILAR_EMBEDDING_CACHE_SIZE:
+            self._similar_embedding_cache.popitem(last=False)
+        return [dict(entity) for entity in entities]
+
+    async def _queue_similar_by_embedding(
+        self,
+        embedding: List[float],
+        limit: int,
+        min_score: float
+    ) -> List[Dict[str, Any]]:
+        """Add one vector-index search to the pending batch and wait for its rows"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._similar_embedding_batch.append(
+            ({"embedding": embedding, "limit": limit, "min_score": min_score}, future)
+        )
+        # With no search in flight there is nothing to coalesce with, so go
+        # straight out rather than paying the window on an idle client
+        if (len(self._similar_embedding_batch) >= SIMILAR_EMBEDDING_BATCH_SIZE
+                or not self._similar_embedding_tasks):
+            self._flush_similar_embedding_batch()
+        elif self._similar_embedding_flush is None:
+            self._similar_embedding_flush = loop.call_later(
+                SIMILAR_EMBEDDING_BATCH_WINDOW_SECONDS, self._flush_similar_embedding_batch
+            )
+        return await future
+
+    def _flush_similar_embedding_batch(self):
+        """Send every queued vector-index search as one query"""
+        if self._similar_embedding_flush is not None:
+            self._similar_embedding_flush.cancel()
+            self._similar_embedding_flush = None
+        batch, self._similar_embedding_batch = self._similar_embedding_batch, []
+        if not batch:
+            return
+        # Hold a reference so the flush isn't garbage collected mid-query
+        task = asyncio.get_running_loop().create_task(self._run_similar_embedding_batch(batch))
+        self._similar_embedding_tasks.add(task)
+        task.add_done_callback(self._similar_embedding_tasks.discard)
+
+    async def _run_similar_embedding_batch(self, batch: List[tuple]):
+        """Run a coalesced vector-index search and hand each caller its own rows"""
+        queries = [{"idx": idx, **params} for idx, (params, _) in enumerate(batch)]
+        results: List[List[Dict[str, Any]]] = [[] for _ in batch]
+        try:
+            records, _, _ = await self.driver.execute_query(
+                _Q_SIMILAR_BY_EMBEDDING,
+                queries=queries,
+                database_=self.database,
+                routing_=RoutingControl.READ,
+                bookmark_manager_=None
+            )
+            # Scores for the whole batch are rounded in one vectorized pass
+            scores = np.round(np.fromiter(
+                (record["similarity_score"] for record in records), dtype=np.float64, count=len(records)
+            ), 4).tolist()
+            for record, score in zip(records, scores):
+                entity = record.data()
+                entity["similarity_score"] = score
+                results[entity.pop("idx")].append(entity)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), entities in zip(batch, results):
+            # A caller that was cancelled while waiting has already resolved its future
+            if not future.done():
+                future.set_result(entities)
+
+    async def find_similar_to_entity(
+        self,
+        uuid: str,
+        limit: int = 20,
+        min_score: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """
+        Find entities similar to a stored entity's embedding in one query.
+
+        Args:
+            uuid: Entity whose embedding seeds the search (excluded from results)
+            limit: Maximum number of results
+            min_score: Minimum similarity score (0-1, cosine similarity)
+
+        Returns:
+            List of similar entities with similarity scores; empty if the
+            entity doesn't exist or has no embedding
+        """
+        records, _, _ = await self.driver.execute_query(
+            _Q_SIMILAR_TO_ENTITY,
+            uuid=uuid,
+            limit=limit,
+            min_score=min_score,
+            database_=self.database,
+            routing_=RoutingControl.READ,
+            bookmark_manager_=None
+        )
+        scores = np.round(np.fromiter(
+            (record["similarity_score"] for record in records), dtype=np.float64, count=len(records)
+        ), 4).tolist()
+        entities = []
+        for record, score in zip(records, scores):
+            entity = record.data()
+            entity["similarity_score"] = score
+            entities.append(entity)
+        return entities
+
     async def get_all_embeddings(
         self,
         limit: int = 1000,
-        offset: int = 0
+        offset: int = 0,
+        after_created_at: Optional[str] = None,
+        after_uuid: Optional[str] = None,
+        precision: str = "float"
     ) -> List[Dict[str, Any]]:
         """
-        Get all entities with embeddings.
+        Get all entities with embeddings, newest first.
 
         Args:
             limit: Maximum number of results
-            offset: Offset for pagination
+            offset: Offset for pagination (only without a cursor)
+            after_created_at: created_at of the last row of the previous page
+            after_uuid: entity_uuid of the last row of the previous page
+            precision: "float" for the stored vectors, or "q8" for the INT8
+                copy plus its "scale" (see dequantize_embedding)
 
         Returns:
             List of entities with their embeddings
         """
-        query = """
-        MATCH (e:Entity)
-        WHERE e.embedding IS NOT NULL
-        RETURN e.uuid as uuid,
-               e.name as name,
-               e.embedding as embedding,
-               e.embedding_model as model_used,
-               e.embedding_created_at as created_at
-        ORDER BY e.embedding_created_at DESC
-        SKIP $offset
-        LIMIT $limit
-        """
-
-        async with self.driver.session() as session:
-            result = await session.run(query, limit=limit, offset=offset)
-            embeddings = []
-            async for record in result:
-                embeddings.append({
-                    "entity_uuid": record["uuid"],
-                    "name": record["name"],
-                    "embedding": list(record["embedding"]) if record["embedding"] else None,
-                    "dimension": len(record["embedding"]) if record["embedding"] else 0,
-                    "model_used": record["model_used"],
-                    "created_at": str(record["created_at"]) if record["created_at"] else None
-                })
-            return embeddings
+        q8 = precision == "q8"
+        if after_created_at is not None:
+            if offset:
+                raise ValueError("offset cannot be combined with an after_created_at/after_uuid cursor")
+            query, params = _Q_EMBEDDINGS_AFTER, {"after_created_at": after_created_at, "after_uuid": after_uuid}
+        else:
+            query, params = _Q_ALL_EMBEDDINGS, {"offset": offset}
+        records, _, _ = await self.driver.execute_query(
+            query,
+            params,
+            limit=limit,
+            q8=q8,
+            database_=self.database,
+            routing_=RoutingControl.READ,
+            bookmark_manager_=None
+        )
+        return [_embedding_row(row, q8) for row in records]
+
+    async def iter_all_embeddings(self, precision: str = "float") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every entity embedding, in no particular order.
+
+        For bulk exports and migrations that would otherwise page through
+        get_all_embeddings: rows arrive EMBEDDING_STREAM_FETCH_ROWS per Bolt
+        round trip and are yielded one at a time, in get_all_embeddings' shape.
+        """
+        q8 = precision == "q8"
+        async with self.driver.session(
+            database=self.database,
+            default_access_mode=READ_ACCESS,
+            fetch_size=EMBEDDING_STREAM_FETCH_ROWS
+        ) as session:
+            result = await session.run(_Q_STREAM_EMBEDDINGS, q8=q8)
+            async for row in result:
+                yield _embedding_row(row, q8)
 
     async def get_entities_without_embeddings(
         self,
@@ -891,64 +1848,40 @@ class Neo4jClient:
         Returns:
             List of entities without embeddings
         """
-        query = """
-        MATCH (e:Entity)
-        WHERE e.embedding IS NULL
-        OPTIONAL MATCH (e)-[r:HAS_TRAIT]->(t:Trait)
-        WITH e, collect({
-            trait_name: t.name,
-            applicable: r.applicable
-        }) as traits
-        RETURN e.uuid as uuid,
-               e.name as name,
-               e.description as description,
-               e.uht_code as uht_code,
-               e.binary_representation as binary_representation,
-               traits
-        LIMIT $limit
-        """
-
-        async with self.driver.session() as session:
-            result = await session.run(query, limit=limit)
-            entities = []
-            async for record in result:
-                # Build trait evaluations list
-                trait_evaluations = []
-                for trait in record["traits"]:
-                    if trait.get("trait_name"):
-                        trait_evaluations.append({
-                            "trait_name": trait["trait_name"],
-                            "applicable": trait.get("applicable", False)
-                        })
-
-                entities.append({
-                    "uuid": record["uuid"],
-                    "name": record["name"],
-                    "description": record["description"],
-                    "uht_code": record["uht_code"],
-                    "binary_representation": record["binary_representation"],
-                    "trait_evaluations": trait_evaluations
-                })
-            return entities
+        records, _, _ = await self.driver.execute_query(
+            _Q_ENTITIES_WITHOUT_EMBEDDINGS,
+            limit=limit,
+            database_=self.database,
+            routing_=RoutingControl.READ,
+            bookmark_manager_=None
+        )
+        return [record.data() for record in records]
 
     async def count_entities_with_embeddings(self) -> Dict[str, int]:
-        """Count entities with and without embeddings"""
-        query = """
-        MATCH (e:Entity)
-        RETURN
-            count(CASE WHEN e.embedding IS NOT NULL THEN 1 END) as with_embeddings,
-            count(CASE WHEN e.embedding IS NULL THEN 1 END) as without_embeddings,
-            count(e) as total
-        """
-
-        async with self.driver.session() as session:
-            result = await session.run(query)
-            record = await result.single()
-            return {
-                "with_embeddings": record["with_embeddings"],
-                "without_embeddings": record["without_embeddings"],
-                "total": record["total"]
-            }
+        """Count entities with and without embeddings (cached for EMBEDDING_COUNTS_TTL_SECONDS)"""
+        cached = self._embedding_counts_cache
+        if cached and time.monotonic() - cached[0] < EMBEDDING_COUNTS_TTL_SECONDS:
+            return dict(cached[1])
+
+        # Independent counts, sent concurrently so a cluster can serve them from
+        # different readers
+        (total_records, _, _), (embedded_records, _, _) = await asyncio.gather(
+            self.driver.execute_query(
+                _Q_COUNT_ENTITIES, database_=self.database, routing_=RoutingControl.READ, bookmark_manager_=None
+            ),
+            self.driver.execute_query(
+                _Q_COUNT_EMBEDDINGS, database_=self.database, routing_=RoutingControl.READ, bookmark_manager_=None
+            )
+        )
+        total = total_records[0]["total"]
+        with_embeddings = embedded_records[0]["with_embeddings"]
+        counts = {
+            "with_embeddings": with_embeddings,
+            "without_embeddings": total - with_embeddings,
+            "total": total
+        }
+        self._embedding_counts_cache = (time.monotonic(), counts)
+        return dict(counts)
 
     # ==================== User Management ====================
 
@@ -968,11 +1901,11 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, **user_data)
             record = await result.single()
             if record:
-                user = dict(record["u"])
+                user = dict(record["u"].items())
                 # Convert datetime objects to ISO strings
                 for key in ["created_at", "updated_at", "verification_expires", "last_login"]:
                     if key in user and user[key] is not None:
@@ -980,7 +1913,7 @@ class Neo4jClient:
                 return user
             return None
 
-    async def find_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+    async def find_user_by_email(self, email: str, session: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
         """Find user by email (case-insensitive)"""
         query = """
         MATCH (u:User)
@@ -988,34 +1921,40 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query, email=email)
-            record = await result.single()
-            if record:
-                user = dict(record["u"])
-                for key in ["created_at", "updated_at", "verification_expires", "password_reset_expires", "last_login"]:
-                    if key in user and user[key] is not None:
-                        user[key] = user[key].isoformat() if hasattr(user[key], 'isoformat') else str(user[key])
-                return user
-            return None
+        if session is None:
+            async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+                return await self.find_user_by_email(email, session)
+
+        result = await session.run(query, email=email)
+        record = await result.single()
+        if record:
+            user = dict(record["u"].items())
+            for key in ["created_at", "updated_at", "verification_expires", "password_reset_expires", "last_login"]:
+                if key in user and user[key] is not None:
+                    user[key] = user[key].isoformat() if hasattr(user[key], 'isoformat') else str(user[key])
+            return user
+        return None
 
-    async def find_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+    async def find_user_by_id(self, user_id: str, session: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
         """Find user by ID"""
         query = """
         MATCH (u:User {id: $user_id})
         RETURN u
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query, user_id=user_id)
-            record = await result.single()
-            if record:
-                user = dict(record["u"])
-                for key in ["created_at", "updated_at", "verification_expires", "password_reset_expires", "last_login"]:
-                    if key in user and user[key] is not None:
-                        user[key] = user[key].isoformat() if hasattr(user[key], 'isoformat') else str(user[key])
-                return user
-            return None
+        if session is None:
+            async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+                return await self.find_user_by_id(user_id, session)
+
+        result = await session.run(query, user_id=user_id)
+        record = await result.single()
+        if record:
+            user = dict(record["u"].items())
+            for key in ["created_at", "updated_at", "verification_expires", "password_reset_expires", "last_login"]:
+                if key in user and user[key] is not None:
+                    user[key] = user[key].isoformat() if hasattr(user[key], 'isoformat') else str(user[key])
+            return user
+        return None
 
     async def find_user_by_verification_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Find user by verification token"""
@@ -1025,11 +1964,11 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query, token=token)
             record = await result.single()
             if record:
-                user = dict(record["u"])
+                user = dict(record["u"].items())
                 for key in ["created_at", "updated_at", "verification_expires", "last_login"]:
                     if key in user and user[key] is not None:
                         user[key] = user[key].isoformat() if hasattr(user[key], 'isoformat') else str(user[key])
@@ -1047,12 +1986,12 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, user_id=user_id)
             record = await result.single()
             return record is not None
 
-    async def update_user_last_login(self, user_id: str) -> bool:
+    async def update_user_last_login(self, user_id: str, session: Optional[AsyncSession] = None) -> bool:
         """Update user's last login timestamp"""
         query = """
         MATCH (u:User {id: $user_id})
@@ -1061,10 +2000,13 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query, user_id=user_id)
-            record = await result.single()
-            return record is not None
+        if session is None:
+            async with self.driver.session(database=self.database) as session:
+                return await self.update_user_last_login(user_id, session)
+
+        result = await session.run(query, user_id=user_id)
+        record = await result.single()
+        return record is not None
 
     async def set_password_reset_token(self, user_id: str, token: str, expires: str) -> bool:
         """Set password reset token for user"""
@@ -1076,12 +2018,12 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, user_id=user_id, token=token, expires=expires)
             record = await result.single()
             return record is not None
 
-    async def find_user_by_reset_token(self, token: str) -> Optional[Dict[str, Any]]:
+    async def find_user_by_reset_token(self, token: str, session: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
         """Find user by password reset token"""
         query = """
         MATCH (u:User {password_reset_token: $token})
@@ -1089,18 +2031,21 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query, token=token)
-            record = await result.single()
-            if record:
-                user = dict(record["u"])
-                for key in ["created_at", "updated_at", "verification_expires", "password_reset_expires", "last_login"]:
-                    if key in user and user[key] is not None:
-                        user[key] = user[key].isoformat() if hasattr(user[key], 'isoformat') else str(user[key])
-                return user
-            return None
+        if session is None:
+            async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+                return await self.find_user_by_reset_token(token, session)
+
+        result = await session.run(query, token=token)
+        record = await result.single()
+        if record:
+            user = dict(record["u"].items())
+            for key in ["created_at", "updated_at", "verification_expires", "password_reset_expires", "last_login"]:
+                if key in user and user[key] is not None:
+                    user[key] = user[key].isoformat() if hasattr(user[key], 'isoformat') else str(user[key])
+            return user
+        return None
 
-    async def update_user_password(self, user_id: str, password_hash: str) -> bool:
+    async def update_user_password(self, user_id: str, password_hash: str, session: Optional[AsyncSession] = None) -> bool:
         """Update user password and clear reset token"""
         query = """
         MATCH (u:User {id: $user_id})
@@ -1111,10 +2056,13 @@ class Neo4jClient:
         RETURN u
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query, user_id=user_id, password_hash=password_hash)
-            record = await result.single()
-            return record is not None
+        if session is None:
+            async with self.driver.session(database=self.database) as session:
+                return await self.update_user_password(user_id, password_hash, session)
+
+        result = await session.run(query, user_id=user_id, password_hash=password_hash)
+        record = await result.single()
+        return record is not None
 
     # ==================== Collection Management ====================
 
@@ -1133,7 +2081,7 @@ class Neo4jClient:
         RETURN c
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(
                 query,
                 user_id=user_id,
@@ -1143,7 +2091,7 @@ class Neo4jClient:
             )
             record = await result.single()
             if record:
-                collection = dict(record["c"])
+                collection = dict(record["c"].items())
                 for key in ["created_at", "updated_at"]:
                     if key in collection and collection[key] is not None:
                         collection[key] = collection[key].isoformat() if hasattr(collection[key], 'isoformat') else str(collection[key])
@@ -1159,13 +2107,14 @@ class Neo4jClient:
         ORDER BY c.updated_at DESC
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query, user_id=user_id)
             collections = []
-            async for record in result:
-                collection = dict(record["c"])
-                collection["entity_count"] = record["entity_count"]
-                collection["entity_uuids"] = [u for u in record["entity_uuids"] if u is not None]
+            # data() already turns the Collection node into a property dict
+            for row in await result.data():
+                collection = row["c"]
+                collection["entity_count"] = row["entity_count"]
+                collection["entity_uuids"] = [u for u in row["entity_uuids"] if u is not None]
                 for key in ["created_at", "updated_at"]:
                     if key in collection and collection[key] is not None:
                         collection[key] = collection[key].isoformat() if hasattr(collection[key], 'isoformat') else str(collection[key])
@@ -1181,11 +2130,11 @@ class Neo4jClient:
         RETURN c, entities
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query, collection_id=collection_id, user_id=user_id)
             record = await result.single()
             if record:
-                collection = dict(record["c"])
+                collection = dict(record["c"].items())
                 # Filter out null entities (from OPTIONAL MATCH)
                 entities = [e for e in record["entities"] if e["uuid"] is not None]
                 for e in entities:
@@ -1217,11 +2166,11 @@ class Neo4jClient:
         RETURN c
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, **params)
             record = await result.single()
             if record:
-                collection = dict(record["c"])
+                collection = dict(record["c"].items())
                 for key in ["created_at", "updated_at"]:
                     if key in collection and collection[key] is not None:
                         collection[key] = collection[key].isoformat() if hasattr(collection[key], 'isoformat') else str(collection[key])
@@ -1236,7 +2185,7 @@ class Neo4jClient:
         RETURN count(c) as deleted
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, collection_id=collection_id, user_id=user_id)
             record = await result.single()
             return record["deleted"] > 0 if record else False
@@ -1253,7 +2202,7 @@ class Neo4jClient:
         RETURN count(r) as added
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, collection_id=collection_id, user_id=user_id, entity_uuids=entity_uuids)
             record = await result.single()
             return record["added"] if record else 0
@@ -1269,7 +2218,7 @@ class Neo4jClient:
         RETURN count(r) as removed
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, collection_id=collection_id, user_id=user_id, entity_uuids=entity_uuids)
             record = await result.single()
             return record["removed"] if record else 0
@@ -1283,31 +2232,33 @@ class Neo4jClient:
         RETURN u, k
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, user_id=user_id, key_id=key_id)
             record = await result.single()
             return record is not None
 
-    async def get_user_api_keys(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get all API keys owned by user"""
+    async def get_user_api_keys(self, user_id: str) -> Dict[str, Any]:
+        """Get all API keys owned by user, with the count aggregated in Cypher"""
         query = """
         MATCH (u:User {id: $user_id})-[:HAS_KEY]->(k:APIKey)
-        RETURN k
+        WITH k
         ORDER BY k.created_at DESC
+        RETURN collect(k) as keys, count(k) as count
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query, user_id=user_id)
+            record = await result.single()
             keys = []
-            async for record in result:
-                key = dict(record["k"])
+            for node in record["keys"] if record else []:
+                key = dict(node.items())
                 # Don't expose hashed key
                 key.pop("hashed_key", None)
                 for date_key in ["created_at", "expires_at", "last_used"]:
                     if date_key in key and key[date_key] is not None:
                         key[date_key] = key[date_key].isoformat() if hasattr(key[date_key], 'isoformat') else str(key[date_key])
                 keys.append(key)
-            return keys
+            return {"api_keys": keys, "count": record["count"] if record else 0}
 
     # ==================== Projection Methods (Embedding Explorer) ====================
 
@@ -1342,7 +2293,7 @@ class Neo4jClient:
         RETURN e.uuid as uuid
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(
                 query,
                 uuid=uuid,
@@ -1383,7 +2334,7 @@ class Neo4jClient:
         RETURN count(e) as updated
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(query, projections=projections)
             record = await result.single()
             return record["updated"] if record else 0
@@ -1401,33 +2352,11 @@ class Neo4jClient:
         Returns:
             List of entities with 2D coordinates and metadata
         """
-        x_field = "umap_x" if projection_type == "umap" else "tsne_x"
-        y_field = "umap_y" if projection_type == "umap" else "tsne_y"
+        query = _Q_PROJECTIONS["umap" if projection_type == "umap" else "tsne"]
 
-        query = f"""
-        MATCH (e:Entity)
-        WHERE e.{x_field} IS NOT NULL AND e.{y_field} IS NOT NULL
-        RETURN e.uuid as uuid,
-               e.name as name,
-               e.uht_code as uht_code,
-               e.{x_field} as x,
-               e.{y_field} as y,
-               e.image_url as image_url
-        """
-
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query)
-            entities = []
-            async for record in result:
-                entities.append({
-                    "uuid": record["uuid"],
-                    "name": record["name"],
-                    "uht_code": record["uht_code"],
-                    "x": record["x"],
-                    "y": record["y"],
-                    "image_url": record["image_url"]
-                })
-            return entities
+            return await result.data()
 
     async def get_projection_stats(self) -> Dict[str, Any]:
         """Get statistics about projection coverage."""
@@ -1440,7 +2369,7 @@ class Neo4jClient:
             count(CASE WHEN e.embedding IS NOT NULL THEN 1 END) as with_embedding
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query)
             record = await result.single()
             if record:
@@ -1467,67 +2396,94 @@ class Neo4jClient:
         Returns:
             List of neighbors with similarity scores
         """
-        query = """
-        MATCH (target:Entity {uuid: $uuid})
-        MATCH (e:Entity)
-        WHERE e.uuid <> $uuid AND e.binary_representation IS NOT NULL
-        WITH target, e,
-             reduce(s = 0, i IN range(0, 31) |
-                 s + CASE
-                     WHEN substring(target.binary_representation, i, 1) = substring(e.binary_representation, i, 1)
-                     THEN 1 ELSE 0 END
-             ) as matching_bits
-        WITH e, matching_bits, 32 - matching_bits as hamming_distance,
-             toFloat(matching_bits) / 32.0 as similarity
-        ORDER BY hamming_distance ASC
-        LIMIT $limit
-        RETURN e.uuid as uuid,
-               e.name as name,
-               e.uht_code as uht_code,
-               e.image_url as image_url,
-               hamming_distance,
-               similarity
-        """
+        records, _, _ = await self.driver.execute_query(
+            _Q_ENTITY_UHT_INT, uuid=uuid, database_=self.database, routing_=RoutingControl.READ
+        )
+        if not records or records[0]["uht_int"] is None:
+            return []
+        query = records[0]["uht_int"]
+
+        # Ranked against the cached snapshot rather than XOR-scanning every
+        # Entity in Cypher; only the winners' listing fields are fetched
+        uuids, uht_ints = await self._get_uht_cache()
+        distance = _hamming_distances(uht_ints, query).astype(np.int64)
+        # The snapshot is sorted, so the target sits among the codes equal to its own
+        lo = np.searchsorted(uht_ints, np.uint32(query), side="left")
+        hi = np.searchsorted(uht_ints, np.uint32(query), side="right")
+        distance[lo + np.flatnonzero(uuids[lo:hi] == uuid)] = 33
+
+        k = min(limit, int(np.count_nonzero(distance <= 32)))
+        if k <= 0:
+            return []
+        top = np.argpartition(distance, k - 1)[:k]
+        top = top[np.argsort(distance[top], kind="stable")]
+        ranked = dict(zip(uuids[top].tolist(), distance[top].tolist()))
+
+        records, _, _ = await self.driver.execute_query(
+            _Q_NEIGHBORS_BY_UUIDS, uuids=list(ranked), database_=self.database, routing_=RoutingControl.READ
+        )
+        details = {record["uuid"]: record.data() for record in records}
+        neighbors = []
+        for neighbor_uuid, hamming_distance in ranked.items():
+            neighbor = details.get(neighbor_uuid)
+            if neighbor is None:
+                continue
+            neighbor["hamming_distance"] = hamming_distance
+            neighbor["similarity"] = round((32 - hamming_distance) / 32.0, 4)
+            neighbors.append(neighbor)
+        return neighbors
+
+    async def get_embedding_matrix_for_projection(self) -> Dict[str, Any]:
+        """
+        Get all entities with embeddings for computing projections, column-wise.
 
-        async with self.driver.session() as session:
-            result = await session.run(query, uuid=uuid, limit=limit)
-            neighbors = []
-            async for record in result:
-                neighbors.append({
-                    "uuid": record["uuid"],
-                    "name": record["name"],
-                    "uht_code": record["uht_code"],
-                    "image_url": record["image_url"],
-                    "hamming_distance": record["hamming_distance"],
-                    "similarity": round(record["similarity"], 4)
-                })
-            return neighbors
+        Returns:
+            Dict with "uuids" and "uht_codes" lists and an (N, 1536) float32
+            "embeddings" matrix whose row i belongs to uuids[i] (dequantized
+            from the INT8 copy where one is stored)
+        """
+        uuids = []
+        uht_codes = []
+        blocks = []
+        # Streamed in PROJECTION_FETCH_ROWS blocks so only one block of Bolt
+        # records is alive at a time; each vector is written straight into its
+        # row, with no per-entity arrays
+        async with self.driver.session(
+            database=self.database, default_access_mode=READ_ACCESS, fetch_size=PROJECTION_FETCH_ROWS
+        ) as session:
+            result = await session.run(_Q_PROJECTION_EMBEDDINGS)
+            while records := await result.fetch(PROJECTION_FETCH_ROWS):
+                block = np.empty((len(records), EMBEDDING_DIMENSIONS), dtype=np.float32)
+                for i, (uuid, uht_code, embedding_q, embedding_scale, embedding) in enumerate(records):
+                    uuids.append(uuid)
+                    uht_codes.append(uht_code)
+                    if embedding_q is not None:
+                        np.multiply(embedding_q, np.float32(embedding_scale), out=block[i])
+                    else:
+                        block[i] = embedding
+                blocks.append(block)
+
+        if len(blocks) == 1:
+            embeddings = blocks[0]
+        elif blocks:
+            embeddings = np.concatenate(blocks)
+        else:
+            embeddings = np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        return {"uuids": uuids, "uht_codes": uht_codes, "embeddings": embeddings}
 
     async def get_entities_with_embeddings_for_projection(self) -> List[Dict[str, Any]]:
         """
         Get all entities with embeddings for computing projections.
 
         Returns:
-            List of entities with UUID, UHT code, and embedding
+            List of entities with UUID, UHT code, and embedding (a float32 row
+            view into the matrix from get_embedding_matrix_for_projection)
         """
-        query = """
-        MATCH (e:Entity)
-        WHERE e.embedding IS NOT NULL
-        RETURN e.uuid as uuid,
-               e.uht_code as uht_code,
-               e.embedding as embedding
-        """
-
-        async with self.driver.session() as session:
-            result = await session.run(query)
-            entities = []
-            async for record in result:
-                entities.append({
-                    "uuid": record["uuid"],
-                    "uht_code": record["uht_code"],
-                    "embedding": list(record["embedding"])
-                })
-            return entities
+        data = await self.get_embedding_matrix_for_projection()
+        return [
+            {"uuid": uuid, "uht_code": uht_code, "embedding": embedding}
+            for uuid, uht_code, embedding in zip(data["uuids"], data["uht_codes"], data["embeddings"])
+        ]
 
     # ==================== Entity Version History ====================
 
@@ -1569,15 +2525,15 @@ class Neo4jClient:
                }) as traits
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database) as session:
             result = await session.run(entity_query, entity_uuid=entity_uuid)
             record = await result.single()
 
             if not record:
-                logger.warning(f"Entity {entity_uuid} not found for version creation")
+                logger.warning("Entity %s not found for version creation", entity_uuid)
                 return None
 
-            entity = dict(record["e"])
+            entity = dict(record["e"].items())
             traits = [t for t in record["traits"] if t.get("bit") is not None]
 
             # Compute delta if previous state provided
@@ -1652,7 +2608,7 @@ class Neo4jClient:
 
             record = await result.single()
             if record:
-                version = dict(record["v"])
+                version = dict(record["v"].items())
                 # Parse JSON fields back
                 if version.get("trait_snapshot"):
                     version["trait_snapshot"] = json.loads(version["trait_snapshot"])
@@ -1701,7 +2657,7 @@ class Neo4jClient:
         LIMIT $limit
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             # Get entity info
             info_result = await session.run(info_query, entity_uuid=entity_uuid)
             info_record = await info_result.single()
@@ -1725,7 +2681,7 @@ class Neo4jClient:
 
             versions = []
             async for record in versions_result:
-                version = dict(record["v"])
+                version = dict(record["v"].items())
                 # Parse JSON fields
                 if version.get("trait_snapshot"):
                     try:
@@ -1772,7 +2728,7 @@ class Neo4jClient:
         RETURN v
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(
                 query,
                 entity_uuid=entity_uuid,
@@ -1781,7 +2737,7 @@ class Neo4jClient:
             record = await result.single()
 
             if record:
-                version = dict(record["v"])
+                version = dict(record["v"].items())
                 # Parse JSON fields
                 if version.get("trait_snapshot"):
                     try:
@@ -1823,12 +2779,12 @@ class Neo4jClient:
                }) as traits
         """
 
-        async with self.driver.session() as session:
+        async with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
             result = await session.run(query, entity_uuid=entity_uuid)
             record = await result.single()
 
             if record:
-                entity = dict(record["e"])
+                entity = dict(record["e"].items())
                 traits = [t for t in record["traits"] if t.get("bit") is not None]
                 entity["traits"] = traits
                 return entity
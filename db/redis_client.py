@@ -21,7 +21,7 @@ class RedisClient:
             await self.ping()
             logger.info("Redis connection established")
         except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
+            logger.error("Failed to connect to Redis: %s", e)
             raise
     
     async def close(self):
@@ -45,7 +45,7 @@ class RedisClient:
             if data:
                 return json.loads(data)
         except Exception as e:
-            logger.error(f"Cache get error: {e}")
+            logger.error("Cache get error: %s", e)
         return None
     
     async def cache_classification(
@@ -64,7 +64,7 @@ class RedisClient:
                 json.dumps(classification)
             )
         except Exception as e:
-            logger.error(f"Cache set error: {e}")
+            logger.error("Cache set error: %s", e)
     
     async def get_entity_by_uuid(self, uuid: str) -> Optional[Dict[str, Any]]:
         """Get entity by UUID from cache"""
@@ -74,7 +74,7 @@ class RedisClient:
             if data:
                 return json.loads(data)
         except Exception as e:
-            logger.error(f"Cache get error: {e}")
+            logger.error("Cache get error: %s", e)
         return None
     
     async def cache_entity(self, uuid: str, entity: Dict[str, Any], ttl: Optional[int] = None):
@@ -88,14 +88,14 @@ class RedisClient:
                 json.dumps(entity)
             )
         except Exception as e:
-            logger.error(f"Cache set error: {e}")
+            logger.error("Cache set error: %s", e)
     
     async def add_to_queue(self, queue_name: str, job_data: Dict[str, Any]):
         """Add job to processing queue"""
         try:
             await self.client.lpush(queue_name, json.dumps(job_data))
         except Exception as e:
-            logger.error(f"Queue push error: {e}")
+            logger.error("Queue push error: %s", e)
     
     async def get_from_queue(self, queue_name: str, timeout: int = 1) -> Optional[Dict[str, Any]]:
         """Get job from processing queue"""
@@ -104,7 +104,7 @@ class RedisClient:
             if result:
                 return json.loads(result[1])
         except Exception as e:
-            logger.error(f"Queue pop error: {e}")
+            logger.error("Queue pop error: %s", e)
         return None
     
     async def increment_counter(self, counter_name: str) -> int:
@@ -112,7 +112,7 @@ class RedisClient:
         try:
             return await self.client.incr(counter_name)
         except Exception as e:
-            logger.error(f"Counter increment error: {e}")
+            logger.error("Counter increment error: %s", e)
             return 0
     
     async def get_metrics(self) -> Dict[str, Any]:
@@ -130,7 +130,7 @@ class RedisClient:
                 )
             }
         except Exception as e:
-            logger.error(f"Metrics error: {e}")
+            logger.error("Metrics error: %s", e)
             return {}
 
     async def get(self, key: str) -> Optional[str]:
@@ -140,7 +140,7 @@ class RedisClient:
         try:
             return await self.client.get(key)
         except Exception as e:
-            logger.error(f"Cache get error for key {key}: {e}")
+            logger.error("Cache get error for key %s: %s", key, e)
             return None
 
     async def setex(self, key: str, ttl: int, value: str):
@@ -150,4 +150,4 @@ class RedisClient:
         try:
             await self.client.setex(key, timedelta(seconds=ttl), value)
         except Exception as e:
-            logger.error(f"Cache setex error for key {key}: {e}")
\ No newline at end of file
+            logger.error("Cache setex error for key %s: %s", key, e)
\ No newline at end of file
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Backfill the INT8 embedding_q / embedding_scale copy on existing Neo4j entities.
+
+get_entities_with_embeddings_for_projection reads the quantized copy when it
+exists; entities embedded before it was written fall back to the float vector
+until this has been run once.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from db.neo4j_client import Neo4jClient, quantize_embedding
+
+
+async def main():
+    neo4j = Neo4jClient(
+        uri=os.getenv("NEO4J_URI"),
+        user=os.getenv("NEO4J_USER"),
+        password=os.getenv("NEO4J_PASSWORD")
+    )
+    await neo4j.connect()
+
+    updated = 0
+    batch_size = 500
+
+    while True:
+        # Each pass picks up the next entities still missing the copy
+        results = await neo4j.execute_query("""
+            MATCH (e:Entity)
+            WHERE e.embedding IS NOT NULL AND e.embedding_q IS NULL
+            RETURN e.uuid as uuid, e.embedding as embedding
+            LIMIT $limit
+        """, limit=batch_size)
+        if not results:
+            break
+
+        rows = []
+        for r in results:
+            embedding_q, embedding_scale = quantize_embedding(r["embedding"])
+            rows.append({
+                "uuid": r["uuid"],
+                "embedding_q": embedding_q,
+                "embedding_scale": embedding_scale
+            })
+
+        await neo4j.execute_query("""
+            UNWIND $rows as row
+            MATCH (e:Entity {uuid: row.uuid})
+            SET e.embedding_q = row.embedding_q,
+                e.embedding_scale = row.embedding_scale
+        """, rows=rows)
+        updated += len(rows)
+        print(f"  Updated {updated}...")
+
+    print(f"\nDone!")
+    print(f"Updated: {updated}")
+
+    await neo4j.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
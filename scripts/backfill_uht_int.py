@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Backfill the integer uht_int property and its per-layer popcounts
+(physical_bits ... total_bits) on existing Neo4j entities.
+
+find_similar_entities compares UHT codes with XOR + popcount on uht_int;
+entities classified before these properties existed need them set once.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from db.neo4j_client import Neo4jClient, layer_bit_counts
+
+
+async def main():
+    neo4j = Neo4jClient(
+        uri=os.getenv("NEO4J_URI"),
+        user=os.getenv("NEO4J_USER"),
+        password=os.getenv("NEO4J_PASSWORD")
+    )
+    await neo4j.connect()
+
+    results = await neo4j.execute_query("""
+        MATCH (e:Entity)
+        WHERE e.uht_code IS NOT NULL AND (e.uht_int IS NULL OR e.total_bits IS NULL)
+        RETURN e.uuid as uuid, e.uht_code as uht_code
+    """)
+    print(f"Found {len(results)} entities without uht_int or layer bit counts")
+
+    rows = []
+    invalid = 0
+    for r in results:
+        try:
+            uht_int = int(r["uht_code"], 16)
+            rows.append({"uuid": r["uuid"], "uht_int": uht_int, **layer_bit_counts(uht_int)})
+        except ValueError:
+            invalid += 1
+
+    updated = 0
+    batch_size = 500
+
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i:i + batch_size]
+        await neo4j.execute_query("""
+            UNWIND $rows as row
+            MATCH (e:Entity {uuid: row.uuid})
+            SET e.uht_int = row.uht_int,
+                e.physical_bits = row.physical_bits,
+                e.functional_bits = row.functional_bits,
+                e.abstract_bits = row.abstract_bits,
+                e.social_bits = row.social_bits,
+                e.total_bits = row.total_bits
+        """, rows=batch)
+        updated += len(batch)
+        print(f"  Updated {updated}/{len(rows)}...")
+
+    print(f"\nDone!")
+    print(f"Updated: {updated}")
+    print(f"Skipped (invalid uht_code): {invalid}")
+
+    await neo4j.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -60,7 +60,7 @@ async def get_entities_with_short_descriptions(
         result = await session.run(query, max_length=max_length, limit=limit)
         entities = []
         async for record in result:
-            entities.append(dict(record))
+            entities.append(record.data())
         return entities
 
 
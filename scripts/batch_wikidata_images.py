@@ -75,10 +75,11 @@ async def get_entities_with_qids(neo4j: Neo4jClient, limit: int = None, skip_wit
         """
 
     if limit:
-        query += f" LIMIT {limit}"
+        # Parameterized so every limit reuses the same cached plan
+        query += " LIMIT $limit"
 
-    results = await neo4j.execute_query(query)
-    return [dict(r) for r in results]
+    results = await neo4j.execute_query(query, limit=limit)
+    return results
 
 
 async def fetch_wikidata_images(client: httpx.AsyncClient, qids: list) -> dict:
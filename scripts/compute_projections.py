@@ -99,22 +99,22 @@ async def main(
     # Load all entities with embeddings
     logger.info("Loading entities with embeddings from database...")
     load_start = datetime.now()
-    entities = await neo4j.get_entities_with_embeddings_for_projection()
+    data = await neo4j.get_embedding_matrix_for_projection()
     load_time = (datetime.now() - load_start).total_seconds()
-    logger.info(f"Loaded {len(entities)} entities in {load_time:.1f}s")
+    logger.info(f"Loaded {len(data['uuids'])} entities in {load_time:.1f}s")
 
-    if not entities:
+    if not data["uuids"]:
         logger.warning("No entities with embeddings found.")
         await neo4j.close()
         return
 
-    # Extract embeddings as numpy array
-    uuids = [e['uuid'] for e in entities]
-    embeddings = np.array([e['embedding'] for e in entities], dtype=np.float32)
+    # Embeddings arrive as one (N, 1536) float32 array
+    uuids = data["uuids"]
+    embeddings = data["embeddings"]
     logger.info(f"Embeddings shape: {embeddings.shape}")
 
     # Extract UHT codes as binary vectors for UHT-based projections
-    uht_codes = [e.get('uht_code', '00000000') for e in entities]
+    uht_codes = data["uht_codes"]
     uht_vectors = np.array([uht_code_to_binary(code) for code in uht_codes], dtype=np.float32)
     logger.info(f"UHT vectors shape: {uht_vectors.shape}")
 
@@ -234,7 +234,7 @@ async def main(
     logger.info("\n" + "=" * 60)
     logger.info("PROJECTION COMPUTATION COMPLETE")
     logger.info("=" * 60)
-    logger.info(f"Entities processed: {len(entities)}")
+    logger.info(f"Entities processed: {len(uuids)}")
     if umap_projection is not None:
         logger.info(f"UMAP projections: {len(umap_projection)}")
     if tsne_projection is not None:
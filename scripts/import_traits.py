@@ -38,13 +38,12 @@ async def import_traits():
         
         print(f"📊 Found {len(traits_data['traits'])} traits to import")
         
-        # Import each trait
-        for trait in traits_data["traits"]:
-            try:
-                result = await neo4j.create_trait(trait)
-                print(f"✅ Imported trait {trait['bit']}: {trait['name']}")
-            except Exception as e:
-                print(f"❌ Failed to import trait {trait['bit']}: {e}")
+        # Import all traits in one batch
+        try:
+            imported = await neo4j.create_traits_bulk(traits_data["traits"])
+            print(f"✅ Imported {imported} traits")
+        except Exception as e:
+            print(f"❌ Failed to import traits: {e}")
         
         # Create layer nodes and relationships
         await create_layers(neo4j, traits_data["traits"])
@@ -69,35 +68,28 @@ async def create_layers(neo4j: Neo4jClient, traits: list):
     
     layers = ["Physical", "Functional", "Abstract", "Social"]
     
-    for i, layer_name in enumerate(layers):
-        # Create layer node
-        layer_query = """
-        MERGE (l:Layer {name: $name})
-        SET l.index = $index,
-            l.bit_range_start = $start,
-            l.bit_range_end = $end
-        RETURN l
-        """
-        
-        async with neo4j.driver.session() as session:
-            await session.run(
-                layer_query,
-                name=layer_name,
-                index=i,
-                start=i * 8 + 1,
-                end=(i + 1) * 8
-            )
-        
-        # Connect traits to layer
-        connect_query = """
-        MATCH (l:Layer {name: $layer_name})
-        MATCH (t:Trait {layer: $layer_name})
-        MERGE (t)-[:BELONGS_TO]->(l)
-        """
-        
-        async with neo4j.driver.session() as session:
-            await session.run(connect_query, layer_name=layer_name)
-        
+    # All four layers and their trait links in one round trip
+    layer_query = """
+    UNWIND $layers as layer
+    MERGE (l:Layer {name: layer.name})
+    SET l.index = layer.index,
+        l.bit_range_start = layer.start,
+        l.bit_range_end = layer.end
+    WITH l
+    MATCH (t:Trait {layer: l.name})
+    MERGE (t)-[:BELONGS_TO]->(l)
+    """
+    
+    async with neo4j.driver.session() as session:
+        await session.run(
+            layer_query,
+            layers=[
+                {"name": layer_name, "index": i, "start": i * 8 + 1, "end": (i + 1) * 8}
+                for i, layer_name in enumerate(layers)
+            ]
+        )
+    
+    for layer_name in layers:
         print(f"✅ Created layer: {layer_name}")
 
 if __name__ == "__main__":
@@ -63,7 +63,7 @@ async def get_entities_without_versions(neo4j: Neo4jClient, limit: int = 100) ->
         result = await session.run(query, limit=limit)
         entities = []
         async for record in result:
-            entities.append(dict(record))
+            entities.append(record.data())
         return entities
 
 
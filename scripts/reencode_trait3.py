@@ -24,7 +24,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
 
-from db.neo4j_client import Neo4jClient
+from db.neo4j_client import Neo4jClient, layer_bit_counts
 from workers.llm_client import LLMFactory, TraitSpecificationLoader
 
 
@@ -80,14 +80,13 @@ async def reencode_trait3():
 
     # Get all entities
     print("Loading entities from Neo4j...")
-    result = await neo4j.execute_query("""
+    entities = await neo4j.execute_query("""
         MATCH (e:Entity)
         RETURN e.uuid as uuid, e.name as name, e.description as description,
                e.uht_code as uht_code, e.version as version
         ORDER BY e.name
     """)
 
-    entities = [dict(r) for r in result]
     total = len(entities)
     print(f"Found {total} entities to process")
 
@@ -122,7 +121,8 @@ async def reencode_trait3():
         # Execute batch in parallel
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Process results
+        # Process results; changed entities are written together below
+        updates = []
         for entity, result in zip(batch, results):
             try:
                 if isinstance(result, Exception):
@@ -155,37 +155,50 @@ async def reencode_trait3():
                 print(f"  CHANGED: {entity['name']}: {old_hex} -> {new_hex} (bit3: {direction})")
                 print(f"           Reason: {result.get('justification', 'N/A')[:80]}...")
 
-                # Update entity in Neo4j
-                new_version = (entity.get("version") or 1) + 1
+                updates.append({
+                    "uuid": entity["uuid"],
+                    "new_code": new_hex,
+                    "new_int": int(new_hex, 16),
+                    **layer_bit_counts(int(new_hex, 16)),
+                    "new_version": (entity.get("version") or 1) + 1,
+                    "reason": f"Re-encoded trait 3: {result.get('justification', 'Updated specification')}"
+                })
 
+            except Exception as e:
+                print(f"  ERROR processing {entity['name']}: {e}")
+                stats["errors"] += 1
+
+        # Update every changed entity in Neo4j with one UNWIND query per batch
+        if updates:
+            try:
                 await neo4j.execute_query("""
-                    MATCH (e:Entity {uuid: $uuid})
-                    SET e.uht_code = $new_code,
-                        e.version = $new_version,
+                    UNWIND $updates as u
+                    MATCH (e:Entity {uuid: u.uuid})
+                    SET e.uht_code = u.new_code,
+                        e.uht_int = u.new_int,
+                        e.physical_bits = u.physical_bits,
+                        e.functional_bits = u.functional_bits,
+                        e.abstract_bits = u.abstract_bits,
+                        e.social_bits = u.social_bits,
+                        e.total_bits = u.total_bits,
+                        e.version = u.new_version,
                         e.updated_at = datetime()
-                    WITH e
+                    WITH e, u
                     CREATE (v:EntityVersion {
                         entity_uuid: e.uuid,
-                        version: $new_version,
+                        version: u.new_version,
                         name: e.name,
                         description: e.description,
-                        uht_code: $new_code,
-                        change_reason: $reason,
+                        uht_code: u.new_code,
+                        change_reason: u.reason,
                         created_at: datetime()
                     })
                     CREATE (e)-[:HAS_VERSION]->(v)
-                """,
-                    uuid=entity["uuid"],
-                    new_code=new_hex,
-                    new_version=new_version,
-                    reason=f"Re-encoded trait 3: {result.get('justification', 'Updated specification')}"
-                )
-
-                stats["changed"] += 1
-
+                """, updates=updates)
+                stats["changed"] += len(updates)
             except Exception as e:
-                print(f"  ERROR processing {entity['name']}: {e}")
-                stats["errors"] += 1
+                print(f"  ERROR writing batch: {e}")
+                stats["errors"] += len(updates)
 
         # Rate limiting between batches
         await asyncio.sleep(1)
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from neo4j import GraphDatabase
 from workers.llm_client import OpenRouterClient
+from db.neo4j_client import layer_bit_counts
 
 # Load environment
 from dotenv import load_dotenv
@@ -54,7 +55,7 @@ async def reevaluate_trait(bit: int, batch_size: int = 50, dry_run: bool = False
             RETURN e.uuid as uuid, e.name as name, e.description as description
             ORDER BY e.name
         """)
-        entities = [dict(r) for r in result]
+        entities = [r.data() for r in result]
 
     print(f"Found {len(entities)} entities to re-evaluate")
 
@@ -97,6 +98,9 @@ async def reevaluate_trait(bit: int, batch_size: int = 50, dry_run: bool = False
                 # Update the HAS_TRAIT relationship
                 session.run("""
                     MATCH (e:Entity {uuid: $uuid})-[r:HAS_TRAIT]->(t:Trait {bit: $bit})
+                    SET t.entity_count = t.entity_count
+                            + CASE WHEN $applicable THEN 1 ELSE 0 END
+                            - CASE WHEN r.applicable THEN 1 ELSE 0 END
                     SET r.applicable = $applicable,
                         r.confidence = $confidence,
                         r.justification = $justification,
@@ -132,12 +136,20 @@ async def reevaluate_trait(bit: int, batch_size: int = 50, dry_run: bool = False
                 hex_code = format(int(binary, 2), '08X')
 
                 # Update entity
+                uht_int = int(binary, 2)
                 session.run("""
                     MATCH (e:Entity {uuid: $uuid})
                     SET e.uht_code = $uht_code,
+                        e.uht_int = $uht_int,
                         e.binary_representation = $binary,
+                        e.physical_bits = $physical_bits,
+                        e.functional_bits = $functional_bits,
+                        e.abstract_bits = $abstract_bits,
+                        e.social_bits = $social_bits,
+                        e.total_bits = $total_bits,
                         e.updated_at = datetime()
-                """, uuid=entity["uuid"], uht_code=hex_code, binary=binary)
+                """, uuid=entity["uuid"], uht_code=hex_code, uht_int=uht_int, binary=binary,
+                    **layer_bit_counts(uht_int))
 
         batch_time = time.time() - batch_start
         elapsed = time.time() - start_time
@@ -39,10 +39,15 @@ logger = logging.getLogger(__name__)
 
 async def delete_all_versions(neo4j: Neo4jClient) -> int:
     """Delete all EntityVersion nodes and relationships."""
+    # Committed in batches so the full history isn't held in one transaction
     query = """
-    MATCH (v:EntityVersion)
-    DETACH DELETE v
-    RETURN count(v) as deleted
+    CALL apoc.periodic.iterate(
+        'MATCH (v:EntityVersion) RETURN v',
+        'DETACH DELETE v',
+        {batchSize: 1000}
+    )
+    YIELD total
+    RETURN total as deleted
     """
     async with neo4j.driver.session() as session:
         result = await session.run(query)
@@ -53,9 +58,13 @@ async def delete_all_versions(neo4j: Neo4jClient) -> int:
 async def reset_entity_versions(neo4j: Neo4jClient) -> int:
     """Reset all Entity.version fields to 1."""
     query = """
-    MATCH (e:Entity)
-    SET e.version = 1
-    RETURN count(e) as updated
+    CALL apoc.periodic.iterate(
+        'MATCH (e:Entity) RETURN e',
+        'SET e.version = 1',
+        {batchSize: 1000}
+    )
+    YIELD total
+    RETURN total as updated
     """
     async with neo4j.driver.session() as session:
         result = await session.run(query)
@@ -83,7 +92,7 @@ async def get_all_entities(neo4j: Neo4jClient, limit: int = 100, offset: int = 0
         result = await session.run(query, limit=limit, offset=offset)
         entities = []
         async for record in result:
-            entities.append(dict(record))
+            entities.append(record.data())
         return entities
 
 
@@ -46,7 +46,7 @@ async def test_bit3_reevaluation():
                    r.applicable as current_value
             LIMIT 10
         """)
-        entities = [dict(r) for r in result]
+        entities = [r.data() for r in result]
 
     print(f"Testing {len(entities)} entities:")
     for e in entities:
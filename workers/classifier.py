@@ -31,9 +31,14 @@ class ClassificationEngine:
     async def classify_entity(
         self, 
         entity: Dict[str, Any],
-        use_cache: bool = True
+        use_cache: bool = True,
+        store: bool = True
     ) -> Dict[str, Any]:
-        """Classify an entity by evaluating all 32 traits"""
+        """Classify an entity by evaluating all 32 traits
+
+        With store=False the result is cached but not written to Neo4j;
+        classify_batch uses this to write a whole batch at once.
+        """
         
         start_time = time.time()
         
@@ -81,7 +86,8 @@ class ClassificationEngine:
         await self.redis.cache_classification(entity["name"], classification)
         
         # Store in Neo4j
-        await self._store_classification(classification)
+        if store:
+            await self._store_classification(classification)
         
         return {
             **classification,
@@ -176,7 +182,7 @@ class ClassificationEngine:
         # Create classification tasks
         tasks = []
         for entity in entities:
-            task = self.classify_entity(entity)
+            task = self.classify_entity(entity, store=False)
             tasks.append(task)
         
         # Process in parallel with limited concurrency
@@ -191,7 +197,24 @@ class ClassificationEngine:
                     results.append({"error": str(result)})
                 else:
                     results.append(result)
-        
+
+        # Write every fresh classification in one UNWIND batch
+        fresh = [r for r in results if "error" not in r and not r.get("cached")]
+        if fresh:
+            try:
+                stored = await self.neo4j.create_entities_batch(fresh)
+                logger.info(f"Stored {stored} classifications in batch")
+            except Exception as e:
+                # One bad row aborts the whole batch write; store the rest one
+                # at a time and flag only the entities that still fail
+                logger.error(f"Failed to store classification batch, retrying individually: {e}")
+                for result in fresh:
+                    try:
+                        await self.neo4j.create_entity(result)
+                    except Exception as e:
+                        logger.error(f"Failed to store classification for {result.get('name')}: {e}")
+                        result["error"] = f"Classification not stored: {e}"
+
         return results
 
 class ClassificationOrchestrator:
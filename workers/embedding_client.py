@@ -13,6 +13,7 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import httpx
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -377,23 +378,22 @@ class RateLimitError(EmbeddingError):
 
 # Comparison utilities
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
-    """Calculate cosine similarity between two vectors"""
-    import math
+    """Calculate cosine similarity between two vectors (lists or float32 arrays)"""
+    a = np.asarray(vec1, dtype=np.float64)
+    b = np.asarray(vec2, dtype=np.float64)
 
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    norm1 = math.sqrt(sum(a * a for a in vec1))
-    norm2 = math.sqrt(sum(b * b for b in vec2))
+    norm1 = np.linalg.norm(a)
+    norm2 = np.linalg.norm(b)
 
     if norm1 == 0 or norm2 == 0:
         return 0.0
 
-    return dot_product / (norm1 * norm2)
+    return float(np.dot(a, b) / (norm1 * norm2))
 
 
 def euclidean_distance(vec1: List[float], vec2: List[float]) -> float:
-    """Calculate Euclidean distance between two vectors"""
-    import math
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(vec1, vec2)))
+    """Calculate Euclidean distance between two vectors (lists or float32 arrays)"""
+    return float(np.linalg.norm(np.asarray(vec1, dtype=np.float64) - np.asarray(vec2, dtype=np.float64)))
 
 
 def uht_binary_to_vector(binary_representation: str) -> List[float]:
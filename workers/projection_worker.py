@@ -212,8 +212,8 @@ def compute_uht_similarity(code1: str, code2: str) -> float:
         int2 = int(code2, 16)
 
         # Count bits in intersection (AND) and union (OR)
-        intersection = bin(int1 & int2).count('1')
-        union = bin(int1 | int2).count('1')
+        intersection = (int1 & int2).bit_count()
+        union = (int1 | int2).bit_count()
 
         # Handle case where both codes are 0 (no traits)
         if union == 0:
@@ -378,6 +378,6 @@ def get_dominant_layer(uht_code: str) -> str:
 def count_active_traits(uht_code: str) -> int:
     """Count active traits (1 bits) in a UHT code."""
     try:
-        return bin(int(uht_code, 16)).count('1')
+        return int(uht_code, 16).bit_count()
     except (ValueError, TypeError):
         return 0